@@ -14,7 +14,13 @@ Quick start:
     print(b.text())                  # Read page text
 """
 
-from tappi.core import Browser, CDPSession
-
 __version__ = "0.7.5"
-__all__ = ["Browser", "CDPSession"]
+__all__ = ["Browser", "CDPSession", "AsyncCDPSession"]
+
+
+def __getattr__(name: str):
+    # Deferred so `tappi --help` / `--version` don't import the CDP client
+    if name in __all__:
+        from tappi import core
+        return getattr(core, name)
+    raise AttributeError(f"module 'tappi' has no attribute {name!r}")
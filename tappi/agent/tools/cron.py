@@ -7,7 +7,11 @@ that executes the task description.
 
 from __future__ import annotations
 
+import contextlib
 import json
+import os
+import stat
+import tempfile
 import uuid
 from datetime import datetime
 from pathlib import Path
@@ -92,9 +96,33 @@ def _load_jobs() -> dict[str, dict]:
 
 
 def _save_jobs(jobs: dict[str, dict]) -> None:
-    """Save jobs to disk."""
+    """Save jobs to disk.
+
+    Written to a temp file in the same directory and swapped in with
+    os.replace, so a crash mid-write never leaves a truncated jobs.json.
+    """
     _JOBS_FILE.parent.mkdir(parents=True, exist_ok=True)
-    _JOBS_FILE.write_text(json.dumps(jobs, indent=2) + "\n")
+    data = (json.dumps(jobs, indent=2) + "\n").encode()
+    fd, tmp = tempfile.mkstemp(dir=_JOBS_FILE.parent, prefix=".jobs.", suffix=".tmp")
+    try:
+        # mkstemp creates the file 0600; give it the mode the jobs file has
+        # (or would get from a plain open) so the swap doesn't change it
+        try:
+            mode = stat.S_IMODE(os.stat(_JOBS_FILE).st_mode)
+        except FileNotFoundError:
+            umask = os.umask(0)
+            os.umask(umask)
+            mode = 0o666 & ~umask
+        os.chmod(tmp, mode)
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, _JOBS_FILE)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.unlink(tmp)
+        raise
 
 
 class CronTool:
@@ -110,21 +138,11 @@ class CronTool:
 
     def execute(self, **params: Any) -> str:
         action = params.get("action", "")
+        handler = self._ACTIONS.get(action)
+        if handler is None:
+            return f"Unknown action: {action}"
         try:
-            if action == "add":
-                return self._add(params)
-            elif action == "list":
-                return self._list()
-            elif action == "remove":
-                return self._remove(params)
-            elif action == "pause":
-                return self._set_paused(params, True)
-            elif action == "resume":
-                return self._set_paused(params, False)
-            elif action == "run_now":
-                return self._run_now(params)
-            else:
-                return f"Unknown action: {action}"
+            return handler(self, params)
         except Exception as e:
             return f"Error: {e}"
 
@@ -240,3 +258,13 @@ class CronTool:
             return f"Triggered immediate run: {job_id} ({jobs[job_id]['name']})"
 
         return f"Job found but no scheduler connected. Start the server with 'bpy serve'."
+
+    # action → handler; one dict lookup per call instead of an if/elif chain
+    _ACTIONS = {
+        "add": _add,
+        "list": lambda self, params: self._list(),
+        "remove": _remove,
+        "pause": lambda self, params: self._set_paused(params, True),
+        "resume": lambda self, params: self._set_paused(params, False),
+        "run_now": _run_now,
+    }
@@ -6,12 +6,34 @@ All paths are resolved relative to the workspace. Escape attempts
 
 from __future__ import annotations
 
+import codecs
+import fnmatch
+import mmap
 import os
+import re
 import shutil
-from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path, PurePath
 from typing import Any
 
 from tappi.agent.config import get_workspace
+from tappi.agent.tools.pdf import forget_pdf
+
+_READ_CAP = 50_000  # max chars returned by action='read'
+_SIZE_UNITS = ((1 << 30, "GB"), (1 << 20, "MB"), (1 << 10, "KB"))
+# Files below this size are read outright; mmap setup isn't worth it for them.
+_MMAP_THRESHOLD = 8 * 1024
+_GREP_WORKERS = min(32, (os.cpu_count() or 1) + 4)
+_SKIP_DIRS = frozenset({".git", "__pycache__", "node_modules", ".venv", ".env"})
+
+
+def _fmt_size(size: int) -> str:
+    """Human-readable size, truncated to the largest whole unit."""
+    for unit, name in _SIZE_UNITS:
+        if size >= unit:
+            return f"{size // unit}{name}"
+    return f"{size}B"
 
 TOOL_SCHEMA = {
     "type": "function",
@@ -60,47 +82,34 @@ class FilesTool:
 
     def __init__(self, workspace: Path | None = None) -> None:
         self._workspace = workspace
+        self._resolved_workspace: Path | None = None
 
     @property
     def workspace(self) -> Path:
-        if self._workspace is None:
-            self._workspace = get_workspace()
-        self._workspace = self._workspace.resolve()
-        self._workspace.mkdir(parents=True, exist_ok=True)
-        return self._workspace
+        # Resolved and created once; every _resolve() call reuses it.
+        if self._resolved_workspace is None:
+            ws = self._workspace if self._workspace is not None else get_workspace()
+            ws = ws.resolve()
+            ws.mkdir(parents=True, exist_ok=True)
+            self._resolved_workspace = ws
+        return self._resolved_workspace
 
     def _resolve(self, path: str) -> Path:
         """Resolve a path within the workspace. Blocks escapes."""
-        resolved = (self.workspace / path).resolve()
-        ws_resolved = self.workspace.resolve()
-        if not str(resolved).startswith(str(ws_resolved)):
+        workspace = self.workspace
+        resolved = (workspace / path).resolve()
+        if not resolved.is_relative_to(workspace):
             raise PermissionError(f"Access denied: path escapes workspace — {path}")
         return resolved
 
     def execute(self, **params: Any) -> str:
         action = params.get("action", "")
 
+        handler = self._ACTIONS.get(action)
+        if handler is None:
+            return f"Unknown action: {action}"
         try:
-            if action == "read":
-                return self._read(params)
-            elif action == "write":
-                return self._write(params)
-            elif action == "list":
-                return self._list(params)
-            elif action == "move":
-                return self._move(params)
-            elif action == "copy":
-                return self._copy(params)
-            elif action == "delete":
-                return self._delete(params)
-            elif action == "mkdir":
-                return self._mkdir(params)
-            elif action == "info":
-                return self._info(params)
-            elif action == "grep":
-                return self._grep(params)
-            else:
-                return f"Unknown action: {action}"
+            return handler(self, params)
         except PermissionError as e:
             return f"Permission denied: {e}"
         except FileNotFoundError as e:
@@ -125,15 +134,23 @@ class FilesTool:
             return self._read_image(resolved, path)
 
         encoding = params.get("encoding", "utf-8")
+        # Only pull from disk what the 50KB cap can use (≤4 bytes per char)
+        fd = os.open(resolved, os.O_RDONLY)
+        try:
+            size = os.fstat(fd).st_size
+            data = os.read(fd, _READ_CAP * 4)
+        finally:
+            os.close(fd)
+        truncated = size > len(data)
         try:
-            content = resolved.read_text(encoding=encoding)
+            # Incremental decode tolerates a multibyte char split at the read boundary
+            content = codecs.getincrementaldecoder(encoding)().decode(data, final=not truncated)
         except UnicodeDecodeError:
             # Binary file — return size info
-            size = resolved.stat().st_size
             return f"Binary file ({size} bytes). Cannot read as text."
         # Cap at 50KB
-        if len(content) > 50_000:
-            content = content[:50_000] + f"\n\n... (truncated, {len(content)} chars total)"
+        if truncated or len(content) > _READ_CAP:
+            content = content[:_READ_CAP] + f"\n\n... (truncated, {size} bytes total)"
         return content
 
     def _read_image(self, resolved: Path, display_path: str) -> str:
@@ -164,7 +181,15 @@ class FilesTool:
         resolved = self._resolve(path)
         resolved.parent.mkdir(parents=True, exist_ok=True)
         encoding = params.get("encoding", "utf-8")
-        resolved.write_text(content, encoding=encoding)
+        data = memoryview(content.encode(encoding))
+        forget_pdf(resolved)
+        # Raw fd write — no TextIOWrapper/BufferedWriter setup per call
+        fd = os.open(resolved, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            while data:
+                data = data[os.write(fd, data):]
+        finally:
+            os.close(fd)
         return f"Written: {path} ({len(content)} chars)"
 
     def _list(self, params: dict) -> str:
@@ -175,24 +200,20 @@ class FilesTool:
         if not resolved.is_dir():
             return f"'{path}' is a file, not a directory."
 
-        entries = sorted(resolved.iterdir())
+        # scandir reuses the dirent info, so is_dir()/stat() are cached per entry
+        with os.scandir(resolved) as it:
+            entries = sorted(it, key=lambda e: e.name)
         if not entries:
             return f"(empty directory: {path})"
 
+        base = resolved.relative_to(self.workspace)
         lines = []
         for entry in entries:
-            rel = entry.relative_to(self.workspace)
+            rel = base / entry.name
             if entry.is_dir():
                 lines.append(f"  📁 {rel}/")
             else:
-                size = entry.stat().st_size
-                if size < 1024:
-                    size_str = f"{size}B"
-                elif size < 1024 * 1024:
-                    size_str = f"{size // 1024}KB"
-                else:
-                    size_str = f"{size // (1024 * 1024)}MB"
-                lines.append(f"  📄 {rel} ({size_str})")
+                lines.append(f"  📄 {rel} ({_fmt_size(entry.stat().st_size)})")
         return "\n".join(lines)
 
     def _move(self, params: dict) -> str:
@@ -205,6 +226,8 @@ class FilesTool:
         if not resolved_src.exists():
             return f"Source not found: {src}"
         resolved_dst.parent.mkdir(parents=True, exist_ok=True)
+        forget_pdf(resolved_src)
+        forget_pdf(resolved_dst)
         shutil.move(str(resolved_src), str(resolved_dst))
         return f"Moved: {src} → {dst}"
 
@@ -218,6 +241,7 @@ class FilesTool:
         if not resolved_src.exists():
             return f"Source not found: {src}"
         resolved_dst.parent.mkdir(parents=True, exist_ok=True)
+        forget_pdf(resolved_dst)
         if resolved_src.is_dir():
             shutil.copytree(str(resolved_src), str(resolved_dst))
         else:
@@ -233,6 +257,7 @@ class FilesTool:
             return f"Not found: {path}"
         if resolved == self.workspace:
             return "Error: cannot delete the workspace root"
+        forget_pdf(resolved)
         if resolved.is_dir():
             shutil.rmtree(resolved)
             return f"Deleted directory: {path}"
@@ -256,16 +281,13 @@ class FilesTool:
         if not resolved.exists():
             return f"Not found: {path}"
         stat = resolved.stat()
-        import datetime
-        mtime = datetime.datetime.fromtimestamp(stat.st_mtime).isoformat()
+        mtime = datetime.fromtimestamp(stat.st_mtime).isoformat()
         kind = "directory" if resolved.is_dir() else resolved.suffix or "file"
         size = stat.st_size
         return f"Path: {path}\nType: {kind}\nSize: {size} bytes\nModified: {mtime}"
 
     def _grep(self, params: dict) -> str:
         """Search file contents within the workspace."""
-        import re as _re
-
         query = params.get("query", "")
         if not query:
             return "Error: 'query' required for grep"
@@ -282,33 +304,116 @@ class FilesTool:
 
         search_dir = resolved_scope if resolved_scope.is_dir() else resolved_scope.parent
         matches = []
-        pattern = _re.compile(_re.escape(query), _re.IGNORECASE)
-
-        for glob_pat in patterns:
-            for fpath in search_dir.rglob(glob_pat):
-                if not fpath.is_file():
-                    continue
-                # Skip hidden dirs and large files
-                parts = fpath.relative_to(self.workspace).parts
-                skip_dirs = {".git", "__pycache__", "node_modules", ".venv", ".env"}
-                if any(p in skip_dirs for p in parts):
-                    continue
-                if fpath.stat().st_size > 1_000_000:
-                    continue
-                try:
-                    text = fpath.read_text(errors="ignore")
-                except Exception:
-                    continue
-                for line_num, line in enumerate(text.splitlines(), 1):
-                    if pattern.search(line):
-                        rel = fpath.relative_to(self.workspace)
-                        matches.append(f"{rel}:{line_num}: {line.strip()[:150]}")
-                        if len(matches) >= 50:
-                            break
+        if query.isascii():
+            pattern = re.compile(re.escape(query).encode(), re.IGNORECASE)
+        else:
+            # Bytes patterns fold ASCII case only — "über" must still find
+            # "Über", so non-ASCII queries search decoded text instead
+            pattern = re.compile(re.escape(query), re.IGNORECASE)
+        # One fused name matcher → a single tree walk instead of one rglob per
+        # pattern. Patterns with a separator (docs/*.md) are matched like
+        # rglob would: against the trailing parts of the path under search_dir.
+        path_patterns = [p for p in patterns if "/" in p or os.sep in p]
+        name_patterns = [p for p in patterns if p not in path_patterns]
+        name_re = re.compile("|".join(fnmatch.translate(p) for p in name_patterns) or "(?!)")
+
+        def wanted(root: str, name: str) -> bool:
+            if name_re.match(name):
+                return True
+            if path_patterns:
+                rel = PurePath(os.path.relpath(os.path.join(root, name), search_dir))
+                return any(rel.match(p) for p in path_patterns)
+            return False
+
+        candidates = []
+        for root, dirs, files in os.walk(search_dir):
+            # Prune skipped/hidden subtrees so they are never entered or stat'd
+            dirs[:] = sorted(d for d in dirs if d not in _SKIP_DIRS and not d.startswith("."))
+            candidates.extend(os.path.join(root, f) for f in sorted(files) if wanted(root, f))
+
+        # Scanning is I/O-bound and the GIL is released during reads, so fan
+        # out across files; results are consumed in walk order to keep output stable.
+        pool = ThreadPoolExecutor(max_workers=min(_GREP_WORKERS, len(candidates) or 1))
+        try:
+            futures = [pool.submit(_scan_candidate, fpath, pattern) for fpath in candidates]
+            for fpath, future in zip(candidates, futures):
+                found = future.result()
+                if found:
+                    rel = Path(fpath).relative_to(self.workspace)
+                    matches.extend(f"{rel}:{n}: {line}" for n, line in found[:50 - len(matches)])
                 if len(matches) >= 50:
                     break
+        finally:
+            pool.shutdown(wait=True, cancel_futures=True)
 
         if not matches:
             return f"No matches for '{query}' in {scope}"
         header = f"Found {len(matches)} match(es) for '{query}':\n\n"
         return header + "\n".join(matches)
+
+    # action → handler; one dict lookup per call instead of an if/elif chain
+    _ACTIONS = {
+        "read": _read,
+        "write": _write,
+        "list": _list,
+        "move": _move,
+        "copy": _copy,
+        "delete": _delete,
+        "mkdir": _mkdir,
+        "info": _info,
+        "grep": _grep,
+    }
+
+
+def _scan_candidate(fpath: str, pattern: re.Pattern) -> list[tuple[int, str]]:
+    """Grep worker: skip large or unreadable files, otherwise scan for matches."""
+    try:
+        if os.path.getsize(fpath) > 1_000_000:
+            return []
+        return _scan_file(fpath, pattern, 50)
+    except (OSError, ValueError):
+        return []
+
+
+def _scan_file(fpath: str, pattern: re.Pattern, limit: int) -> list[tuple[int, str]]:
+    """Return up to ``limit`` (line number, line) pairs matching ``pattern``.
+
+    With a bytes pattern, larger files are searched through a read-only
+    mmap, so only the pages the regex touches are faulted in and no
+    per-line strings are built. A str pattern searches the decoded lines.
+    """
+    if isinstance(pattern.pattern, str):
+        with open(fpath, encoding="utf-8", errors="ignore") as f:
+            found: list[tuple[int, str]] = []
+            for line_num, line in enumerate(f, 1):
+                if pattern.search(line):
+                    found.append((line_num, line.strip()[:150]))
+                    if len(found) >= limit:
+                        break
+            return found
+    with open(fpath, "rb") as f:
+        if os.fstat(f.fileno()).st_size < _MMAP_THRESHOLD:
+            return _scan_buffer(f.read(), pattern, limit)
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return _scan_buffer(mm, pattern, limit)
+
+
+def _scan_buffer(data: bytes | mmap.mmap, pattern: re.Pattern, limit: int) -> list[tuple[int, str]]:
+    found: list[tuple[int, str]] = []
+    pos = 0
+    line_num, counted = 1, 0
+    size = len(data)
+    while len(found) < limit:
+        m = pattern.search(data, pos)
+        if m is None:
+            break
+        line_start = data.rfind(b"\n", 0, m.start()) + 1
+        line_end = data.find(b"\n", m.end())
+        if line_end == -1:
+            line_end = size
+        line_num += data[counted:line_start].count(b"\n")
+        counted = line_start
+        line = data[line_start:line_end].decode("utf-8", errors="ignore")
+        found.append((line_num, line.strip()[:150]))
+        pos = line_end + 1
+    return found
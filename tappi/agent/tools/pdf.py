@@ -6,6 +6,11 @@ Create: WeasyPrint — HTML/CSS to PDF, handles layouts properly.
 
 from __future__ import annotations
 
+import io
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
 
@@ -42,54 +47,138 @@ TOOL_SCHEMA = {
 }
 
 
+# Heavy deps are imported on first use and then held here, so later calls
+# skip the import machinery entirely.
+_fitz = None
+_weasy_html = None
+_font_config = None  # shared WeasyPrint font map, reused across creates
+
+
+def _get_fitz() -> Any:
+    global _fitz
+    if _fitz is None:
+        import fitz  # pymupdf
+
+        _fitz = fitz
+    return _fitz
+
+
+def _get_html() -> Any:
+    global _weasy_html
+    if _weasy_html is None:
+        from weasyprint import HTML
+
+        _weasy_html = HTML
+    return _weasy_html
+
+
+def _get_font_config() -> Any:
+    global _font_config
+    if _font_config is None:
+        from weasyprint.text.fonts import FontConfiguration
+
+        _font_config = FontConfiguration()
+    return _font_config
+
+
+@dataclass(frozen=True)
+class _DocInfo:
+    pages: int
+    metadata: dict[str, Any]
+
+
+# Parsed metadata keyed by path, valid while (mtime, size) is unchanged, so
+# repeat ``info`` calls skip the parse. Only plain data is kept: documents
+# are opened and closed per call, so no handle is shared between threads or
+# keeps the file locked (Windows) after a call returns.
+_INFO_CACHE_SIZE = 64
+_info_cache: OrderedDict[str, tuple[tuple[int, int], _DocInfo]] = OrderedDict()
+_info_lock = threading.Lock()
+
+
+def _doc_info(path: Path) -> _DocInfo:
+    """Page count and metadata for path, parsed once per file version."""
+    key = str(path)
+    st = path.stat()
+    version = (st.st_mtime_ns, st.st_size)
+    with _info_lock:
+        cached = _info_cache.get(key)
+        if cached is not None and cached[0] == version:
+            _info_cache.move_to_end(key)
+            return cached[1]
+    with _get_fitz().open(key) as doc:
+        info = _DocInfo(pages=len(doc), metadata=dict(doc.metadata or {}))
+    with _info_lock:
+        _info_cache[key] = (version, info)
+        _info_cache.move_to_end(key)
+        while len(_info_cache) > _INFO_CACHE_SIZE:
+            _info_cache.popitem(last=False)
+    return info
+
+
+def forget_pdf(path: Path) -> None:
+    """Drop cached info for path and, if it is a directory, everything under it.
+
+    Called by tools that write, move or delete files, so an entry never
+    outlives the file it describes.
+    """
+    key = str(path)
+    prefix = os.path.join(key, "")
+    with _info_lock:
+        for cached in [k for k in _info_cache if k == key or k.startswith(prefix)]:
+            del _info_cache[cached]
+
+
 class PDFTool:
     """PDF read/create operations, sandboxed to workspace."""
 
     def __init__(self, workspace: Path | None = None) -> None:
         self._workspace = workspace
+        self._resolved_workspace: Path | None = None
 
     @property
     def workspace(self) -> Path:
-        if self._workspace is None:
-            self._workspace = get_workspace()
-        self._workspace = self._workspace.resolve()
-        self._workspace.mkdir(parents=True, exist_ok=True)
-        return self._workspace
+        # Resolved and created once; every _resolve() call reuses it.
+        if self._resolved_workspace is None:
+            ws = self._workspace if self._workspace is not None else get_workspace()
+            ws = ws.resolve()
+            ws.mkdir(parents=True, exist_ok=True)
+            self._resolved_workspace = ws
+        return self._resolved_workspace
 
     def _resolve(self, path: str) -> Path:
-        resolved = (self.workspace / path).resolve()
-        ws_resolved = self.workspace.resolve()
-        if not str(resolved).startswith(str(ws_resolved)):
+        workspace = self.workspace
+        resolved = (workspace / path).resolve()
+        if not resolved.is_relative_to(workspace):
             raise PermissionError(f"Access denied: path escapes workspace — {path}")
         return resolved
 
     def _parse_pages(self, pages_str: str, total: int) -> list[int]:
         """Parse page range string into list of 0-indexed page numbers."""
-        result = []
+        # One byte per page: overlapping ranges union for free and the
+        # scan below yields indices already sorted and de-duplicated.
+        selected = bytearray(total)
         for part in pages_str.split(","):
             part = part.strip()
             if "-" in part:
                 start, end = part.split("-", 1)
                 s = max(0, int(start) - 1)
                 e = min(total, int(end))
-                result.extend(range(s, e))
+                if s < e:
+                    selected[s:e] = b"\x01" * (e - s)
             else:
                 idx = int(part) - 1
                 if 0 <= idx < total:
-                    result.append(idx)
-        return sorted(set(result))
+                    selected[idx] = 1
+        return [i for i, v in enumerate(selected) if v]
 
     def execute(self, **params: Any) -> str:
         action = params.get("action", "")
+        handler = self._ACTIONS.get(action)
+        if handler is None:
+            return f"Unknown action: {action}"
         try:
-            if action == "read":
-                return self._read(params)
-            elif action == "create":
-                return self._create(params)
-            elif action == "info":
-                return self._info(params)
-            else:
-                return f"Unknown action: {action}"
+            return handler(self, params)
         except ImportError as e:
             pkg = "pymupdf" if "fitz" in str(e) else "weasyprint"
             return f"Missing dependency: pip install {pkg}"
@@ -102,26 +191,29 @@ class PDFTool:
         if not resolved.exists():
             return f"File not found: {path}"
 
-        import fitz  # pymupdf
-
-        doc = fitz.open(str(resolved))
-        total = len(doc)
-        pages_str = params.get("pages")
-        page_nums = self._parse_pages(pages_str, total) if pages_str else list(range(total))
+        with _get_fitz().open(str(resolved)) as doc:
+            total = len(doc)
+            pages_str = params.get("pages")
+            page_nums = self._parse_pages(pages_str, total) if pages_str else list(range(total))
 
-        text_parts = []
-        for i in page_nums:
-            page = doc[i]
-            text = page.get_text()
-            if text.strip():
-                text_parts.append(f"--- Page {i + 1} ---\n{text}")
+            # Stream pages into one buffer and stop once past the cap, so large
+            # PDFs don't get fully extracted just to be sliced afterwards.
+            buf = io.StringIO()
+            size = 0
+            for i in page_nums:
+                text = doc[i].get_text("text")
+                if not text.strip():
+                    continue
+                if size:
+                    size += buf.write("\n")
+                size += buf.write(f"--- Page {i + 1} ---\n{text}")
+                if size > 50_000:
+                    break
 
-        doc.close()
-
-        if not text_parts:
+        if not size:
             return f"No text extracted from {path} (might be a scanned/image PDF)."
 
-        result = "\n".join(text_parts)
+        result = buf.getvalue()
         # Cap at 50KB
         if len(result) > 50_000:
             result = result[:50_000] + f"\n\n... (truncated, {total} pages total)"
@@ -136,9 +228,8 @@ class PDFTool:
         resolved = self._resolve(path)
         resolved.parent.mkdir(parents=True, exist_ok=True)
 
-        from weasyprint import HTML
-
-        HTML(string=html).write_pdf(str(resolved))
+        forget_pdf(resolved)
+        _get_html()(string=html).write_pdf(str(resolved), font_config=_get_font_config())
         size = resolved.stat().st_size
         return f"PDF created: {path} ({size} bytes)"
 
@@ -148,12 +239,9 @@ class PDFTool:
         if not resolved.exists():
             return f"File not found: {path}"
 
-        import fitz
-
-        doc = fitz.open(str(resolved))
-        meta = doc.metadata or {}
-        pages = len(doc)
-        doc.close()
+        info = _doc_info(resolved)
+        meta = info.metadata
+        pages = info.pages
 
         lines = [
             f"File: {path}",
@@ -167,3 +255,10 @@ class PDFTool:
         if meta.get("subject"):
             lines.append(f"Subject: {meta['subject']}")
         return "\n".join(lines)
+
+    # action → handler; one dict lookup per call instead of an if/elif chain
+    _ACTIONS = {
+        "read": _read,
+        "create": _create,
+        "info": _info,
+    }
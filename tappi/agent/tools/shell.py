@@ -6,12 +6,30 @@ to the workspace directory.
 
 from __future__ import annotations
 
+import locale
+import os
+import shutil
+import signal
 import subprocess
+import threading
 from pathlib import Path
-from typing import Any
+from typing import IO, Any, Callable
 
 from tappi.agent.config import get_workspace
 
+_OUTPUT_CAP = 10_000  # chars returned to the model
+_READ_CAP = _OUTPUT_CAP * 4  # bytes kept per stream; enough for _OUTPUT_CAP chars
+
+# Anything that needs the shell to interpret it: operators, expansion,
+# quoting, comments, line continuations, assignments.
+_SHELL_CHARS = frozenset("|&;<>()$`\\\"'*?[]{}~#!=%\n\r")
+# Builtins/keywords that have no executable on PATH (or behave differently without sh).
+_SHELL_BUILTINS = frozenset({
+    "cd", "export", "unset", "source", ".", "alias", "set", "eval", "exec",
+    "exit", "ulimit", "umask", "read", "type", "hash", "shift", "trap", "wait",
+    "if", "for", "while", "until", "case", "function", "time",
+})
+
 TOOL_SCHEMA = {
     "type": "function",
     "function": {
@@ -64,36 +82,110 @@ class ShellTool:
         timeout = int(params.get("timeout", 30))
 
         try:
-            result = subprocess.run(
-                command,
-                shell=True,
-                capture_output=True,
-                text=True,
-                timeout=timeout,
+            # Plain "prog arg arg" commands are exec'd directly, saving the /bin/sh fork
+            argv = _split_simple(command)
+            proc = subprocess.Popen(
+                argv if argv is not None else command,
+                shell=argv is None,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
                 cwd=str(self.workspace),
+                # Own process group, so a kill reaches the shell's children too
+                start_new_session=os.name == "posix",
             )
+            # Drain both pipes concurrently, keeping only what fits under the
+            # cap. Once a stream passes it the command is killed: a runaway
+            # command (`yes`, a looping build) can't balloon memory, block on
+            # a full pipe, or keep burning CPU until the timeout.
+            capped = threading.Event()
+
+            def on_cap() -> None:
+                capped.set()
+                _kill(proc)
+
+            stdout: list[bytes] = []
+            stderr: list[bytes] = []
+            readers = [
+                threading.Thread(target=_read_capped, args=(proc.stdout, stdout, on_cap), daemon=True),
+                threading.Thread(target=_read_capped, args=(proc.stderr, stderr, on_cap), daemon=True),
+            ]
+            for reader in readers:
+                reader.start()
+            try:
+                returncode = proc.wait(timeout=timeout)
+            except subprocess.TimeoutExpired:
+                _kill(proc)
+                proc.wait()
+                return f"Command timed out after {timeout}s"
+            finally:
+                for reader in readers:
+                    reader.join(timeout=1)
+
+            out_text = _decode(stdout)
+            err_text = _decode(stderr)
 
             output = ""
-            if result.stdout:
-                output += result.stdout
-            if result.stderr:
+            if out_text:
+                output += out_text
+            if err_text:
                 if output:
                     output += "\n"
-                output += f"(stderr) {result.stderr}"
+                output += f"(stderr) {err_text}"
 
             if not output:
                 output = "(no output)"
 
-            if result.returncode != 0:
-                output += f"\n(exit code: {result.returncode})"
+            if capped.is_set():
+                # Its exit code is just the kill, so report why instead
+                return output[:_OUTPUT_CAP] + "\n... (truncated: output limit reached, command killed)"
+
+            if returncode != 0:
+                output += f"\n(exit code: {returncode})"
 
             # Cap at 10KB
-            if len(output) > 10_000:
-                output = output[:10_000] + "\n... (truncated)"
+            if len(output) > _OUTPUT_CAP:
+                output = output[:_OUTPUT_CAP] + "\n... (truncated)"
 
             return output
 
-        except subprocess.TimeoutExpired:
-            return f"Command timed out after {timeout}s"
         except Exception as e:
             return f"Error: {e}"
+
+
+def _split_simple(command: str) -> list[str] | None:
+    """Return argv for a command that doesn't need a shell, else None."""
+    if os.name != "posix" or not _SHELL_CHARS.isdisjoint(command):
+        return None
+    argv = command.split()
+    if not argv or argv[0] in _SHELL_BUILTINS or shutil.which(argv[0]) is None:
+        return None
+    return argv
+
+
+def _read_capped(stream: IO[bytes], sink: list[bytes], on_cap: Callable[[], None]) -> None:
+    """Read a pipe to EOF, or until _READ_CAP bytes are kept (then call on_cap)."""
+    kept = 0
+    with stream:
+        while chunk := stream.read(65536):
+            if kept + len(chunk) > _READ_CAP:
+                sink.append(chunk[:_READ_CAP - kept])
+                on_cap()
+                return
+            sink.append(chunk)
+            kept += len(chunk)
+
+
+def _kill(proc: subprocess.Popen) -> None:
+    """Kill the command, and on POSIX everything in its process group."""
+    if os.name == "posix":
+        try:
+            os.killpg(proc.pid, signal.SIGKILL)
+        except OSError:
+            pass  # already gone
+    else:
+        proc.kill()
+
+
+def _decode(chunks: list[bytes]) -> str:
+    text = b"".join(chunks).decode(locale.getpreferredencoding(False), errors="replace")
+    return text.replace("\r\n", "\n").replace("\r", "\n")
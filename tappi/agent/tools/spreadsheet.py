@@ -6,11 +6,21 @@ Excel: openpyxl (optional dep).
 
 from __future__ import annotations
 
+import contextlib
 import csv
+import functools
 import io
+import itertools
 import json
+import operator
+import os
+import re
+import shutil
+import tempfile
+import zipfile
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable, Iterator, Sequence
 
 from tappi.agent.config import get_workspace
 
@@ -54,6 +64,15 @@ TOOL_SCHEMA = {
                     "description": "Column names to include in read (default: all)",
                 },
                 "max_rows": {"type": "integer", "description": "Max rows to read (default: 500)"},
+                "preserve_formatting": {
+                    "type": "boolean",
+                    "description": (
+                        "Excel write only: keep cell styles, merges, charts, macros and "
+                        "external links by re-saving the full workbook (default: true). "
+                        "Set false to stream large files quickly — values and formulas "
+                        "only, all formatting is dropped"
+                    ),
+                },
             },
             "required": ["action", "path"],
         },
@@ -61,24 +80,236 @@ TOOL_SCHEMA = {
 }
 
 
+# Large reads of large CSVs try the pyarrow reader first when it's installed;
+# for small files or the default 500-row cap, stdlib streaming is faster.
+_ARROW_MIN_BYTES = 1 << 20
+_ARROW_MIN_ROWS = 5_000
+
+_WRITE_BUFFER = 1 << 20  # file buffer for CSV writes
+
+# Excel's hard row limit — a dimension this large is almost always a stale
+# <dimension> tag written by another tool, not real data.
+_EXCEL_MAX_ROWS = 1_048_576
+_ACTIVE_TAB_RE = re.compile(rb'<workbookView[^>]*\bactiveTab="(\d+)"')
+
+
+def _sheet_dims(ws: Any) -> tuple[int, int]:
+    """(rows, cols) for a read-only worksheet.
+
+    Trusts the sheet's stored dimension when it looks sane; otherwise
+    (missing or bogus) drops it and counts the rows by streaming.
+    """
+    if not hasattr(ws, "iter_rows"):  # chartsheet — no cells
+        return 0, 0
+    rows, cols = ws.max_row, ws.max_column
+    if rows is None or cols is None or rows >= _EXCEL_MAX_ROWS:
+        ws.reset_dimensions()
+        rows = cols = 0
+        for row in ws.iter_rows(values_only=True):
+            rows += 1
+            cols = max(cols, len(row))
+    return rows, cols
+
+
+@dataclass(frozen=True)
+class _FileInfo:
+    rows: int
+    cols: int = 0
+    sheets: tuple[str, ...] | None = None  # Excel only
+    sheet_dims: tuple[tuple[int, int], ...] = ()  # Excel only, (rows, cols) per sheet
+    headers: tuple[str, ...] = ()  # CSV only
+
+
+@functools.lru_cache(maxsize=256)
+def _file_info(path: str, is_excel: bool, mtime_ns: int, size: int) -> _FileInfo:
+    """Parse spreadsheet metadata for ``info``.
+
+    Keyed on (path, mtime_ns, size), so repeat calls on an unchanged file
+    skip the parse and any modification invalidates the entry.
+    """
+    if is_excel:
+        fast = _calamine_info(path)
+        if fast is not None:
+            return fast
+
+        from openpyxl import load_workbook
+        with contextlib.closing(load_workbook(path, read_only=True, data_only=True)) as wb:
+            sheets = tuple(wb.sheetnames)
+            active = wb.sheetnames.index(wb.active.title)
+            # Sized on the one handle: a read-only sheet's dimensions are a
+            # cheap lookup, while each extra handle would re-parse the
+            # workbook and its shared strings
+            dims = tuple(_sheet_dims(wb[name]) for name in sheets)
+        rows, cols = dims[active]
+        return _FileInfo(rows=rows, cols=cols, sheets=sheets, sheet_dims=dims)
+
+    # Count records without materializing them (csv.reader keeps quoted
+    # newlines inside one record, unlike a raw line count)
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        reader = csv.reader(f)
+        headers = tuple(next(reader, []))
+        rows = sum(1 for _ in reader)
+    return _FileInfo(rows=rows, headers=headers)
+
+
+@functools.lru_cache(maxsize=64)
+def _projector(col_indices: tuple[int, ...]) -> Callable[[Sequence], tuple]:
+    """Row → selected-cells function, specialized per projection and cached.
+
+    itemgetter is already a C-level specialization of the projection, so
+    repeat reads with the same columns reuse one callable.
+    """
+    if len(col_indices) == 1:
+        idx = col_indices[0]
+        return lambda row: (row[idx],)
+    if not col_indices:
+        return lambda row: ()
+    return operator.itemgetter(*col_indices)
+
+
+def _render_sheet(
+    rows: Iterator[tuple],
+    filter_cols: list | None,
+    max_rows: int,
+    total_rows: Callable[[Iterator[tuple]], int],
+) -> str:
+    """Render sheet rows (header first) as CSV text, streaming at most max_rows.
+
+    ``total_rows`` is only consulted on truncation, with the unread rows.
+    """
+    header_row = next(rows, None)
+    if header_row is None:
+        return "(empty spreadsheet)"
+
+    headers = [str(c) if c else f"col_{i}" for i, c in enumerate(header_row)]
+    if filter_cols:
+        col_indices = [i for i, h in enumerate(headers) if h in filter_cols]
+        if not col_indices:
+            return _no_matching_columns(headers)
+        headers = [headers[i] for i in col_indices]
+    else:
+        col_indices = list(range(len(headers)))
+
+    buf = io.StringIO()
+    writer = csv.writer(buf, lineterminator="\n")
+    writer.writerow(headers)
+    project = _projector(tuple(col_indices))
+    width = max(col_indices, default=-1) + 1
+    pad = (None,) * width
+    writer.writerows(
+        project(row if len(row) >= width else row + pad[len(row):])
+        for row in itertools.islice(rows, max_rows)
+    )
+
+    if next(rows, None) is not None:
+        buf.write(f"\n... (truncated at {max_rows} rows, {total_rows(rows) - 1} total)\n")
+    return _csv_text(buf)
+
+
+def _read_excel_calamine(resolved: Path, sheet: str | None, filter_cols: list | None, max_rows: int) -> str | None:
+    """Rust-parser fast path for Excel reads (optional python-calamine).
+
+    Returns None when python-calamine isn't installed, so the caller uses
+    openpyxl. Cells are normalized to what openpyxl would yield.
+    """
+    try:
+        from python_calamine import CalamineWorkbook
+    except ImportError:
+        return None
+
+    with CalamineWorkbook.from_path(str(resolved)) as wb:
+        names = wb.sheet_names
+        name = sheet if sheet and sheet in names else names[_active_tab(resolved, len(names))]
+        ws = wb.get_sheet_by_name(name)
+        if ws.end is None:
+            return "(empty spreadsheet)"
+        return _render_sheet(
+            _calamine_rows(ws.iter_rows(), ws.start[1]),
+            filter_cols,
+            max_rows,
+            lambda rest: ws.end[0] + 1,
+        )
+
+
+def _calamine_info(path: str) -> _FileInfo | None:
+    """Excel ``info`` via python-calamine; None when it isn't installed."""
+    try:
+        from python_calamine import CalamineWorkbook
+    except ImportError:
+        return None
+
+    with CalamineWorkbook.from_path(path) as wb:
+        names = tuple(wb.sheet_names)
+        dims = []
+        for name in names:
+            end = wb.get_sheet_by_name(name).end
+            dims.append((end[0] + 1, end[1] + 1) if end is not None else (0, 0))
+    rows, cols = dims[_active_tab(Path(path), len(names))]
+    return _FileInfo(rows=rows, cols=cols, sheets=names, sheet_dims=tuple(dims))
+
+
+def _calamine_rows(rows: Iterator[list], col_offset: int) -> Iterator[tuple]:
+    """Adapt calamine rows to openpyxl's values_only shape.
+
+    calamine starts each row at the first used column and returns every
+    number as float; openpyxl starts at column A and keeps integers.
+    """
+    lead = ("",) * col_offset
+    for row in rows:
+        yield lead + tuple(int(v) if type(v) is float and v.is_integer() else v for v in row)
+
+
+def _active_tab(resolved: Path, n_sheets: int) -> int:
+    """Index of the workbook's active sheet (what openpyxl calls wb.active)."""
+    try:
+        with zipfile.ZipFile(resolved) as zf:
+            m = _ACTIVE_TAB_RE.search(zf.read("xl/workbook.xml"))
+    except (zipfile.BadZipFile, KeyError):
+        return 0
+    idx = int(m.group(1)) if m else 0
+    return idx if 0 <= idx < n_sheets else 0
+
+
+def _no_matching_columns(headers: list[str]) -> str:
+    """Early exit when a column filter selects nothing — no rows are scanned."""
+    return f"(no matching columns — available: {', '.join(headers)})"
+
+
+def _csv_text(buf: io.StringIO) -> str:
+    """Rendered CSV output without the writer's final line terminator.
+
+    The terminator is truncated in place so the buffer is materialized
+    exactly once, rather than copied again by a trailing slice.
+    """
+    end = buf.tell()
+    if end:
+        buf.seek(end - 1)
+        if buf.read(1) == "\n":
+            buf.truncate(end - 1)
+    return buf.getvalue()
+
+
 class SpreadsheetTool:
     """CSV and Excel operations, sandboxed to workspace."""
 
     def __init__(self, workspace: Path | None = None) -> None:
         self._workspace = workspace
+        self._resolved_workspace: Path | None = None
 
     @property
     def workspace(self) -> Path:
-        if self._workspace is None:
-            self._workspace = get_workspace()
-        self._workspace = self._workspace.resolve()
-        self._workspace.mkdir(parents=True, exist_ok=True)
-        return self._workspace
+        # Resolved and created once; every _resolve() call reuses it.
+        if self._resolved_workspace is None:
+            ws = self._workspace if self._workspace is not None else get_workspace()
+            ws = ws.resolve()
+            ws.mkdir(parents=True, exist_ok=True)
+            self._resolved_workspace = ws
+        return self._resolved_workspace
 
     def _resolve(self, path: str) -> Path:
-        resolved = (self.workspace / path).resolve()
-        ws_resolved = self.workspace.resolve()
-        if not str(resolved).startswith(str(ws_resolved)):
+        workspace = self.workspace
+        resolved = (workspace / path).resolve()
+        if not resolved.is_relative_to(workspace):
             raise PermissionError(f"Access denied: path escapes workspace")
         return resolved
 
@@ -118,52 +349,114 @@ class SpreadsheetTool:
             return self._read_csv(resolved, filter_cols, max_rows)
 
     def _read_csv(self, resolved: Path, filter_cols: list | None, max_rows: int) -> str:
+        if max_rows >= _ARROW_MIN_ROWS and resolved.stat().st_size >= _ARROW_MIN_BYTES:
+            fast = self._read_csv_arrow(resolved, filter_cols, max_rows)
+            if fast is not None:
+                return fast
+
+        buf = io.StringIO()
+        writer = csv.writer(buf, lineterminator="\n")
         with open(resolved, newline="", encoding="utf-8-sig") as f:
-            reader = csv.DictReader(f)
-            headers = reader.fieldnames or []
+            reader = csv.reader(f)
+            headers = next(reader, [])
+            records = filter(None, reader)  # blank lines carry no record (as with DictReader)
+            rows = itertools.islice(records, max_rows)
+
             if filter_cols:
-                headers = [h for h in headers if h in filter_cols]
+                col_indices = [i for i, h in enumerate(headers) if h in filter_cols]
+                if not col_indices:
+                    return _no_matching_columns(headers)
+                headers = [headers[i] for i in col_indices]
+                project = _projector(tuple(col_indices))
+                width = max(col_indices, default=-1) + 1
+                pad = [""] * width
+                rows = (project(r if len(r) >= width else r + pad[len(r):]) for r in rows)
+            else:
+                # No projection: rows go to the writer as parsed, only squared
+                # up to the header width when ragged
+                width = len(headers)
+                pad = [""] * width
+                rows = (r if len(r) == width else (r + pad)[:width] for r in rows)
+
+            writer.writerow(headers)
+            writer.writerows(rows)
+            truncated = next(records, None) is not None
+
+        if truncated:
+            buf.write(f"\n... (truncated at {max_rows} rows)\n")
+        return _csv_text(buf)
+
+    def _read_csv_arrow(self, resolved: Path, filter_cols: list | None, max_rows: int) -> str | None:
+        """Native-tokenizer fast path for large CSVs (optional pyarrow).
+
+        Every column is read as a string so the output matches the stdlib
+        path. Returns None — caller falls back to csv.reader — when pyarrow
+        isn't installed or the file needs the stdlib's leniency (duplicate
+        headers, ragged rows).
+        """
+        try:
+            import pyarrow as pa
+            import pyarrow.csv as pv
+        except ImportError:
+            return None
 
-            lines = [",".join(headers)]
-            count = 0
-            for row in reader:
-                if count >= max_rows:
-                    lines.append(f"\n... (truncated at {max_rows} rows)")
-                    break
-                vals = [str(row.get(h, "")) for h in headers]
-                lines.append(",".join(vals))
-                count += 1
+        with open(resolved, newline="", encoding="utf-8-sig") as f:
+            headers = next(csv.reader(f), [])
+        if not headers or len(set(headers)) != len(headers):
+            return None
+        columns = [h for h in headers if h in filter_cols] if filter_cols else headers
+        if not columns:
+            return None
 
-        return "\n".join(lines)
+        try:
+            reader = pv.open_csv(
+                str(resolved),
+                parse_options=pv.ParseOptions(newlines_in_values=True),
+                convert_options=pv.ConvertOptions(
+                    column_types={h: pa.string() for h in headers},
+                    include_columns=columns,
+                    strings_can_be_null=False,
+                    quoted_strings_can_be_null=False,
+                ),
+            )
+            # Stream batches only until we know whether there's a row past the cap
+            batches, count = [], 0
+            for batch in reader:
+                batches.append(batch)
+                count += batch.num_rows
+                if count > max_rows:
+                    break
+        except pa.ArrowException:
+            return None
+
+        table = pa.Table.from_batches(batches, schema=reader.schema).slice(0, max_rows)
+        buf = io.StringIO()
+        writer = csv.writer(buf, lineterminator="\n")
+        writer.writerow(columns)
+        writer.writerows(zip(*(col.to_pylist() for col in table.columns)))
+        if count > max_rows:
+            buf.write(f"\n... (truncated at {max_rows} rows)\n")
+        return _csv_text(buf)
 
     def _read_excel(self, resolved: Path, sheet: str | None, filter_cols: list | None, max_rows: int) -> str:
-        from openpyxl import load_workbook
+        fast = _read_excel_calamine(resolved, sheet, filter_cols, max_rows)
+        if fast is not None:
+            return fast
 
-        wb = load_workbook(str(resolved), read_only=True, data_only=True)
-        ws = wb[sheet] if sheet and sheet in wb.sheetnames else wb.active
-
-        rows = list(ws.iter_rows(values_only=True))
-        wb.close()
-
-        if not rows:
-            return "(empty spreadsheet)"
-
-        headers = [str(c) if c else f"col_{i}" for i, c in enumerate(rows[0])]
-        if filter_cols:
-            col_indices = [i for i, h in enumerate(headers) if h in filter_cols]
-            headers = [headers[i] for i in col_indices]
-        else:
-            col_indices = list(range(len(headers)))
+        from openpyxl import load_workbook
 
-        lines = [",".join(headers)]
-        for row in rows[1:max_rows + 1]:
-            vals = [str(row[i]) if i < len(row) and row[i] is not None else "" for i in col_indices]
-            lines.append(",".join(vals))
+        # Workbook has no __enter__; closing() gives the same guaranteed release
+        with contextlib.closing(load_workbook(str(resolved), read_only=True, data_only=True)) as wb:
+            ws = wb[sheet] if sheet and sheet in wb.sheetnames else wb.active
 
-        if len(rows) - 1 > max_rows:
-            lines.append(f"\n... (truncated at {max_rows} rows, {len(rows) - 1} total)")
+            def total_rows(rest: Iterator) -> int:
+                # Prefer the stored dimension; count the rest only when it can't be trusted
+                total = ws.max_row
+                if total is None or total >= _EXCEL_MAX_ROWS:
+                    total = max_rows + 2 + sum(1 for _ in rest)
+                return total
 
-        return "\n".join(lines)
+            return _render_sheet(ws.iter_rows(values_only=True), filter_cols, max_rows, total_rows)
 
     def _write(self, params: dict) -> str:
         path = params.get("path", "")
@@ -176,21 +469,73 @@ class SpreadsheetTool:
             return f"File not found: {path}. Use action='create' to make a new file."
 
         if self._is_excel(path):
-            from openpyxl import load_workbook
-            wb = load_workbook(str(resolved))
-            ws = wb.active
-            for row in rows:
-                ws.append([str(v) for v in row])
-            wb.save(str(resolved))
-            wb.close()
+            new_rows = [[str(v) for v in row] for row in rows]
+            # Streaming can't carry styles, merges, charts or VBA, so it's
+            # only taken on explicit request (and never for .xlsm)
+            if params.get("preserve_formatting", True) or resolved.suffix.lower() == ".xlsm":
+                self._append_excel_full(resolved, new_rows)
+            else:
+                self._append_excel(resolved, new_rows)
         else:
-            with open(resolved, "a", newline="", encoding="utf-8") as f:
-                writer = csv.writer(f)
-                for row in rows:
-                    writer.writerow(row)
+            # One C-level writerows loop into a 1 MiB buffer → few large writes
+            with open(resolved, "a", newline="", encoding="utf-8", buffering=_WRITE_BUFFER) as f:
+                csv.writer(f).writerows(rows)
 
         return f"Appended {len(rows)} rows to {path}"
 
+    def _append_excel(self, resolved: Path, new_rows: list[list[str]]) -> None:
+        """Append rows to the active sheet of an .xlsx file.
+
+        Streams every sheet from a read-only handle into a write-only
+        workbook and swaps the result in, so memory stays flat instead of
+        loading (and re-serializing) the full workbook object model.
+        Cell values and formulas are kept; cell styling is not.
+        """
+        from openpyxl import Workbook, load_workbook
+
+        fd, tmp = tempfile.mkstemp(dir=resolved.parent, prefix=".tappi-", suffix=resolved.suffix)
+        os.close(fd)
+        try:
+            with contextlib.closing(load_workbook(str(resolved), read_only=True, data_only=False)) as src:
+                dst = Workbook(write_only=True)
+                active = src.active.title
+                for name in src.sheetnames:
+                    out = dst.create_sheet(title=name)
+                    for row in src[name].iter_rows(values_only=True):
+                        out.append(row)
+                    if name == active:
+                        for row in new_rows:
+                            out.append(row)
+                dst.active = src.sheetnames.index(active)
+                dst.save(tmp)
+            # mkstemp's file is 0600 — keep the workbook's own mode
+            shutil.copymode(resolved, tmp)
+            os.replace(tmp, resolved)
+        except BaseException:
+            with contextlib.suppress(OSError):
+                os.unlink(tmp)
+            raise
+
+    def _append_excel_full(self, resolved: Path, new_rows: list[list[str]]) -> None:
+        """Append rows via a full load/save, keeping styles, macros and links.
+
+        data_only=False is explicit: loading cached values instead would
+        save every formula back as a constant.
+        """
+        from openpyxl import load_workbook
+
+        wb = load_workbook(
+            str(resolved),
+            data_only=False,
+            keep_vba=resolved.suffix.lower() == ".xlsm",
+            keep_links=True,
+        )
+        with contextlib.closing(wb):
+            ws = wb.active
+            for row in new_rows:
+                ws.append(row)
+            wb.save(str(resolved))
+
     def _create(self, params: dict) -> str:
         path = params.get("path", "")
         headers = params.get("headers", [])
@@ -201,8 +546,9 @@ class SpreadsheetTool:
 
         if self._is_excel(path):
             from openpyxl import Workbook
-            wb = Workbook()
-            ws = wb.active
+            # Write-only: rows stream straight to XML instead of living as Cell objects
+            wb = Workbook(write_only=True)
+            ws = wb.create_sheet()
             if headers:
                 ws.append(headers)
             for row in rows:
@@ -210,12 +556,11 @@ class SpreadsheetTool:
             wb.save(str(resolved))
             wb.close()
         else:
-            with open(resolved, "w", newline="", encoding="utf-8") as f:
+            with open(resolved, "w", newline="", encoding="utf-8", buffering=_WRITE_BUFFER) as f:
                 writer = csv.writer(f)
                 if headers:
                     writer.writerow(headers)
-                for row in rows:
-                    writer.writerow(row)
+                writer.writerows(rows)
 
         total = len(rows) + (1 if headers else 0)
         return f"Created: {path} ({total} rows)"
@@ -226,18 +571,12 @@ class SpreadsheetTool:
         if not resolved.exists():
             return f"File not found: {path}"
 
-        if self._is_excel(path):
-            from openpyxl import load_workbook
-            wb = load_workbook(str(resolved), read_only=True)
-            sheets = wb.sheetnames
-            ws = wb.active
-            rows = ws.max_row or 0
-            cols = ws.max_column or 0
-            wb.close()
-            return f"File: {path}\nType: Excel\nSheets: {', '.join(sheets)}\nRows: {rows}\nColumns: {cols}"
-        else:
-            with open(resolved, newline="", encoding="utf-8-sig") as f:
-                reader = csv.reader(f)
-                rows_list = list(reader)
-            headers = rows_list[0] if rows_list else []
-            return f"File: {path}\nType: CSV\nHeaders: {', '.join(headers)}\nRows: {len(rows_list) - 1}"
+        st = resolved.stat()
+        info = _file_info(str(resolved), self._is_excel(path), st.st_mtime_ns, st.st_size)
+        if info.sheets is not None:
+            text = f"File: {path}\nType: Excel\nSheets: {', '.join(info.sheets)}\nRows: {info.rows}\nColumns: {info.cols}"
+            if len(info.sheets) > 1:
+                sizes = ", ".join(f"{name} ({r}×{c})" for name, (r, c) in zip(info.sheets, info.sheet_dims))
+                text += f"\nSheet sizes: {sizes}"
+            return text
+        return f"File: {path}\nType: CSV\nHeaders: {', '.join(info.headers)}\nRows: {info.rows}"
@@ -15,496 +15,613 @@ Examples:
 
 from __future__ import annotations
 
+import functools
 import sys
 import os
 import textwrap
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Mapping, NamedTuple
 
-from tappi.core import Browser, CDPError, BrowserNotRunning, _find_chrome
-from tappi.profiles import (
-    list_profiles,
-    get_profile,
-    create_profile,
-    set_default,
-    delete_profile,
-)
+if TYPE_CHECKING:
+    from tappi.core import Browser
 
 
 # ── Colors (disable with NO_COLOR env var) ──
 
-_NO_COLOR = os.environ.get("NO_COLOR") or not sys.stdout.isatty()
+# TAPPI_NO_COLOR=1 is exported once decided so child processes (Chrome,
+# agent shell commands, nested tappi calls) skip the isatty probe. Only the
+# "off" answer is propagated — a child's stdout may be a pipe even when ours
+# is a terminal, so "on" still has to be probed.
+_NO_COLOR = bool(
+    os.environ.get("NO_COLOR")
+    or os.environ.get("TAPPI_NO_COLOR") == "1"
+    or not sys.stdout.isatty()
+)
+if _NO_COLOR:
+    os.environ["TAPPI_NO_COLOR"] = "1"
+
 
+if _NO_COLOR:
+    # Identity — no per-call branch when color is off
+    _dim = _bold = _cyan = _green = _yellow = _red = str
+else:
 
-def _dim(s: str) -> str:
-    return s if _NO_COLOR else f"\033[2m{s}\033[0m"
+    def _dim(s: str) -> str:
+        return "\033[2m" + s + "\033[0m"
 
+    def _bold(s: str) -> str:
+        return "\033[1m" + s + "\033[0m"
 
-def _bold(s: str) -> str:
-    return s if _NO_COLOR else f"\033[1m{s}\033[0m"
+    def _cyan(s: str) -> str:
+        return "\033[36m" + s + "\033[0m"
 
+    def _green(s: str) -> str:
+        return "\033[32m" + s + "\033[0m"
 
-def _cyan(s: str) -> str:
-    return s if _NO_COLOR else f"\033[36m{s}\033[0m"
+    def _yellow(s: str) -> str:
+        return "\033[33m" + s + "\033[0m"
 
+    def _red(s: str) -> str:
+        return "\033[31m" + s + "\033[0m"
 
-def _green(s: str) -> str:
-    return s if _NO_COLOR else f"\033[32m{s}\033[0m"
 
+_SEE_ALL_COMMANDS = "Run 'tappi --help' to see all commands."
 
-def _yellow(s: str) -> str:
-    return s if _NO_COLOR else f"\033[33m{s}\033[0m"
 
+# ── CDP liveness ──
 
-def _red(s: str) -> str:
-    return s if _NO_COLOR else f"\033[31m{s}\033[0m"
+
+def _is_port_live(port: int, timeout: float = 0.5) -> bool:
+    """True if a CDP endpoint answers ``/json/version`` on *port*.
+
+    A raw HTTP/1.0 request over a socket — only the status line matters, so
+    there's no need to pull in urllib/http.client for a liveness check.
+    """
+    import socket
+
+    try:
+        with socket.create_connection(("127.0.0.1", port), timeout=timeout) as sock:
+            sock.sendall(
+                b"GET /json/version HTTP/1.0\r\nHost: 127.0.0.1\r\n\r\n"
+            )
+            head = b""
+            while b"\r\n" not in head and len(head) < 64:
+                chunk = sock.recv(64)
+                if not chunk:
+                    break
+                head += chunk
+    except OSError:
+        return False
+    status = head.split(b"\r\n", 1)[0].split()
+    return len(status) > 1 and status[0].startswith(b"HTTP/") and status[1] == b"200"
 
 
 # ── Help text ──
 
-COMMANDS_HELP = {
-    "launch": {
-        "usage": "tappi launch [name] [--headless] [--port PORT]",
-        "desc": (
-            "Start Chrome with a named profile.\n\n"
-            "Each profile has its own browser sessions (cookies, logins) and\n"
-            "its own CDP port. Profiles live in ~/.tappi/profiles/<name>/.\n\n"
-            "Subcommands:\n"
-            "  launch              Launch the default profile\n"
-            "  launch <name>       Launch a specific profile\n"
-            "  launch new [name]   Create a new profile\n"
-            "  launch list         List all profiles\n"
-            "  launch --default <name>   Set the default profile\n"
-            "  launch delete <name>      Delete a profile"
-        ),
-        "example": (
-            "  $ tappi launch\n"
-            "  ✓ Chrome launched — profile: default (port 9222)\n\n"
-            "  $ tappi launch new work\n"
-            "  ✓ Created profile 'work' (port 9223)\n\n"
-            "  $ tappi launch work\n"
-            "  ✓ Chrome launched — profile: work (port 9223)\n\n"
-            "  $ tappi launch list\n"
-            "  default  port 9222  ★ default\n"
-            "  work     port 9223\n\n"
-            "  $ tappi launch --default work\n"
-            "  ✓ Default profile set to 'work'"
+
+class HelpEntry(NamedTuple):
+    """Detailed help for one command; empty example/hint are omitted."""
+
+    usage: str
+    desc: str
+    example: str = ""
+    hint: str = ""
+
+
+@functools.lru_cache(maxsize=1)
+def _commands_help() -> Mapping[str, HelpEntry]:
+    """Per-command help table, built on first use rather than at import.
+
+    Read-only view, since the cached table is shared for the process.
+    """
+    table = {
+        "launch": HelpEntry(
+            usage="tappi launch [name] [--headless] [--port PORT]",
+            desc=(
+                "Start Chrome with a named profile.\n\n"
+                "Each profile has its own browser sessions (cookies, logins) and\n"
+                "its own CDP port. Profiles live in ~/.tappi/profiles/<name>/.\n\n"
+                "Subcommands:\n"
+                "  launch              Launch the default profile\n"
+                "  launch <name>       Launch a specific profile\n"
+                "  launch new [name]   Create a new profile\n"
+                "  launch list         List all profiles\n"
+                "  launch --default <name>   Set the default profile\n"
+                "  launch delete <name>      Delete a profile"
+            ),
+            example=(
+                "  $ tappi launch\n"
+                "  ✓ Chrome launched — profile: default (port 9222)\n\n"
+                "  $ tappi launch new work\n"
+                "  ✓ Created profile 'work' (port 9223)\n\n"
+                "  $ tappi launch work\n"
+                "  ✓ Chrome launched — profile: work (port 9223)\n\n"
+                "  $ tappi launch list\n"
+                "  default  port 9222  ★ default\n"
+                "  work     port 9223\n\n"
+                "  $ tappi launch --default work\n"
+                "  ✓ Default profile set to 'work'"
+            ),
+            hint=(
+                "First launch of a profile? A fresh Chrome window opens.\n"
+                "Log into your sites — sessions persist for all future launches.\n"
+                "Each profile gets its own port, so you can run multiple simultaneously."
+            ),
         ),
-        "hint": (
-            "First launch of a profile? A fresh Chrome window opens.\n"
-            "Log into your sites — sessions persist for all future launches.\n"
-            "Each profile gets its own port, so you can run multiple simultaneously."
+        "tabs": HelpEntry(
+            usage="tappi tabs",
+            desc="List all open browser tabs with their index, title, and URL.",
+            example=(
+                "  $ tappi tabs\n"
+                "  [0] Google — https://google.com\n"
+                "  [1] GitHub — https://github.com"
+            ),
+            hint="Use the [index] number with 'tab' to switch tabs.",
         ),
-    },
-    "tabs": {
-        "usage": "tappi tabs",
-        "desc": "List all open browser tabs with their index, title, and URL.",
-        "example": (
-            "  $ tappi tabs\n"
-            "  [0] Google — https://google.com\n"
-            "  [1] GitHub — https://github.com"
+        "open": HelpEntry(
+            usage="tappi open <url>",
+            desc="Navigate the current tab to a URL. Adds https:// if missing.",
+            example="  $ tappi open github.com\n  Navigated to https://github.com",
+            hint="After navigating, run 'elements' to see what you can interact with.",
         ),
-        "hint": "Use the [index] number with 'tab' to switch tabs.",
-    },
-    "open": {
-        "usage": "tappi open <url>",
-        "desc": "Navigate the current tab to a URL. Adds https:// if missing.",
-        "example": "  $ tappi open github.com\n  Navigated to https://github.com",
-        "hint": "After navigating, run 'elements' to see what you can interact with.",
-    },
-    "tab": {
-        "usage": "tappi tab <index>",
-        "desc": "Switch to a different tab by its index number.",
-        "example": "  $ tappi tab 2\n  Switched to tab [2]: Reddit — https://reddit.com",
-        "hint": "Run 'tabs' first to see available tabs and their indices.",
-    },
-    "newtab": {
-        "usage": "tappi newtab [url]",
-        "desc": "Open a new browser tab, optionally with a URL.",
-        "example": "  $ tappi newtab https://example.com",
-    },
-    "close": {
-        "usage": "tappi close [index]",
-        "desc": "Close a tab. Closes the current tab if no index given.",
-        "example": "  $ tappi close 3",
-    },
-    "elements": {
-        "usage": "tappi elements [css-selector]",
-        "desc": (
-            "List all interactive elements on the page — links, buttons, inputs, etc.\n"
-            "Each element gets a number you can use with 'click' and 'type'.\n"
-            "Pierces shadow DOM automatically (works on Reddit, GitHub, etc.)."
+        "tab": HelpEntry(
+            usage="tappi tab <index>",
+            desc="Switch to a different tab by its index number.",
+            example="  $ tappi tab 2\n  Switched to tab [2]: Reddit — https://reddit.com",
+            hint="Run 'tabs' first to see available tabs and their indices.",
         ),
-        "example": (
-            "  $ tappi elements\n"
-            "  [0] (link) Home → /\n"
-            "  [1] (button) Sign In\n"
-            "  [2] (input:text) Search\n"
-            "  [3] (link) About → /about\n\n"
-            "  $ tappi elements \".sidebar\"   # Only sidebar elements"
+        "newtab": HelpEntry(
+            usage="tappi newtab [url]",
+            desc="Open a new browser tab, optionally with a URL.",
+            example="  $ tappi newtab https://example.com",
         ),
-        "hint": (
-            "Elements are numbered — use 'click 1' or 'type 2 hello' to interact.\n"
-            "Disabled elements show as (button:disabled)."
+        "close": HelpEntry(
+            usage="tappi close [index]",
+            desc="Close a tab. Closes the current tab if no index given.",
+            example="  $ tappi close 3",
         ),
-    },
-    "click": {
-        "usage": "tappi click <index>",
-        "desc": (
-            "Click an element by its index number from 'elements' output.\n"
-            "Uses real mouse events (works with React, Vue, Angular, etc.)."
+        "elements": HelpEntry(
+            usage="tappi elements [css-selector]",
+            desc=(
+                "List all interactive elements on the page — links, buttons, inputs, etc.\n"
+                "Each element gets a number you can use with 'click' and 'type'.\n"
+                "Pierces shadow DOM automatically (works on Reddit, GitHub, etc.)."
+            ),
+            example=(
+                "  $ tappi elements\n"
+                "  [0] (link) Home → /\n"
+                "  [1] (button) Sign In\n"
+                "  [2] (input:text) Search\n"
+                "  [3] (link) About → /about\n\n"
+                "  $ tappi elements \".sidebar\"   # Only sidebar elements"
+            ),
+            hint=(
+                "Elements are numbered — use 'click 1' or 'type 2 hello' to interact.\n"
+                "Disabled elements show as (button:disabled)."
+            ),
         ),
-        "example": "  $ tappi click 1\n  Clicked: (button) Sign In",
-        "hint": (
-            "If the page changed since 'elements', indices may be stale.\n"
-            "Run 'elements' again to re-index."
+        "click": HelpEntry(
+            usage="tappi click <index>",
+            desc=(
+                "Click an element by its index number from 'elements' output.\n"
+                "Uses real mouse events (works with React, Vue, Angular, etc.)."
+            ),
+            example="  $ tappi click 1\n  Clicked: (button) Sign In",
+            hint=(
+                "If the page changed since 'elements', indices may be stale.\n"
+                "Run 'elements' again to re-index."
+            ),
         ),
-    },
-    "type": {
-        "usage": "tappi type <index> <text>",
-        "desc": (
-            "Type text into an input element. Clears existing content first.\n"
-            "Works with inputs, textareas, contenteditable, and ARIA textboxes."
+        "type": HelpEntry(
+            usage="tappi type <index> <text>",
+            desc=(
+                "Type text into an input element. Clears existing content first.\n"
+                "Works with inputs, textareas, contenteditable, and ARIA textboxes."
+            ),
+            example=(
+                "  $ tappi type 2 \"hello world\"\n"
+                "  Typed into [2] (input)"
+            ),
+            hint="The element must be a text input. If it's a button or link, use 'click' instead.",
         ),
-        "example": (
-            "  $ tappi type 2 \"hello world\"\n"
-            "  Typed into [2] (input)"
+        "text": HelpEntry(
+            usage="tappi text [css-selector]",
+            desc="Extract visible text from the page (max 8KB). Pierces shadow DOM.",
+            example=(
+                "  $ tappi text\n"
+                "  Welcome to GitHub. Let's build from here ...\n\n"
+                "  $ tappi text \".main-content\"   # Just the main area"
+            ),
         ),
-        "hint": "The element must be a text input. If it's a button or link, use 'click' instead.",
-    },
-    "text": {
-        "usage": "tappi text [css-selector]",
-        "desc": "Extract visible text from the page (max 8KB). Pierces shadow DOM.",
-        "example": (
-            "  $ tappi text\n"
-            "  Welcome to GitHub. Let's build from here ...\n\n"
-            "  $ tappi text \".main-content\"   # Just the main area"
+        "html": HelpEntry(
+            usage="tappi html <css-selector>",
+            desc="Get the outerHTML of a specific element (max 10KB).",
+            example="  $ tappi html \"nav.header\"",
         ),
-    },
-    "html": {
-        "usage": "tappi html <css-selector>",
-        "desc": "Get the outerHTML of a specific element (max 10KB).",
-        "example": "  $ tappi html \"nav.header\"",
-    },
-    "eval": {
-        "usage": "tappi eval <javascript>",
-        "desc": "Run JavaScript in the page context and print the result.",
-        "example": (
-            "  $ tappi eval \"document.title\"\n"
-            "  GitHub\n\n"
-            "  $ tappi eval \"document.querySelectorAll('img').length\"\n"
-            "  42"
+        "eval": HelpEntry(
+            usage="tappi eval <javascript>",
+            desc="Run JavaScript in the page context and print the result.",
+            example=(
+                "  $ tappi eval \"document.title\"\n"
+                "  GitHub\n\n"
+                "  $ tappi eval \"document.querySelectorAll('img').length\"\n"
+                "  42"
+            ),
         ),
-    },
-    "screenshot": {
-        "usage": "tappi screenshot [path]",
-        "desc": "Save a screenshot of the current page.",
-        "example": (
-            "  $ tappi screenshot\n"
-            "  /tmp/tappi_screenshot_1708300000.png\n\n"
-            "  $ tappi screenshot ~/Desktop/page.png"
+        "screenshot": HelpEntry(
+            usage="tappi screenshot [path]",
+            desc="Save a screenshot of the current page.",
+            example=(
+                "  $ tappi screenshot\n"
+                "  /tmp/tappi_screenshot_1708300000.png\n\n"
+                "  $ tappi screenshot ~/Desktop/page.png"
+            ),
         ),
-    },
-    "scroll": {
-        "usage": "tappi scroll <up|down|top|bottom> [pixels]",
-        "desc": "Scroll the page in a direction. Default: 600px.",
-        "example": "  $ tappi scroll down 1000",
-    },
-    "url": {
-        "usage": "tappi url",
-        "desc": "Print the current page URL.",
-        "example": "  $ tappi url\n  https://github.com",
-    },
-    "back": {
-        "usage": "tappi back",
-        "desc": "Go back in browser history.",
-    },
-    "forward": {
-        "usage": "tappi forward",
-        "desc": "Go forward in browser history.",
-    },
-    "refresh": {
-        "usage": "tappi refresh",
-        "desc": "Reload the current page.",
-    },
-    "upload": {
-        "usage": "tappi upload <file-path> [css-selector]",
-        "desc": (
-            "Upload a file to a file input. Bypasses the OS file picker dialog.\n"
-            "Default selector: input[type=\"file\"]"
+        "scroll": HelpEntry(
+            usage="tappi scroll <up|down|top|bottom> [pixels]",
+            desc="Scroll the page in a direction. Default: 600px.",
+            example="  $ tappi scroll down 1000",
         ),
-        "example": (
-            "  $ tappi upload ~/photos/avatar.jpg\n"
-            "  Uploaded: avatar.jpg → input[type=\"file\"]\n\n"
-            "  $ tappi upload ~/doc.pdf \"input.file-drop\""
+        "url": HelpEntry(
+            usage="tappi url",
+            desc="Print the current page URL.",
+            example="  $ tappi url\n  https://github.com",
         ),
-    },
-    "wait": {
-        "usage": "tappi wait <ms>",
-        "desc": "Wait for a duration (useful in scripts).",
-        "example": "  $ tappi wait 2000\n  Waited 2000ms",
-    },
-    "click-xy": {
-        "usage": "tappi click-xy <x> <y> [--double] [--right]",
-        "desc": (
-            "Click at page coordinates via CDP Input events.\n\n"
-            "Bypasses all DOM boundaries — works inside cross-origin iframes\n"
-            "(captchas, payment forms, OAuth widgets, embedded content)."
+        "back": HelpEntry(
+            usage="tappi back",
+            desc="Go back in browser history.",
         ),
-        "example": (
-            "  $ tappi click-xy 125 458\n"
-            "  Clicked at (125, 458)\n\n"
-            "  $ tappi click-xy 300 200 --double\n"
-            "  Double-clicked at (300, 200)"
+        "forward": HelpEntry(
+            usage="tappi forward",
+            desc="Go forward in browser history.",
         ),
-    },
-    "hover-xy": {
-        "usage": "tappi hover-xy <x> <y>",
-        "desc": "Hover at page coordinates (triggers hover menus, tooltips).",
-        "example": "  $ tappi hover-xy 400 300\n  Hovered at (400, 300)",
-    },
-    "drag-xy": {
-        "usage": "tappi drag-xy <x1> <y1> <x2> <y2>",
-        "desc": "Drag from one coordinate to another (sliders, canvas, drag-and-drop).",
-        "example": "  $ tappi drag-xy 100 200 400 200\n  Dragged from (100, 200) to (400, 200)",
-    },
-    "iframe-rect": {
-        "usage": "tappi iframe-rect <css-selector>",
-        "desc": (
-            "Get bounding box of an iframe element.\n\n"
-            "Returns x, y, width, height, and center coordinates.\n"
-            "Use with click-xy to target elements inside cross-origin iframes."
+        "refresh": HelpEntry(
+            usage="tappi refresh",
+            desc="Reload the current page.",
         ),
-        "example": (
-            "  $ tappi iframe-rect 'iframe[title*=\"hCaptcha\"]'\n"
-            "  x=95 y=440 w=302 h=76 center=(246, 478)"
+        "upload": HelpEntry(
+            usage="tappi upload <file-path> [css-selector]",
+            desc=(
+                "Upload a file to a file input. Bypasses the OS file picker dialog.\n"
+                "Default selector: input[type=\"file\"]"
+            ),
+            example=(
+                "  $ tappi upload ~/photos/avatar.jpg\n"
+                "  Uploaded: avatar.jpg → input[type=\"file\"]\n\n"
+                "  $ tappi upload ~/doc.pdf \"input.file-drop\""
+            ),
         ),
-    },
-    "focus": {
-        "usage": "tappi focus <index>",
-        "desc": (
-            "Focus an element by index WITHOUT triggering click events.\n\n"
-            "Calls el.focus() and scrolls into view. Use to reclaim input focus\n"
-            "after a popup, contact card, dropdown, or autocomplete overlay appeared.\n"
-            "Lighter than 'click' — won't trigger click handlers that might spawn\n"
-            "additional popups."
+        "wait": HelpEntry(
+            usage="tappi wait <ms>",
+            desc="Wait for a duration (useful in scripts).",
+            example="  $ tappi wait 2000\n  Waited 2000ms",
         ),
-        "example": (
-            "  $ tappi focus 5\n"
-            "  Focused: (textarea) Compose body — focused\n\n"
-            "  # Typical flow: popup appeared → dismiss → refocus → retype\n"
-            "  $ tappi keys --escape         # Dismiss overlay\n"
-            "  $ tappi focus 5               # Reclaim focus\n"
-            "  $ tappi type 5 \"hello\"        # Retype"
+        "click-xy": HelpEntry(
+            usage="tappi click-xy <x> <y> [--double] [--right]",
+            desc=(
+                "Click at page coordinates via CDP Input events.\n\n"
+                "Bypasses all DOM boundaries — works inside cross-origin iframes\n"
+                "(captchas, payment forms, OAuth widgets, embedded content)."
+            ),
+            example=(
+                "  $ tappi click-xy 125 458\n"
+                "  Clicked at (125, 458)\n\n"
+                "  $ tappi click-xy 300 200 --double\n"
+                "  Double-clicked at (300, 200)"
+            ),
         ),
-        "hint": "Preferred over 'click' for focus recovery — avoids triggering new popups.",
-    },
-    "check": {
-        "usage": "tappi check <index>",
-        "desc": (
-            "Read the current value/text of an element by index.\n\n"
-            "Returns the element's content, character count, and focus state.\n"
-            "Use after 'type' to verify text actually landed in the right element.\n"
-            "Catches silent failures from focus shifts and popup interference."
+        "hover-xy": HelpEntry(
+            usage="tappi hover-xy <x> <y>",
+            desc="Hover at page coordinates (triggers hover menus, tooltips).",
+            example="  $ tappi hover-xy 400 300\n  Hovered at (400, 300)",
         ),
-        "example": (
-            "  $ tappi check 5\n"
-            "  [5] (textarea) Compose body — value: \"Hello world\" (11 chars, focused)\n\n"
-            "  # Empty value? Focus shifted. Recover:\n"
-            "  $ tappi focus 5\n"
-            "  $ tappi type 5 \"Hello world\""
+        "drag-xy": HelpEntry(
+            usage="tappi drag-xy <x1> <y1> <x2> <y2>",
+            desc="Drag from one coordinate to another (sliders, canvas, drag-and-drop).",
+            example="  $ tappi drag-xy 100 200 400 200\n  Dragged from (100, 200) to (400, 200)",
         ),
-        "hint": "One quick check before Send/Submit catches silent failures and saves recovery time.",
-    },
-    "paste": {
-        "usage": "tappi paste <index> <text>  OR  tappi paste <index> --file <path>",
-        "desc": (
-            "Paste content into an element with auto-verification and fallback.\n\n"
-            "Reliable content insertion for long text (emails, comments, posts).\n"
-            "Handles focus, clear, insert, verify, JS fallback — all in one command.\n"
-            "Pass text directly, or use --file to read from a .md/.txt file."
+        "iframe-rect": HelpEntry(
+            usage="tappi iframe-rect <css-selector>",
+            desc=(
+                "Get bounding box of an iframe element.\n\n"
+                "Returns x, y, width, height, and center coordinates.\n"
+                "Use with click-xy to target elements inside cross-origin iframes."
+            ),
+            example=(
+                "  $ tappi iframe-rect 'iframe[title*=\"hCaptcha\"]'\n"
+                "  x=95 y=440 w=302 h=76 center=(246, 478)"
+            ),
         ),
-        "example": (
-            '  $ tappi paste 5 "Hello, this is my email body..."\n'
-            "  Pasted 35 chars into [5] (textarea) — verified ✓\n\n"
-            "  $ tappi paste 5 --file ~/drafts/email_body.md\n"
-            "  Pasted 4184 chars into [5] (div, contenteditable) — verified ✓"
+        "focus": HelpEntry(
+            usage="tappi focus <index>",
+            desc=(
+                "Focus an element by index WITHOUT triggering click events.\n\n"
+                "Calls el.focus() and scrolls into view. Use to reclaim input focus\n"
+                "after a popup, contact card, dropdown, or autocomplete overlay appeared.\n"
+                "Lighter than 'click' — won't trigger click handlers that might spawn\n"
+                "additional popups."
+            ),
+            example=(
+                "  $ tappi focus 5\n"
+                "  Focused: (textarea) Compose body — focused\n\n"
+                "  # Typical flow: popup appeared → dismiss → refocus → retype\n"
+                "  $ tappi keys --escape         # Dismiss overlay\n"
+                "  $ tappi focus 5               # Reclaim focus\n"
+                "  $ tappi type 5 \"hello\"        # Retype"
+            ),
+            hint="Preferred over 'click' for focus recovery — avoids triggering new popups.",
         ),
-        "hint": (
-            "Preferred over 'type' for long content. For canvas apps (Sheets, Docs), use 'keys' instead."
+        "check": HelpEntry(
+            usage="tappi check <index>",
+            desc=(
+                "Read the current value/text of an element by index.\n\n"
+                "Returns the element's content, character count, and focus state.\n"
+                "Use after 'type' to verify text actually landed in the right element.\n"
+                "Catches silent failures from focus shifts and popup interference."
+            ),
+            example=(
+                "  $ tappi check 5\n"
+                "  [5] (textarea) Compose body — value: \"Hello world\" (11 chars, focused)\n\n"
+                "  # Empty value? Focus shifted. Recover:\n"
+                "  $ tappi focus 5\n"
+                "  $ tappi type 5 \"Hello world\""
+            ),
+            hint="One quick check before Send/Submit catches silent failures and saves recovery time.",
         ),
-    },
-    "keys": {
-        "usage": 'tappi keys <text> [--enter] [--tab] [--combo <combo>]',
-        "desc": (
-            "Send raw CDP keyboard events (bypasses DOM).\n\n"
-            "Works on canvas-based apps like Google Sheets, Docs, Figma\n"
-            "where type() can't target canvas content areas.\n\n"
-            "Flags: --enter --tab --escape --backspace --delete\n"
-            "       --up --down --left --right --home --end --space\n"
-            "       --combo <combo> (e.g. cmd+b, ctrl+a, cmd+shift+z)\n"
-            "       --delay <ms> (per-character delay, default 10)"
+        "paste": HelpEntry(
+            usage="tappi paste <index> <text>  OR  tappi paste <index> --file <path>",
+            desc=(
+                "Paste content into an element with auto-verification and fallback.\n\n"
+                "Reliable content insertion for long text (emails, comments, posts).\n"
+                "Handles focus, clear, insert, verify, JS fallback — all in one command.\n"
+                "Pass text directly, or use --file to read from a .md/.txt file."
+            ),
+            example=(
+                '  $ tappi paste 5 "Hello, this is my email body..."\n'
+                "  Pasted 35 chars into [5] (textarea) — verified ✓\n\n"
+                "  $ tappi paste 5 --file ~/drafts/email_body.md\n"
+                "  Pasted 4184 chars into [5] (div, contenteditable) — verified ✓"
+            ),
+            hint=(
+                "Preferred over 'type' for long content. For canvas apps (Sheets, Docs), use 'keys' instead."
+            ),
         ),
-        "example": (
-            '  $ tappi keys "Revenue" --tab "Q1" --tab "Q2" --enter\n'
-            "  Sent: 11 chars + 3 key(s)\n\n"
-            "  $ tappi keys --combo cmd+b\n"
-            "  Sent: 1 key(s)"
+        "keys": HelpEntry(
+            usage='tappi keys <text> [--enter] [--tab] [--combo <combo>]',
+            desc=(
+                "Send raw CDP keyboard events (bypasses DOM).\n\n"
+                "Works on canvas-based apps like Google Sheets, Docs, Figma\n"
+                "where type() can't target canvas content areas.\n\n"
+                "Flags: --enter --tab --escape --backspace --delete\n"
+                "       --up --down --left --right --home --end --space\n"
+                "       --combo <combo> (e.g. cmd+b, ctrl+a, cmd+shift+z)\n"
+                "       --delay <ms> (per-character delay, default 10)"
+            ),
+            example=(
+                '  $ tappi keys "Revenue" --tab "Q1" --tab "Q2" --enter\n'
+                "  Sent: 11 chars + 3 key(s)\n\n"
+                "  $ tappi keys --combo cmd+b\n"
+                "  Sent: 1 key(s)"
+            ),
         ),
-    },
-}
-
-
-def print_main_help() -> None:
-    """Print the main help screen."""
-    print(_bold("tappi") + " — Control your browser from the terminal\n")
-    print(_dim("Connects to Chrome/Chromium via CDP (Chrome DevTools Protocol)."))
-    print(_dim("Your logged-in sessions, cookies, and extensions all carry over.\n"))
-
-    print(_bold("Usage:") + " tappi <command> [args...]\n")
-
-    # Group commands
-    groups = [
+    }
+    return MappingProxyType(table)
+
+
+def _help_for(cmd: str) -> HelpEntry | None:
+    """Return the help entry for *cmd*, or None if it has none."""
+    return _commands_help().get(cmd)
+
+
+def _write_lines(lines: list[str]) -> None:
+    """Write *lines* to stdout in one call rather than a print() per line."""
+    sys.stdout.write("\n".join(lines) + "\n")
+    sys.stdout.flush()
+
+
+# Static parts of the main help screen, colored once at import
+_HELP_HEADER = "\n".join((
+    _bold("tappi") + " — Control your browser from the terminal\n",
+    _dim("Connects to Chrome/Chromium via CDP (Chrome DevTools Protocol)."),
+    _dim("Your logged-in sessions, cookies, and extensions all carry over.\n"),
+    _bold("Usage:") + " tappi <command> [args...]\n",
+))
+_HELP_FOOTER = "\n".join((
+    _bold("Quick start:"),
+    _dim("  tappi open example.com    # Navigate"),
+    _dim("  tappi elements            # See what's clickable"),
+    _dim("  tappi click 3             # Click element [3]"),
+    _dim("  tappi type 5 hello        # Type into element [5]"),
+    "",
+    _dim("Env: CDP_URL — override CDP endpoint (default: http://127.0.0.1:9222)"),
+    _dim("     NO_COLOR — disable colored output"),
+    "",
+    _dim("Run 'tappi <command> --help' for detailed help on any command."),
+))
+
+
+# (group name, ((command synopsis, description), ...)) for the main help
+_HELP_GROUPS = (
+    (
+        "Agent",
         (
-            "Agent",
-            [
-                ("setup", "Configure LLM provider, workspace, browser"),
-                ("agent [message]", "Chat with the agent (interactive or one-shot)"),
-                ("research <query>", "Deep research with 5 sub-agents"),
-                ("serve [--port 8321]", "Start the web UI"),
-                ("mcp", "Start MCP server (stdio, for Claude Desktop)"),
-                ("mcp --sse", "Start MCP server (HTTP/SSE, port 8377)"),
-            ],
+            ("setup", "Configure LLM provider, workspace, browser"),
+            ("agent [message]", "Chat with the agent (interactive or one-shot)"),
+            ("research <query>", "Deep research with 5 sub-agents"),
+            ("serve [--port 8321]", "Start the web UI"),
+            ("mcp", "Start MCP server (stdio, for Claude Desktop)"),
+            ("mcp --sse", "Start MCP server (HTTP/SSE, port 8377)"),
         ),
+    ),
+    (
+        "Browser",
         (
-            "Browser",
-            [
-                ("launch [name]", "Start Chrome (default or named profile)"),
-                ("launch new [name]", "Create a new profile"),
-                ("launch list", "List all profiles"),
-                ("launch --default <name>", "Set the default profile"),
-            ],
+            ("launch [name]", "Start Chrome (default or named profile)"),
+            ("launch new [name]", "Create a new profile"),
+            ("launch list", "List all profiles"),
+            ("launch --default <name>", "Set the default profile"),
         ),
+    ),
+    (
+        "Navigation",
         (
-            "Navigation",
-            [
-                ("open <url>", "Go to a URL"),
-                ("url", "Print current URL"),
-                ("back", "Go back"),
-                ("forward", "Go forward"),
-                ("refresh", "Reload page"),
-            ],
+            ("open <url>", "Go to a URL"),
+            ("url", "Print current URL"),
+            ("back", "Go back"),
+            ("forward", "Go forward"),
+            ("refresh", "Reload page"),
         ),
+    ),
+    (
+        "Tabs",
         (
-            "Tabs",
-            [
-                ("tabs", "List open tabs"),
-                ("tab <index>", "Switch to tab"),
-                ("newtab [url]", "Open new tab"),
-                ("close [index]", "Close tab"),
-            ],
+            ("tabs", "List open tabs"),
+            ("tab <index>", "Switch to tab"),
+            ("newtab [url]", "Open new tab"),
+            ("close [index]", "Close tab"),
         ),
+    ),
+    (
+        "Interact",
         (
-            "Interact",
-            [
-                ("elements [selector]", "List clickable elements (numbered)"),
-                ("click <index>", "Click element by number"),
-                ("type <index> <text>", "Type into element"),
-                ("focus <index>", "Focus element (no click events)"),
-                ("check <index>", "Read element value (verify after type)"),
-                ("paste <index> <text|--file>", "Paste content (auto-verify)"),
-                ("upload <path> [sel]", "Upload file"),
-            ],
+            ("elements [selector]", "List clickable elements (numbered)"),
+            ("click <index>", "Click element by number"),
+            ("type <index> <text>", "Type into element"),
+            ("focus <index>", "Focus element (no click events)"),
+            ("check <index>", "Read element value (verify after type)"),
+            ("paste <index> <text|--file>", "Paste content (auto-verify)"),
+            ("upload <path> [sel]", "Upload file"),
         ),
+    ),
+    (
+        "Read",
         (
-            "Read",
-            [
-                ("text [selector]", "Extract visible text"),
-                ("html <selector>", "Get element HTML"),
-                ("eval <js>", "Run JavaScript"),
-                ("screenshot [path]", "Save screenshot"),
-            ],
+            ("text [selector]", "Extract visible text"),
+            ("html <selector>", "Get element HTML"),
+            ("eval <js>", "Run JavaScript"),
+            ("screenshot [path]", "Save screenshot"),
         ),
+    ),
+    (
+        "Other",
         (
-            "Other",
-            [
-                ("scroll <dir> [px]", "Scroll up/down/top/bottom"),
-                ("wait <ms>", "Wait (for scripts)"),
-            ],
+            ("scroll <dir> [px]", "Scroll up/down/top/bottom"),
+            ("wait <ms>", "Wait (for scripts)"),
         ),
-    ]
+    ),
+)
+
+
+def _write_result(text: str) -> None:
+    """Write a command's one-shot result straight to fd 1.
+
+    Skips the TextIOWrapper layers for the single final write. Falls back to
+    print() on Windows (console encoding is handled by the wrapper there) or
+    when sys.stdout has been replaced by something that isn't fd 1.
+    """
+    stream = sys.stdout
+    try:
+        direct = os.name != "nt" and stream.fileno() == 1
+    except (AttributeError, OSError, ValueError):
+        direct = False
+    if not direct:
+        print(text)
+        return
+    stream.flush()  # anything already print()ed must land first
+    data = memoryview((text + "\n").encode(stream.encoding or "utf-8", "replace"))
+    while data:
+        data = data[os.write(1, data):]
+
 
-    for group_name, cmds in groups:
-        print(f"  {_cyan(group_name)}")
+def print_main_help() -> None:
+    """Print the main help screen."""
+    out = [_HELP_HEADER]
+
+    for group_name, cmds in _HELP_GROUPS:
+        out.append(f"  {_cyan(group_name)}")
         for cmd, desc in cmds:
-            print(f"    {cmd:<24} {_dim(desc)}")
-        print()
+            out.append(f"    {cmd:<24} {_dim(desc)}")
+        out.append("")
 
-    print(_bold("Quick start:"))
-    print(_dim("  tappi open example.com    # Navigate"))
-    print(_dim("  tappi elements            # See what's clickable"))
-    print(_dim("  tappi click 3             # Click element [3]"))
-    print(_dim("  tappi type 5 hello        # Type into element [5]"))
-    print()
-    print(_dim("Env: CDP_URL — override CDP endpoint (default: http://127.0.0.1:9222)"))
-    print(_dim("     NO_COLOR — disable colored output"))
-    print()
-    print(_dim("Run 'tappi <command> --help' for detailed help on any command."))
+    out.append(_HELP_FOOTER)
+    _write_lines(out)
 
 
 def print_command_help(cmd: str) -> None:
     """Print help for a specific command."""
-    info = COMMANDS_HELP.get(cmd)
+    info = _help_for(cmd)
     if not info:
-        print(f"Unknown command: {cmd}")
-        print("Run 'tappi --help' to see all commands.")
+        _write_lines([f"Unknown command: {cmd}", _SEE_ALL_COMMANDS])
         return
 
-    print(_bold(info["usage"]))
-    print()
-    print(info["desc"])
+    out = [_bold(info.usage), "", info.desc]
 
-    if "example" in info:
-        print(f"\n{_cyan('Example:')}")
-        print(info["example"])
+    if info.example:
+        out.append(f"\n{_cyan('Example:')}")
+        out.append(info.example)
 
-    if "hint" in info:
-        print(f"\n{_yellow('💡 Tip:')} {info['hint']}")
+    if info.hint:
+        out.append(f"\n{_yellow('💡 Tip:')} {info.hint}")
+
+    _write_lines(out)
 
 
 # ── Command dispatch ──
 
 
+_DEFAULT_MARKER = _yellow(" ★ default")
+
+# flag → (option key, value converter); None means a boolean switch
+_LAUNCH_FLAGS = {
+    "--headless": ("headless", None),
+    "--chrome": ("chrome_path", str),
+    "--browser": ("chrome_path", str),
+    "--port": ("port", int),
+    "-p": ("port", int),
+    "--default": ("default", str),
+}
+
+
 def run_launch(args: list[str]) -> str:
     """Handle the launch command with profile management."""
-    import json as _json
-    from urllib.request import urlopen
-    from urllib.error import URLError
+    from tappi.profiles import (
+        list_profiles,
+        get_profile,
+        create_profile,
+        set_default,
+        delete_profile,
+    )
 
     # Parse flags
-    headless = False
-    chrome_path = None
-    port_override = None
-    default_name = None
+    opts: dict = {"headless": False, "chrome_path": None, "port": None, "default": None}
     positional = []
 
     i = 0
-    while i < len(args):
+    n = len(args)
+    while i < n:
         arg = args[i]
-        if arg == "--headless":
-            headless = True
+        spec = _LAUNCH_FLAGS.get(arg)
+        if spec is None:
+            positional.append(arg)
             i += 1
-        elif arg in ("--chrome", "--browser") and i + 1 < len(args):
-            chrome_path = args[i + 1]
-            i += 2
-        elif arg in ("--port", "-p") and i + 1 < len(args):
-            port_override = int(args[i + 1])
-            i += 2
-        elif arg == "--default" and i + 1 < len(args):
-            default_name = args[i + 1]
+            continue
+        key, conv = spec
+        if conv is None:
+            opts[key] = True
+            i += 1
+        elif i + 1 < n:
+            opts[key] = conv(args[i + 1])
             i += 2
         else:
+            # Value-taking flag with nothing after it — treat as positional
             positional.append(arg)
             i += 1
 
+    headless = opts["headless"]
+    chrome_path = opts["chrome_path"]
+    port_override = opts["port"]
+    default_name = opts["default"]
+
     # Handle --default flag
     if default_name is not None:
         set_default(default_name)
@@ -521,12 +638,16 @@ def run_launch(args: list[str]) -> str:
                 + _dim("Create one with: tappi launch new <name>")
             )
         lines = [_bold("Profiles:"), ""]
-        max_name = max(len(p["name"]) for p in profiles)
+        max_name = 0
         for p in profiles:
-            default_marker = _yellow(" ★ default") if p["is_default"] else ""
-            lines.append(
-                f"  {p['name']:<{max_name}}  port {p['port']}{default_marker}"
-            )
+            n = len(p["name"])
+            if n > max_name:
+                max_name = n
+        lines.extend(
+            f"  {p['name'].ljust(max_name)}  port {p['port']}"
+            f"{_DEFAULT_MARKER if p['is_default'] else ''}"
+            for p in profiles
+        )
         lines.append("")
         lines.append(_dim("Launch with: tappi launch <name>"))
         return "\n".join(lines)
@@ -591,23 +712,18 @@ def _launch_profile(
     profile: dict, *, headless: bool = False, chrome_path: str | None = None
 ) -> str:
     """Launch Chrome for a specific profile."""
-    import json as _json
-    from urllib.request import urlopen
-    from urllib.error import URLError
+    from tappi.core import Browser
 
     port = profile["port"]
     data_dir = profile["path"]
     name = profile["name"]
 
     # Check if already running on this port
-    try:
-        _json.loads(urlopen(f"http://127.0.0.1:{port}/json/version", timeout=2).read())
+    if _is_port_live(port):
         return (
             f"✓ Profile {_bold(name)} already running (port {port})\n"
             + _dim("  Ready to use — try: tappi tabs")
         )
-    except (URLError, OSError):
-        pass
 
     is_first = not os.path.exists(os.path.join(data_dir, "Default"))
 
@@ -645,201 +761,264 @@ def _launch_profile(
     return "\n".join(lines)
 
 
-def run_command(browser: Browser, cmd: str, args: list[str]) -> str | None:
-    """Execute a command and return the output string."""
-    if cmd == "tabs":
-        tabs = browser.tabs()
-        if not tabs:
-            return "No tabs open."
-        return "\n".join(str(t) for t in tabs)
-
-    elif cmd == "open":
-        if not args:
-            print_command_help("open")
-            return None
-        result = browser.open(args[0])
-        return result + "\n" + _dim("💡 Run 'elements' to see interactive elements on this page.")
+_CONV = {"i": int, "f": float, "s": str}
+_CONV_NAMES = {"i": "an integer", "f": "a number", "s": "a string"}
 
-    elif cmd == "tab":
-        if not args:
-            print_command_help("tab")
-            return None
-        return browser.tab(int(args[0]))
 
-    elif cmd == "newtab":
-        return browser.newtab(args[0] if args else None)
+def _parse(args: list[str], spec: str, min_args: int | None = None) -> tuple:
+    """Convert leading *args* by *spec* ("i" int, "f" float, "s" str).
 
-    elif cmd == "close":
-        return browser.close_tab(int(args[0]) if args else None)
+    Converts as many arguments as are present, up to ``len(spec)``; fewer
+    than *min_args* (default: all of them) is an error.
+    """
+    if min_args is None:
+        min_args = len(spec)
+    if len(args) < min_args:
+        raise ValueError(f"expected at least {min_args} argument(s), got {len(args)}")
+    out = []
+    for pos, (code, arg) in enumerate(zip(spec, args), 1):
+        try:
+            out.append(_CONV[code](arg))
+        except ValueError:
+            raise ValueError(f"argument {pos} must be {_CONV_NAMES[code]}, got {arg!r}") from None
+    return tuple(out)
 
-    elif cmd == "elements":
-        elements = browser.elements(args[0] if args else None)
-        if not elements:
-            return (
-                "No interactive elements found.\n"
-                + _dim("💡 The page might still be loading. Try: wait 1000, then elements again.\n")
-                + _dim("   Or narrow down with a selector: elements \".content\"")
-            )
-        lines = [str(e) for e in elements]
-        lines.append("")
-        lines.append(
-            _dim(f"💡 {len(elements)} elements found. Use 'click <number>' or 'type <number> <text>' to interact.")
+
+def _cmd_tabs(browser: Browser, args: list[str]) -> str | None:
+    tabs = browser.tabs()
+    if not tabs:
+        return "No tabs open."
+    return "\n".join(str(t) for t in tabs)
+
+
+def _cmd_open(browser: Browser, args: list[str]) -> str | None:
+    result = browser.open(args[0])
+    return result + "\n" + _dim("💡 Run 'elements' to see interactive elements on this page.")
+
+
+def _cmd_tab(browser: Browser, args: list[str]) -> str | None:
+    return browser.tab(*_parse(args, "i"))
+
+
+def _cmd_newtab(browser: Browser, args: list[str]) -> str | None:
+    return browser.newtab(args[0] if args else None)
+
+
+def _cmd_close(browser: Browser, args: list[str]) -> str | None:
+    return browser.close_tab(*_parse(args, "i", 0))
+
+
+def _cmd_elements(browser: Browser, args: list[str]) -> str | None:
+    elements = browser.elements(args[0] if args else None)
+    if not elements:
+        return (
+            "No interactive elements found.\n"
+            + _dim("💡 The page might still be loading. Try: wait 1000, then elements again.\n")
+            + _dim("   Or narrow down with a selector: elements \".content\"")
         )
-        return "\n".join(lines)
+    lines = [str(e) for e in elements]
+    lines.append("")
+    lines.append(
+        _dim(f"💡 {len(elements)} elements found. Use 'click <number>' or 'type <number> <text>' to interact.")
+    )
+    return "\n".join(lines)
 
-    elif cmd == "click":
-        if not args:
-            print_command_help("click")
-            return None
-        return browser.click(int(args[0]))
 
-    elif cmd == "type":
-        if len(args) < 2:
-            print_command_help("type")
-            return None
-        index = int(args[0])
-        text = " ".join(args[1:])
-        return browser.type(index, text)
+def _cmd_click(browser: Browser, args: list[str]) -> str | None:
+    return browser.click(*_parse(args, "i"))
 
-    elif cmd == "focus":
-        if not args:
-            print_command_help("focus")
-            return None
-        return browser.focus(int(args[0]))
 
-    elif cmd == "check":
-        if not args:
-            print_command_help("check")
-            return None
-        return browser.check(int(args[0]))
+def _cmd_type(browser: Browser, args: list[str]) -> str | None:
+    (index,) = _parse(args, "i")
+    return browser.type(index, " ".join(args[1:]))
+
+
+def _cmd_focus(browser: Browser, args: list[str]) -> str | None:
+    return browser.focus(*_parse(args, "i"))
+
 
-    elif cmd == "paste":
-        if not args:
+def _cmd_check(browser: Browser, args: list[str]) -> str | None:
+    return browser.check(*_parse(args, "i"))
+
+
+def _cmd_paste(browser: Browser, args: list[str]) -> str | None:
+    (index,) = _parse(args, "i")
+    # Check for --file flag
+    if "--file" in args:
+        fi = args.index("--file")
+        if fi + 1 >= len(args):
+            return "Error: --file requires a path argument."
+        fp = os.path.expanduser(args[fi + 1])
+        if not os.path.isfile(fp):
+            return f"Error: File not found: {fp}"
+        with open(fp, "r") as f:
+            content = f.read()
+    else:
+        if len(args) < 2:
             print_command_help("paste")
             return None
-        index = int(args[0])
-        # Check for --file flag
-        if "--file" in args:
-            fi = args.index("--file")
-            if fi + 1 >= len(args):
-                return "Error: --file requires a path argument."
-            import os
-            fp = os.path.expanduser(args[fi + 1])
-            if not os.path.isfile(fp):
-                return f"Error: File not found: {fp}"
-            with open(fp, "r") as f:
-                content = f.read()
-        else:
-            if len(args) < 2:
-                print_command_help("paste")
-                return None
-            content = " ".join(args[1:])
-        return browser.paste(index, content)
-
-    elif cmd == "text":
-        return browser.text(args[0] if args else None)
-
-    elif cmd == "html":
-        if not args:
-            print_command_help("html")
-            return None
-        return browser.html(args[0])
+        content = " ".join(args[1:])
+    return browser.paste(index, content)
 
-    elif cmd == "eval":
-        if not args:
-            print_command_help("eval")
-            return None
-        result = browser.eval(" ".join(args))
-        if isinstance(result, str):
-            return result
-        if result is None:
-            return "(undefined)"
-        import json
-        return json.dumps(result, indent=2)
-
-    elif cmd == "screenshot":
-        path = browser.screenshot(args[0] if args else None)
-        return f"Screenshot saved: {path}"
-
-    elif cmd == "scroll":
-        if not args:
-            print_command_help("scroll")
-            return None
-        amount = int(args[1]) if len(args) > 1 else 600
-        return browser.scroll(args[0], amount)
 
-    elif cmd == "url":
-        return browser.url()
+def _cmd_text(browser: Browser, args: list[str]) -> str | None:
+    return browser.text(args[0] if args else None)
 
-    elif cmd == "back":
-        return browser.back()
 
-    elif cmd == "forward":
-        return browser.forward()
+def _cmd_html(browser: Browser, args: list[str]) -> str | None:
+    return browser.html(args[0])
 
-    elif cmd == "refresh":
-        return browser.refresh()
 
-    elif cmd == "upload":
-        if not args:
-            print_command_help("upload")
-            return None
-        selector = args[1] if len(args) > 1 else 'input[type="file"]'
-        return browser.upload(args[0], selector)
+def _cmd_eval(browser: Browser, args: list[str]) -> str | None:
+    result = browser.eval(" ".join(args))
+    if isinstance(result, str):
+        return result
+    if result is None:
+        return "(undefined)"
+    import json
+    return json.dumps(result, indent=2)
 
-    elif cmd == "wait":
-        ms = int(args[0]) if args else 1000
-        return browser.wait(ms)
 
-    elif cmd == "click-xy":
-        if len(args) < 2:
-            print_command_help("click-xy")
-            return None
-        coords = [a for a in args if not a.startswith("--")]
-        double = "--double" in args
-        right = "--right" in args
-        return browser.click_xy(float(coords[0]), float(coords[1]), double=double, right=right)
+def _cmd_screenshot(browser: Browser, args: list[str]) -> str | None:
+    path = browser.screenshot(args[0] if args else None)
+    return f"Screenshot saved: {path}"
 
-    elif cmd == "hover-xy":
-        if len(args) < 2:
-            print_command_help("hover-xy")
-            return None
-        return browser.hover_xy(float(args[0]), float(args[1]))
 
-    elif cmd == "drag-xy":
-        if len(args) < 4:
-            print_command_help("drag-xy")
-            return None
-        return browser.drag_xy(float(args[0]), float(args[1]), float(args[2]), float(args[3]))
+def _cmd_scroll(browser: Browser, args: list[str]) -> str | None:
+    return browser.scroll(*_parse(args, "si", 1))
 
-    elif cmd == "iframe-rect":
-        if not args:
-            print_command_help("iframe-rect")
-            return None
-        info = browser.iframe_rect(" ".join(args))
-        return f"x={info['x']} y={info['y']} w={info['width']} h={info['height']} center=({info['cx']}, {info['cy']})"
 
-    elif cmd == "keys":
-        if not args:
-            print("Usage: tappi keys <text> [--enter] [--tab] [--escape]")
-            print("       tappi keys --combo <key-combo>     e.g. --combo cmd+b")
-            print()
-            print("Sends raw CDP keyboard events (bypasses DOM).")
-            print("Works on canvas apps like Google Sheets, Docs, Figma.")
-            print()
-            print("Flags:  --enter  --tab  --escape  --backspace  --delete")
-            print("        --up  --down  --left  --right")
-            print("        --combo <combo>  (e.g. cmd+a, ctrl+shift+end)")
-            print("        --delay <ms>  (per-char delay, default 10)")
-            print()
-            print('Can chain: tappi keys "hello" --tab "world" --enter')
-            return None
-        return browser.keys(*args)
+def _cmd_upload(browser: Browser, args: list[str]) -> str | None:
+    selector = args[1] if len(args) > 1 else 'input[type="file"]'
+    return browser.upload(args[0], selector)
 
-    else:
-        print(_red(f"Unknown command: {cmd}"))
-        print("Run 'tappi --help' to see all commands.")
+
+def _cmd_wait(browser: Browser, args: list[str]) -> str | None:
+    return browser.wait(*_parse(args, "i", 0))
+
+
+def _coords(values: list[str], n: int) -> tuple:
+    """First *n* of *values* as floats — one ``map`` on the happy path."""
+    if len(values) >= n:
+        try:
+            return tuple(map(float, values[:n]))
+        except ValueError:
+            pass
+    return _parse(values, "f" * n)  # raises with the offending position
+
+
+def _cmd_click_xy(browser: Browser, args: list[str]) -> str | None:
+    coords, double, right = [], False, False
+    for a in args:
+        if a == "--double":
+            double = True
+        elif a == "--right":
+            right = True
+        elif not a.startswith("--"):
+            coords.append(a)
+    return browser.click_xy(*_coords(coords, 2), double=double, right=right)
+
+
+def _cmd_hover_xy(browser: Browser, args: list[str]) -> str | None:
+    return browser.hover_xy(*_coords(args, 2))
+
+
+def _cmd_drag_xy(browser: Browser, args: list[str]) -> str | None:
+    return browser.drag_xy(*_coords(args, 4))
+
+
+def _cmd_iframe_rect(browser: Browser, args: list[str]) -> str | None:
+    info = browser.iframe_rect(" ".join(args))
+    return f"x={info['x']} y={info['y']} w={info['width']} h={info['height']} center=({info['cx']}, {info['cy']})"
+
+
+def _cmd_keys(browser: Browser, args: list[str]) -> str | None:
+    if not args:
+        _write_lines([
+            "Usage: tappi keys <text> [--enter] [--tab] [--escape]",
+            "       tappi keys --combo <key-combo>     e.g. --combo cmd+b",
+            "",
+            "Sends raw CDP keyboard events (bypasses DOM).",
+            "Works on canvas apps like Google Sheets, Docs, Figma.",
+            "",
+            "Flags:  --enter  --tab  --escape  --backspace  --delete",
+            "        --up  --down  --left  --right",
+            "        --combo <combo>  (e.g. cmd+a, ctrl+shift+end)",
+            "        --delay <ms>  (per-char delay, default 10)",
+            "",
+            'Can chain: tappi keys "hello" --tab "world" --enter',
+        ])
+        return None
+    return browser.keys(*args)
+
+
+# command → (handler, minimum positional args; fewer prints the command's help)
+_DISPATCH = {
+    "tabs": (_cmd_tabs, 0),
+    "open": (_cmd_open, 1),
+    "tab": (_cmd_tab, 1),
+    "newtab": (_cmd_newtab, 0),
+    "close": (_cmd_close, 0),
+    "elements": (_cmd_elements, 0),
+    "click": (_cmd_click, 1),
+    "type": (_cmd_type, 2),
+    "focus": (_cmd_focus, 1),
+    "check": (_cmd_check, 1),
+    "paste": (_cmd_paste, 1),
+    "text": (_cmd_text, 0),
+    "html": (_cmd_html, 1),
+    "eval": (_cmd_eval, 1),
+    "screenshot": (_cmd_screenshot, 0),
+    "scroll": (_cmd_scroll, 1),
+    "url": (lambda browser, args: browser.url(), 0),
+    "back": (lambda browser, args: browser.back(), 0),
+    "forward": (lambda browser, args: browser.forward(), 0),
+    "refresh": (lambda browser, args: browser.refresh(), 0),
+    "upload": (_cmd_upload, 1),
+    "wait": (_cmd_wait, 0),
+    "click-xy": (_cmd_click_xy, 2),
+    "hover-xy": (_cmd_hover_xy, 2),
+    "drag-xy": (_cmd_drag_xy, 4),
+    "iframe-rect": (_cmd_iframe_rect, 1),
+    "keys": (_cmd_keys, 0),
+}
+# Interned so lookups of the interned argv command hit the identity fast path
+_DISPATCH = {sys.intern(k): v for k, v in _DISPATCH.items()}
+
+
+def run_command(browser: Browser, cmd: str, args: list[str]) -> str | None:
+    """Execute a command and return the output string."""
+    entry = _DISPATCH.get(cmd)
+    if entry is None:
+        _write_lines([_red(f"Unknown command: {cmd}"), _SEE_ALL_COMMANDS])
         sys.exit(1)
+    handler, min_args = entry
+    if len(args) < min_args:
+        print_command_help(cmd)
+        return None
+    return handler(browser, args)
+
+
+class _ToolPrinter:
+    """``on_tool_call`` hook that echoes each tool call as a dim line.
+
+    The dim on/off codes are split out once so each call is a single
+    f-string and one write.
+    """
+
+    __slots__ = ("_on", "_off", "_show_result")
+
+    def __init__(self, show_result: bool = False) -> None:
+        self._on, self._off = _dim("\0").split("\0")
+        self._show_result = show_result
+
+    def __call__(self, name: str, params: dict, result: str) -> None:
+        on, off = self._on, self._off
+        line = f"{on}  🔧 {name} → {params.get('action', '')}{off}\n"
+        if self._show_result and result:
+            line += f"{on}     {result[:200]}{off}\n"
+        sys.stdout.write(line)
+        sys.stdout.flush()
 
 
 def run_agent(args: list[str]) -> None:
@@ -860,10 +1039,7 @@ def run_agent(args: list[str]) -> None:
         cfg = get_agent_config()
         agent = Agent(
             browser_profile=cfg.get("browser_profile"),
-            on_tool_call=lambda name, params, result: print(
-                _dim(f"  🔧 {name} → {params.get('action', '')}") +
-                (f"\n{_dim('     ' + result[:200])}" if result else "")
-            ),
+            on_tool_call=_ToolPrinter(show_result=True),
         )
         if not cfg.get("shell_enabled", True):
             agent._shell.enabled = False
@@ -897,9 +1073,7 @@ def run_agent(args: list[str]) -> None:
         cfg = get_agent_config()
         agent = Agent(
             browser_profile=cfg.get("browser_profile"),
-            on_tool_call=lambda name, params, result: print(
-                _dim(f"  🔧 {name} → {params.get('action', '')}"),
-            ),
+            on_tool_call=_ToolPrinter(),
         )
         if not cfg.get("shell_enabled", True):
             agent._shell.enabled = False
@@ -969,16 +1143,40 @@ def run_serve(args: list[str]) -> None:
     start_server(host=host, port=port)
 
 
+def _exit_with_error(e: Exception) -> None:
+    """Report an error from a command and exit with status 1."""
+    # Imported here, on the error path, so commands that never touch the
+    # browser don't load the core
+    from tappi.core import BrowserNotRunning, CDPError
+
+    if isinstance(e, BrowserNotRunning):
+        _write_lines([
+            _red("✗ Browser not running\n"),
+            str(e),
+            "",
+            _yellow("💡 Quick fix:") + " run " + _bold("tappi launch") + " to start Chrome with remote debugging.",
+        ])
+    elif isinstance(e, (CDPError, FileNotFoundError)):
+        print(_red(f"✗ {e}"))
+    else:
+        print(_red(f"✗ Error: {e}"))
+    sys.exit(1)
+
+
 def main() -> None:
     """CLI entry point."""
     args = sys.argv[1:]
 
-    # No args or help flag
+    # Fast paths first — neither needs anything beyond this module
     if not args or args[0] in ("--help", "-h", "help"):
         print_main_help()
         return
+    if args[0] in ("--version", "-V", "version"):
+        from tappi import __version__
+        print(f"tappi {__version__}")
+        return
 
-    cmd = args[0].lower()
+    cmd = sys.intern(args[0].lower())
     cmd_args = args[1:]
 
     # Per-command help
@@ -986,12 +1184,7 @@ def main() -> None:
         print_command_help(cmd)
         return
 
-    # Version
-    if cmd in ("--version", "-V", "version"):
-        from tappi import __version__
-        print(f"tappi {__version__}")
-        return
-
+    browser = None
     try:
         # Agent commands
         if cmd == "setup":
@@ -1022,30 +1215,24 @@ def main() -> None:
         if cmd == "launch":
             result = run_launch(cmd_args)
             if result:
-                print(result)
+                _write_result(result)
             return
 
+        # Only browser commands pay for importing the core
+        from tappi.core import Browser
+
         browser = Browser()
         result = run_command(browser, cmd, cmd_args)
         if result is not None:
-            print(result)
-    except BrowserNotRunning as e:
-        print(_red("✗ Browser not running\n"))
-        print(str(e))
-        print()
-        print(_yellow("💡 Quick fix:") + " run " + _bold("tappi launch") + " to start Chrome with remote debugging.")
-        sys.exit(1)
-    except CDPError as e:
-        print(_red(f"✗ {e}"))
-        sys.exit(1)
-    except FileNotFoundError as e:
-        print(_red(f"✗ {e}"))
-        sys.exit(1)
+            _write_result(result)
     except KeyboardInterrupt:
         pass
     except Exception as e:
-        print(_red(f"✗ Error: {e}"))
-        sys.exit(1)
+        _exit_with_error(e)
+    finally:
+        # Sends anything still held back (e.g. a coalesced hover) first
+        if browser is not None:
+            browser.close()
 
 
 if __name__ == "__main__":
@@ -15,31 +15,30 @@ for raw CDP protocol access.
 from __future__ import annotations
 
 import asyncio
+import atexit
+import binascii
+import http.client
 import json
 import os
+import queue
 import re
 import subprocess
 import sys
+import threading
 import time
+from collections import deque
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable, Collection, Iterator
+from urllib.parse import urlparse, urlsplit
 from urllib.request import urlopen
 from urllib.error import URLError
 
 from tappi.js_expressions import (
-    check_indexed_js,
-    check_value_js,
-    clear_contenteditable_js,
-    clear_input_js,
-    click_info_js,
     elements_js,
     extract_text_js,
-    focus_js,
     get_html_js,
-    paste_content_js,
-    set_input_value_js,
-    type_info_js,
+    helpers_js,
 )
 
 try:
@@ -48,6 +47,25 @@ try:
 except ImportError:
     websockets = None  # type: ignore[assignment]
 
+# permessage-deflate shrinks large DOM/HTML payloads several-fold on the wire;
+# no frame cap, since screenshots and page HTML routinely exceed the 1 MiB
+# default (which would otherwise drop the connection).
+_WS_OPTIONS: dict[str, Any] = {"compression": "deflate", "max_size": None}
+
+# orjson is optional — several times faster on large CDP payloads (elements,
+# HTML); the stdlib json module is the fallback.
+try:
+    import orjson
+
+    _loads = orjson.loads
+
+    def _dumps(obj: Any) -> str:
+        # Chrome wants text frames, so hand websockets a str, not bytes
+        return orjson.dumps(obj).decode()
+except ImportError:
+    _loads = json.loads
+    _dumps = json.dumps
+
 # ── Data classes ──
 
 
@@ -76,6 +94,16 @@ class Element:
         return f"[{self.index}] ({self.label}) {self.desc}"
 
 
+# msgspec is optional — when present, elements() decodes the page's listing
+# straight into Element objects, without building a dict per element first.
+try:
+    import msgspec
+
+    _elements_decoder = msgspec.json.Decoder(list[Element])
+except ImportError:
+    _elements_decoder = None
+
+
 # ── CDP Session (sync) ──
 
 
@@ -100,21 +128,199 @@ class BrowserNotRunning(Exception):
         )
 
 
+_WS_HOST_RE = re.compile(r"^ws://[^/]+")
+
+
+def _browser_ws_url(cdp_url: str) -> str:
+    """Resolve the browser-level WebSocket URL from /json/version."""
+    if websockets is None:
+        raise ImportError("websockets is required: pip install tappi")
+    try:
+        data = _loads(urlopen(f"{cdp_url}/json/version").read())
+    except (URLError, OSError):
+        raise BrowserNotRunning(cdp_url)
+    ws_url = data.get("webSocketDebuggerUrl", "")
+    port = cdp_url.rsplit(":", 1)[-1].split("/")[0]
+    ws_url = _WS_HOST_RE.sub(f"ws://127.0.0.1:{port}", ws_url)
+    if not ws_url:
+        raise CDPError("Browser did not expose webSocketDebuggerUrl")
+    return ws_url
+
+
+_EVENT_PREFIX = '{"method":"'
+# Events on an attached session end with its id: …},"sessionId":"…"}
+_SESSION_SUFFIX_RE = re.compile(r'\},"sessionId":"([^"]+)"\}$')
+
+
+class _PipeTransport:
+    """Chrome's ``--remote-debugging-pipe`` as a WebSocket-like object.
+
+    Chrome reads commands from its fd 3 and writes responses and events to
+    its fd 4, each message a JSON text terminated by a NUL byte — no port,
+    no handshake, no WebSocket framing. Iterating yields incoming messages
+    and send() writes one, so a CDPSession runs over it unchanged.
+    """
+
+    def __init__(self, read_fd: int, write_fd: int) -> None:
+        self._read_fd = read_fd
+        self._write_fd = write_fd
+        self._write_lock = threading.Lock()
+
+    def __iter__(self) -> Iterator[str]:
+        buf = bytearray()
+        try:
+            while True:
+                chunk = os.read(self._read_fd, 1 << 16)
+                if not chunk:
+                    return
+                # Only the new bytes can hold the next terminator
+                start = len(buf)
+                buf += chunk
+                begin = 0
+                while (end := buf.find(b"\0", start)) != -1:
+                    yield buf[begin:end].decode()
+                    begin = start = end + 1
+                del buf[:begin]
+        finally:
+            os.close(self._read_fd)
+
+    def send(self, text: str) -> None:
+        data = memoryview((text + "\0").encode())
+        with self._write_lock:
+            while data:
+                data = data[os.write(self._write_fd, data):]
+
+    def close(self) -> None:
+        # Chrome closes its end in turn, which ends the reader's loop
+        try:
+            os.close(self._write_fd)
+        except OSError:
+            pass
+
+
 class CDPSession:
     """Low-level synchronous CDP WebSocket session.
 
     Use this directly only if you need raw CDP protocol access.
     For normal use, prefer the Browser class.
 
+    Sessions attached through a browser-level session (see attach())
+    share its socket: their commands carry a sessionId and the parent's
+    reader routes their responses and events back to them.
+
     Example:
         cdp = CDPSession.connect_to_page(target_id, port=9222)
         result = cdp.send("Runtime.evaluate", expression="1+1")
         cdp.close()
     """
 
-    def __init__(self, ws: Any) -> None:
+    def __init__(
+        self, ws: Any, root: CDPSession | None = None, session_id: str | None = None
+    ) -> None:
         self._ws = ws
+        # The session that owns the socket (self unless attached)
+        self._root = root or self
+        self._session_id = session_id
         self._id = 0
+        self._closed = False
+        self._enabled: set[str] = set()
+        self._init_scripts: set[str] = set()
+        # Compiled scripts on the current page (source → scriptId), and
+        # sources run once so far (compiled if they come round again)
+        self._scripts: dict[str, str] = {}
+        self._scripts_seen: set[str] = set()
+        # Guards the id counter, pending map and event backlog; the reader
+        # thread signals new events through the condition. Attached sessions
+        # share their root's lock.
+        self._lock = root._lock if root is not None else threading.Lock()
+        self._cond = threading.Condition(self._lock)
+        # In-flight commands: id → queue the reader hands the response to
+        self._pending: dict[int, queue.SimpleQueue] = {}
+        # Events since the last command was sent, as (seq, method, message);
+        # the message stays raw JSON until someone asks for it
+        self._events: deque[tuple[int, str, Any]] = deque(maxlen=self._EVENT_BACKLOG)
+        self._event_seq = 0
+        # Sessions attached over this one's socket (sessionId → session)
+        self._children: dict[str, CDPSession] = {}
+        # Called (on the reader thread) once the socket has gone away
+        self._on_close: Callable[[], None] | None = None
+        if root is None:
+            threading.Thread(target=self._reader, name="tappi-cdp-reader", daemon=True).start()
+
+    # Most events a session holds on to between commands
+    _EVENT_BACKLOG = 256
+    # Most compiled scripts a session keeps ids for
+    _SCRIPT_CACHE = 64
+
+    @property
+    def closed(self) -> bool:
+        """True once the WebSocket has been closed by either side."""
+        if self._closed:
+            return True
+        state = getattr(getattr(self._ws, "protocol", None), "state", None)
+        return state is not None and state.name in ("CLOSING", "CLOSED")
+
+    def _reader(self) -> None:
+        """Read and parse frames off the socket (runs on its own thread).
+
+        Responses go to the queue registered for their id, tagged with how
+        many events preceded them; events go to the backlog. Chrome writes
+        events as {"method":"…","params":…}, so their names are sliced out
+        and the (often large) params are only parsed if an event is used.
+        """
+        error = "CDP connection closed"
+        try:
+            for raw in self._ws:
+                session = self
+                if isinstance(raw, str) and raw.startswith(_EVENT_PREFIX):
+                    method = raw[len(_EVENT_PREFIX):raw.find('"', len(_EVENT_PREFIX))]
+                    msg: Any = raw
+                    if self._children:
+                        m = _SESSION_SUFFIX_RE.search(raw, max(0, len(raw) - 96))
+                        if m is not None:
+                            session = self._children.get(m.group(1), self)
+                else:
+                    msg = _loads(raw)
+                    method = msg.get("method") if "id" not in msg else None
+                    if self._children and "sessionId" in msg:
+                        session = self._children.get(msg["sessionId"], self)
+                with self._cond:
+                    if method is not None:
+                        session._event_seq += 1
+                        session._events.append((session._event_seq, method, msg))
+                        session._cond.notify_all()
+                        if method == "Target.detachedFromTarget" and session is self:
+                            params = (_loads(msg) if isinstance(msg, str) else msg)["params"]
+                            child = self._children.pop(params["sessionId"], None)
+                            if child is not None:
+                                child._shutdown("CDP session detached (target closed)")
+                    elif "id" in msg:
+                        waiter = session._pending.pop(msg["id"], None)
+                        if waiter is not None:
+                            waiter.put((msg, session._event_seq))
+        except websockets.exceptions.ConnectionClosed as e:
+            error = f"CDP connection closed: {e}"
+        except Exception as e:
+            error = f"CDP connection failed: {e}"
+        finally:
+            with self._cond:
+                self._shutdown(error)
+                for child in self._children.values():
+                    child._shutdown(error)
+                self._children.clear()
+            if self._on_close is not None:
+                self._on_close()
+
+    def _shutdown(self, error: str) -> None:
+        """Mark the session closed and fail its in-flight commands.
+
+        Called with the lock held.
+        """
+        self._closed = True
+        for waiter in self._pending.values():
+            waiter.put(({"error": {"message": error}}, self._event_seq))
+        self._pending.clear()
+        self._cond.notify_all()
 
     @classmethod
     def connect_to_page(cls, target_id: str, port: int = 9222) -> CDPSession:
@@ -125,76 +331,412 @@ class CDPSession:
                 "Or: pip install websockets"
             )
         ws_url = f"ws://127.0.0.1:{port}/devtools/page/{target_id}"
-        ws = ws_connect(ws_url)
+        ws = ws_connect(ws_url, **_WS_OPTIONS)
         return cls(ws)
 
     @classmethod
     def connect_to_browser(cls, cdp_url: str) -> CDPSession:
         """Connect to the browser-level CDP endpoint."""
-        if websockets is None:
-            raise ImportError("websockets is required: pip install tappi")
-        try:
-            data = json.loads(urlopen(f"{cdp_url}/json/version").read())
-        except (URLError, OSError):
-            raise BrowserNotRunning(cdp_url)
-        ws_url = data.get("webSocketDebuggerUrl", "")
-        port = cdp_url.rsplit(":", 1)[-1].split("/")[0]
-        ws_url = re.sub(r"^ws://[^/]+", f"ws://127.0.0.1:{port}", ws_url)
-        if not ws_url:
-            raise CDPError("Browser did not expose webSocketDebuggerUrl")
-        ws = ws_connect(ws_url)
+        ws = ws_connect(_browser_ws_url(cdp_url), **_WS_OPTIONS)
         return cls(ws)
 
+    @classmethod
+    def connect_to_pipe(cls, read_fd: int, write_fd: int) -> CDPSession:
+        """Browser-level session over ``--remote-debugging-pipe`` fds.
+
+        *read_fd* is the read end of the pipe Chrome writes to (its fd 4),
+        *write_fd* the write end of the one it reads from (its fd 3).
+        """
+        return cls(_PipeTransport(read_fd, write_fd))
+
+    def attach(self, target_id: str) -> CDPSession:
+        """Session for *target_id*, multiplexed over this session's socket.
+
+        Uses Target.attachToTarget in flat mode, so no extra connection is
+        opened. Call on a browser-level session.
+        """
+        result = self.send("Target.attachToTarget", targetId=target_id, flatten=True)
+        child = type(self)(self._ws, root=self, session_id=result["sessionId"])
+        with self._lock:
+            if self._closed:
+                raise CDPError("CDP connection closed")
+            self._children[child._session_id] = child
+        return child
+
+    def _send_raw(self, method: str, params: dict) -> queue.SimpleQueue:
+        waiter: queue.SimpleQueue = queue.SimpleQueue()
+        root = self._root
+        with self._lock:
+            if self._closed:
+                raise CDPError("CDP connection closed")
+            root._id += 1
+            msg_id = root._id
+            self._pending[msg_id] = waiter
+        msg = {"id": msg_id, "method": method, "params": params}
+        if self._session_id is not None:
+            msg["sessionId"] = self._session_id
+        try:
+            self._ws.send(_dumps(msg))
+        except (websockets.exceptions.ConnectionClosed, OSError) as e:
+            with self._lock:
+                self._pending.pop(msg_id, None)
+                self._closed = True
+            raise CDPError(f"CDP connection closed: {e}") from e
+        return waiter
+
+    @staticmethod
+    def _result(waiter: queue.SimpleQueue, timeout: float | None = None) -> tuple[dict, int]:
+        """Wait for a response; returns (result, events seen before it)."""
+        msg, seq = waiter.get(timeout=timeout)
+        if "error" in msg:
+            raise CDPError(msg["error"].get("message", str(msg["error"])))
+        return msg.get("result", {}), seq
+
     def send(self, method: str, **params: Any) -> dict:
         """Send a CDP command and wait for the response."""
-        self._id += 1
-        msg_id = self._id
-        self._ws.send(json.dumps({"id": msg_id, "method": method, "params": params}))
+        with self._lock:
+            self._events.clear()
+        return self._result(self._send_raw(method, params))[0]
+
+    def send_batch(self, cmds: list[tuple[str, dict]]) -> list[dict]:
+        """Send several CDP commands back-to-back, then collect the responses.
+
+        One round-trip instead of one per command; Chrome still runs them in
+        order. If any command fails, raises CDPError for the first failure
+        once every response has been read.
+        """
+        with self._lock:
+            self._events.clear()
+        return self.wait_all([self._send_raw(m, p) for m, p in cmds])
+
+    def send_nowait(self, method: str, **params: Any) -> queue.SimpleQueue:
+        """Send a CDP command without waiting for its response.
+
+        Returns a handle to pass to wait_all(). The reader thread collects
+        responses meanwhile, so any number of commands can be in flight;
+        Chrome runs them in the order sent.
+        """
+        return self._send_raw(method, params)
 
-        while True:
-            raw = self._ws.recv()
-            msg = json.loads(raw)
-            if msg.get("id") == msg_id:
-                if "error" in msg:
-                    raise CDPError(msg["error"].get("message", str(msg["error"])))
-                return msg.get("result", {})
-            # Skip events, keep reading
+    def wait_all(self, handles: list[queue.SimpleQueue]) -> list[dict]:
+        """Collect the responses for send_nowait() handles, in order.
+
+        If any command failed, raises CDPError for the first failure once
+        every response has arrived.
+        """
+        results: list[dict] = []
+        error = None
+        for waiter in handles:
+            try:
+                results.append(self._result(waiter)[0])
+            except CDPError as e:
+                error = error or e
+                results.append({})
+        if error is not None:
+            raise error
+        return results
 
     def send_and_wait_event(
         self, method: str, event_name: str, timeout: float = 10.0, **params: Any
     ) -> dict:
-        """Send a CDP command and wait for a specific event."""
-        self._id += 1
-        msg_id = self._id
-        self._ws.send(json.dumps({"id": msg_id, "method": method, "params": params}))
+        """Send a CDP command and wait for a specific event.
 
-        result = None
+        Events left over from earlier calls on a reused session are dropped
+        before sending; one that arrives after the send counts even if it
+        beats the response (a fast or cached load often fires before
+        Page.navigate returns).
+        """
         deadline = time.monotonic() + timeout
-
-        while time.monotonic() < deadline:
-            remaining = max(0.1, deadline - time.monotonic())
+        with self._lock:
+            self._events.clear()
+            sent_at = self._event_seq
+        waiter = self._send_raw(method, params)
+        try:
+            result = self._result(waiter, timeout)[0]
+        except queue.Empty:
+            return {}
+        self._next_event((event_name,), deadline, after=sent_at)
+        return result
+
+    def enable(self, domain: str) -> None:
+        """Enable a CDP domain's events (e.g. "Page"), once per session."""
+        if domain not in self._enabled:
+            self.send(f"{domain}.enable")
+            self._enabled.add(domain)
+
+    def add_init_script(self, source: str) -> None:
+        """Run *source* in the current document and every later one.
+
+        Registers it with Page.addScriptToEvaluateOnNewDocument, once per
+        session (the registration ends with the session).
+        """
+        if source not in self._init_scripts:
+            self.enable("Page")
+            self.send_batch([
+                ("Page.addScriptToEvaluateOnNewDocument", {"source": source}),
+                ("Runtime.evaluate", {"expression": source}),
+            ])
+            self._init_scripts.add(source)
+
+    def run_script(self, source: str, **params: Any) -> dict:
+        """Run *source*, compiling it once it turns out to repeat.
+
+        The first run is a plain Runtime.evaluate (one round-trip). From
+        the second, the script is compiled via Runtime.compileScript and
+        its id reused with Runtime.runScript, so repeat runs skip V8's
+        parse and send only the id over the wire. *params* go to
+        evaluate/runScript (e.g. returnByValue=True).
+        """
+        script_id = self._scripts.get(source)
+        if script_id is not None:
             try:
-                raw = self._ws.recv(timeout=remaining)
-            except TimeoutError:
-                break
-            msg = json.loads(raw)
-            if msg.get("id") == msg_id:
-                if "error" in msg:
-                    raise CDPError(msg["error"].get("message", str(msg["error"])))
-                result = msg.get("result", {})
-            if msg.get("method") == event_name:
-                return result or {}
-
-        return result or {}
+                return self.send("Runtime.runScript", scriptId=script_id, **params)
+            except CDPError:
+                pass  # page navigated since — the compiled script is gone
+        elif source not in self._scripts_seen:
+            if len(self._scripts_seen) >= self._SCRIPT_CACHE:
+                self._scripts_seen.clear()
+            self._scripts_seen.add(source)
+            return self.send("Runtime.evaluate", expression=source, **params)
+        self.enable("Runtime")  # compileScript requires it
+        compiled = self.send(
+            "Runtime.compileScript", expression=source, sourceURL="", persistScript=True
+        )
+        if "scriptId" not in compiled:
+            details = compiled.get("exceptionDetails", {})
+            raise CDPError(details.get("text", "Script failed to compile"))
+        if len(self._scripts) >= self._SCRIPT_CACHE:
+            self._scripts.clear()
+        script_id = self._scripts[source] = compiled["scriptId"]
+        return self.send("Runtime.runScript", scriptId=script_id, **params)
+
+    def wait_for_event(self, events: Collection[str], timeout: float) -> dict | None:
+        """Wait up to *timeout* seconds for any of *events*.
+
+        Events that arrived while the previous send() or send_batch() was
+        waiting for its response count too, so one fired by that command
+        isn't missed. Returns the event message, or None if none arrived
+        in time. The events' domains must already be enabled.
+        """
+        return self._next_event(events, time.monotonic() + timeout)
+
+    def _next_event(
+        self, events: Collection[str], deadline: float, after: int = 0
+    ) -> dict | None:
+        with self._cond:
+            while True:
+                while self._events:
+                    seq, method, msg = self._events.popleft()
+                    if seq > after and method in events:
+                        return _loads(msg) if isinstance(msg, str) else msg
+                if self._closed:
+                    raise CDPError("CDP connection closed")
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return None
+                self._cond.wait(remaining)
 
     def close(self) -> None:
-        """Close the WebSocket connection."""
+        """Close the WebSocket connection (or detach, if attached)."""
+        root = self._root
+        if root is not self:
+            with self._lock:
+                detach = not self._closed and not root._closed
+                root._children.pop(self._session_id, None)
+                self._shutdown("CDP session closed")
+            if detach:
+                try:
+                    root.send_nowait("Target.detachFromTarget", sessionId=self._session_id)
+                except CDPError:
+                    pass
+            return
+        self._closed = True
         try:
             self._ws.close()
         except Exception:
             pass
 
 
+class AsyncCDPSession:
+    """Low-level asyncio CDP WebSocket session.
+
+    Commands don't wait on each other: a single reader task routes each
+    response to the future for its id, so independent calls can be awaited
+    together — on one target or across several.
+
+    Example:
+        cdp = await AsyncCDPSession.connect_to_page(target_id, port=9222)
+        a, b = await asyncio.gather(
+            cdp.send("Runtime.evaluate", expression="document.title"),
+            cdp.send("Runtime.evaluate", expression="location.href"),
+        )
+        await cdp.close()
+    """
+
+    def __init__(self, ws: Any) -> None:
+        self._ws = ws
+        self._id = 0
+        self._pending: dict[int, asyncio.Future] = {}
+        self._waiters: dict[str, list[asyncio.Future]] = {}
+        self._reader = asyncio.get_running_loop().create_task(self._read_loop())
+
+    @staticmethod
+    async def _ws_connect(ws_url: str) -> Any:
+        try:
+            from websockets.asyncio.client import connect
+        except ImportError:
+            raise ImportError(
+                "AsyncCDPSession requires websockets>=13: pip install -U websockets"
+            ) from None
+        return await connect(ws_url, **_WS_OPTIONS)
+
+    @classmethod
+    async def connect_to_page(cls, target_id: str, port: int = 9222) -> AsyncCDPSession:
+        """Connect to a specific page target by its ID."""
+        ws_url = f"ws://127.0.0.1:{port}/devtools/page/{target_id}"
+        return cls(await cls._ws_connect(ws_url))
+
+    @classmethod
+    async def connect_to_browser(cls, cdp_url: str) -> AsyncCDPSession:
+        """Connect to the browser-level CDP endpoint."""
+        ws_url = await asyncio.to_thread(_browser_ws_url, cdp_url)
+        return cls(await cls._ws_connect(ws_url))
+
+    async def _read_loop(self) -> None:
+        error: Exception = CDPError("CDP connection closed")
+        try:
+            async for raw in self._ws:
+                msg = _loads(raw)
+                fut = self._pending.pop(msg.get("id"), None) if "id" in msg else None
+                if fut is not None:
+                    if fut.done():
+                        continue  # caller gave up (cancelled or timed out)
+                    if "error" in msg:
+                        err = msg["error"]
+                        fut.set_exception(CDPError(err.get("message", str(err))))
+                    else:
+                        fut.set_result(msg.get("result", {}))
+                elif "method" in msg:
+                    for fut in self._waiters.pop(msg["method"], ()):
+                        if not fut.done():
+                            fut.set_result(msg.get("params", {}))
+        except websockets.exceptions.ConnectionClosed as e:
+            error = CDPError(f"CDP connection closed: {e}")
+        finally:
+            for fut in [*self._pending.values(), *(f for fs in self._waiters.values() for f in fs)]:
+                if not fut.done():
+                    fut.set_exception(error)
+            self._pending.clear()
+            self._waiters.clear()
+
+    async def send(self, method: str, **params: Any) -> dict:
+        """Send a CDP command and wait for its response."""
+        if self._reader.done():
+            raise CDPError("CDP connection closed")
+        self._id += 1
+        msg_id = self._id
+        fut = asyncio.get_running_loop().create_future()
+        self._pending[msg_id] = fut
+        try:
+            await self._ws.send(_dumps({"id": msg_id, "method": method, "params": params}))
+            return await fut
+        finally:
+            self._pending.pop(msg_id, None)
+
+    async def send_and_wait_event(
+        self, method: str, event_name: str, timeout: float = 10.0, **params: Any
+    ) -> dict:
+        """Send a CDP command and wait for a specific event.
+
+        The event listener is armed before the command is sent, so an event
+        that fires immediately is not missed.
+        """
+        event = asyncio.get_running_loop().create_future()
+        self._waiters.setdefault(event_name, []).append(event)
+        result = await self.send(method, **params)
+        try:
+            await asyncio.wait_for(event, timeout)
+        except asyncio.TimeoutError:
+            pass
+        return result
+
+    async def close(self) -> None:
+        """Close the WebSocket connection."""
+        await self._ws.close()
+        await asyncio.gather(self._reader, return_exceptions=True)
+
+    async def __aenter__(self) -> AsyncCDPSession:
+        return self
+
+    async def __aexit__(self, *exc: Any) -> None:
+        await self.close()
+
+
+# Events that mean an action kicked off a navigation, and how long to wait
+# for one before assuming it didn't (most clicks and focuses don't navigate).
+_NAV_START_EVENTS = frozenset({"Page.frameRequestedNavigation", "Page.frameStartedLoading"})
+_SETTLE_TIMEOUT = 0.02
+
+
+# Key events per send_batch when typing char-by-char — bounds how far the
+# socket runs ahead of Chrome's input queue
+_KEY_BATCH = 64
+
+
+def _clear_contenteditable_cmds(index: int) -> list[tuple[str, dict]]:
+    """Select-all-and-delete for a contenteditable, as one CDP batch."""
+    return [
+        ("Runtime.evaluate", {"expression": f"__bpy.selectContents({index})"}),
+        ("Input.dispatchKeyEvent", {"type": "keyDown", "key": "Backspace", "code": "Backspace"}),
+        ("Input.dispatchKeyEvent", {"type": "keyUp", "key": "Backspace", "code": "Backspace"}),
+    ]
+
+
+# What a helper call evaluates to when the page lacks window.__bpy
+_NO_HELPERS = "__bpy missing"
+
+# CDP errors for an awaited evaluate whose page navigated away under it
+_NAVIGATED_AWAY_ERRORS = (
+    "Execution context was destroyed",
+    "Promise was collected",
+    "Inspected target navigated or closed",
+)
+
+
+# Browser-level connections, one per CDP endpoint (cdp_url → session),
+# shared by every Browser in the process: their tabs are attached over it,
+# so N tabs cost one socket rather than N
+_browser_conns: dict[str, CDPSession] = {}
+_browser_conns_lock = threading.Lock()
+
+
+def _shared_browser_session(cdp_url: str) -> CDPSession:
+    """The process-wide browser-level session for *cdp_url*."""
+    with _browser_conns_lock:
+        cdp = _browser_conns.get(cdp_url)
+        if cdp is None or cdp.closed:
+            cdp = _browser_conns[cdp_url] = CDPSession.connect_to_browser(cdp_url)
+            cdp._on_close = lambda: _evict_browser_session(cdp_url, cdp)
+        return cdp
+
+
+def _evict_browser_session(cdp_url: str, cdp: CDPSession) -> None:
+    """Forget *cdp* once its socket has dropped (unless already replaced)."""
+    with _browser_conns_lock:
+        if _browser_conns.get(cdp_url) is cdp:
+            del _browser_conns[cdp_url]
+
+
+@atexit.register
+def _close_browser_sessions() -> None:
+    """Close the shared browser-level sessions cleanly on interpreter exit."""
+    with _browser_conns_lock:
+        sessions = list(_browser_conns.values())
+        _browser_conns.clear()
+    for cdp in sessions:
+        cdp.close()
+
+
 # ── Browser (high-level API) ──
 
 
@@ -210,6 +752,10 @@ class Browser:
     Args:
         cdp_url: CDP endpoint URL (default: http://127.0.0.1:9222).
                  Set CDP_URL env var to override.
+        connection: A browser-level CDPSession to drive the browser through
+                    instead of cdp_url — e.g. the pipe session of
+                    ``Browser.launch(pipe=True)``. Tabs are then attached
+                    over it rather than opened as separate WebSockets.
 
     Example:
         b = Browser()
@@ -219,32 +765,144 @@ class Browser:
         print(b.text())               # Read the page
     """
 
-    def __init__(self, cdp_url: str | None = None) -> None:
+    def __init__(
+        self, cdp_url: str | None = None, connection: CDPSession | None = None
+    ) -> None:
         self.cdp_url = cdp_url or os.environ.get("CDP_URL", "http://127.0.0.1:9222")
+        self._connection = connection
         self._port = int(self.cdp_url.rsplit(":", 1)[-1].split("/")[0])
+        self._host = urlsplit(self.cdp_url).hostname or "127.0.0.1"
+        # Kept-alive connection for the HTTP endpoints (/json/...)
+        self._http: http.client.HTTPConnection | None = None
+        # Page sessions, reused across calls (target id → session)
+        self._sessions: dict[str, CDPSession] = {}
+        # Over a connection: tab last selected or opened, see _current_target
+        self._selected: str | None = None
+        # HTTP endpoint responses (path → (fetched at, data)), see _fetch_json
+        self._json_cache: dict[str, tuple[float, Any]] = {}
+        # Page targets filtered out of the last /json/list (raw list, pages)
+        self._pages: tuple[Any, list[dict]] = (None, [])
+        # hover_xy() move not sent yet (session, x, y), see _flush_move
+        self._pending_move: tuple[CDPSession, float, float] | None = None
+        self._move_timer: threading.Timer | None = None
+        self._move_lock = threading.Lock()
+        # When the last hover_xy() move went out (monotonic)
+        self._last_move = 0.0
+
+    def close(self) -> None:
+        """Close all cached page sessions.
+
+        Optional — sessions are reopened on demand, and closed with the
+        process otherwise. The browser-level connection they ran over is
+        shared with other Browsers and stays open.
+        """
+        self._flush_move(wait=True)
+        sessions = list(self._sessions.values())
+        self._sessions.clear()
+        for cdp in sessions:
+            cdp.close()
+        if self._http is not None:
+            self._http.close()
+            self._http = None
+
+    def __enter__(self) -> Browser:
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
 
     # ── Private helpers ──
 
-    def _fetch_json(self, path: str) -> Any:
-        """Fetch JSON from the CDP HTTP endpoint."""
+    # How long a /json/list snapshot may be reused for target lookups
+    _JSON_TTL = 0.25
+
+    def _fetch_json(self, path: str, max_age: float = _JSON_TTL) -> Any:
+        """Fetch JSON from the CDP HTTP endpoint.
+
+        Responses younger than *max_age* seconds are served from cache, so
+        back-to-back calls share one HTTP round-trip. Pass ``max_age=0``
+        when the caller reports the data (titles/URLs change on navigation).
+        """
+        now = time.monotonic()
+        hit = self._json_cache.get(path)
+        if hit is not None and now - hit[0] < max_age:
+            return hit[1]
         try:
-            return json.loads(urlopen(f"{self.cdp_url}{path}").read())
-        except (URLError, OSError):
+            data = _loads(self._http_get(path))
+        except (http.client.HTTPException, OSError):
             raise BrowserNotRunning(self.cdp_url)
-
-    def _get_pages(self) -> list[dict]:
+        self._json_cache[path] = (now, data)
+        return data
+
+    def _http_get(self, path: str) -> bytes:
+        """GET *path* from the CDP HTTP endpoint over a kept-alive socket."""
+        for attempt in range(2):
+            if self._http is None:
+                self._http = http.client.HTTPConnection(self._host, self._port, timeout=5)
+            try:
+                self._http.request("GET", path)
+                resp = self._http.getresponse()
+                body = resp.read()
+                break
+            except Exception as e:
+                # Never keep a socket that failed mid-request: it would refuse
+                # every later request (CannotSendRequest)
+                self._http.close()
+                self._http = None
+                # The server dropped the idle socket — retry once on a fresh one
+                stale = (http.client.BadStatusLine, ConnectionResetError, BrokenPipeError)
+                if attempt or not isinstance(e, stale):
+                    raise
+        if resp.status != 200:
+            raise http.client.HTTPException(f"{path}: HTTP {resp.status}")
+        return body
+
+    def _fetch_targets(self, max_age: float = _JSON_TTL) -> list[dict]:
+        """Target list via Target.getTargets, shaped like /json/list's.
+
+        Used when driving the browser over a connection with no HTTP
+        endpoint (pipe mode); cached like _fetch_json.
+        """
+        now = time.monotonic()
+        hit = self._json_cache.get("Target.getTargets")
+        if hit is not None and now - hit[0] < max_age:
+            return hit[1]
+        infos = self._connection.send("Target.getTargets")["targetInfos"]
+        data = [{"id": t["targetId"], **t} for t in infos]
+        self._json_cache["Target.getTargets"] = (now, data)
+        return data
+
+    def _get_pages(self, max_age: float = _JSON_TTL) -> list[dict]:
         """Get all page-type targets."""
-        targets = self._fetch_json("/json/list")
-        return [t for t in targets if t.get("type") == "page"]
-
-    def _current_target(self) -> dict:
-        """Get the first visible page target."""
-        pages = self._get_pages()
+        if self._connection is not None:
+            targets = self._fetch_targets(max_age)
+        else:
+            targets = self._fetch_json("/json/list", max_age)
+        raw, pages = self._pages
+        if targets is not raw:
+            # New snapshot — filter once, then reuse while it's cached
+            pages = [t for t in targets if t.get("type") == "page"]
+            self._pages = (targets, pages)
+        return pages
+
+    def _current_target(self, max_age: float = _JSON_TTL) -> dict:
+        """Get the first visible page target.
+
+        /json/list puts the most recently active tab first. Over a
+        connection, Target.getTargets has no such order, so the tab last
+        selected or opened through this Browser is preferred while it's
+        still open.
+        """
+        pages = self._get_pages(max_age)
         if not pages:
             raise CDPError(
                 "No browser tabs open.\n"
                 "Hint: Open a tab in your browser, or use: browser.open('https://example.com')"
             )
+        if self._selected is not None:
+            for page in pages:
+                if page["id"] == self._selected:
+                    return page
         return pages[0]
 
     def _target_by_index(self, index: int) -> dict:
@@ -258,35 +916,73 @@ class Browser:
         return pages[index]
 
     def _connect_page(self, target_id: str | None = None) -> CDPSession:
-        """Connect to a page target. Uses current tab if no ID given."""
+        """Session for a page target (current tab if no ID given).
+
+        Sessions are attached over the browser-level connection (see
+        CDPSession.attach), cached per target and reused until detached
+        (e.g. the tab was closed), so a call costs no handshake.
+        A hover_xy() move still waiting to be sent goes out first, so it
+        lands before whatever the caller does next.
+        """
+        if self._pending_move is not None:
+            self._flush_move()
         tid = target_id or self._current_target()["id"]
-        return CDPSession.connect_to_page(tid, self._port)
+        cdp = self._sessions.get(tid)
+        if cdp is None or cdp.closed:
+            # Drop sessions whose tabs have gone away while we're here
+            for dead in [k for k, v in self._sessions.items() if v.closed]:
+                del self._sessions[dead]
+            try:
+                cdp = self._connect_browser().attach(tid)
+            except CDPError:
+                if self._connection is not None:
+                    raise
+                # No flat sessions (older or non-Chrome endpoint) — own socket
+                cdp = CDPSession.connect_to_page(tid, self._port)
+            self._sessions[tid] = cdp
+        return cdp
 
     def _connect_browser(self) -> CDPSession:
-        """Connect to the browser-level CDP endpoint."""
-        return CDPSession.connect_to_browser(self.cdp_url)
+        """Session for the browser-level CDP endpoint (shared)."""
+        if self._connection is not None:
+            return self._connection
+        return _shared_browser_session(self.cdp_url)
 
     def _eval(self, js: str, target_id: str | None = None) -> Any:
         """Evaluate JS in the page and return the result value."""
         cdp = self._connect_page(target_id)
-        try:
-            result = cdp.send("Runtime.evaluate", expression=js, returnByValue=True)
-            r = result.get("result", {})
-            return r.get("value")
-        finally:
-            cdp.close()
+        result = cdp.send("Runtime.evaluate", expression=js, returnByValue=True)
+        r = result.get("result", {})
+        return r.get("value")
 
-    def _ensure_indexed(self, cdp: CDPSession) -> bool:
-        """Make sure elements are indexed. Returns True if re-indexed."""
-        result = cdp.send(
-            "Runtime.evaluate", expression=check_indexed_js(), returnByValue=True
-        )
-        if not result.get("result", {}).get("value"):
-            cdp.send(
-                "Runtime.evaluate", expression=elements_js(None), returnByValue=True
+    @staticmethod
+    def _call(
+        cdp: CDPSession, op: str, *args: Any, index: bool = False, wait: bool = False
+    ) -> Any:
+        """Call a method of the page's helper library and return its value.
+
+        The library (``window.__bpy``, see js_expressions.helpers_js) is
+        installed once per session — in the current document and every one
+        after it — so each call sends only a short expression. With *index*,
+        the page's elements are indexed first unless the element (the first
+        argument) is already stamped; with *wait*, a returned promise is
+        awaited.
+        """
+        cdp.add_init_script(helpers_js())
+        call = f"__bpy.{op}({', '.join(_dumps(a) for a in args)})"
+        if index:
+            call = f"(__bpy.ensureIndexed({_dumps(args[0])}), {call})"
+        expression = f"window.__bpy ? {call} : '{_NO_HELPERS}'"
+        for _ in range(2):
+            result = cdp.send(
+                "Runtime.evaluate", expression=expression, returnByValue=True, awaitPromise=wait
             )
-            return True
-        return False
+            value = result.get("result", {}).get("value")
+            if value != _NO_HELPERS:
+                return value
+            # A document the init script didn't reach — install it by hand
+            cdp.send("Runtime.evaluate", expression=helpers_js())
+        raise CDPError("page helpers could not be installed")
 
     # ── Tab management ──
 
@@ -300,7 +996,7 @@ class Browser:
             >>> b.tabs()
             [Tab(index=0, id='...', title='Google', url='https://google.com')]
         """
-        pages = self._get_pages()
+        pages = self._get_pages(max_age=0)
         return [
             Tab(index=i, id=t["id"], title=t.get("title", ""), url=t.get("url", ""))
             for i, t in enumerate(pages)
@@ -317,11 +1013,11 @@ class Browser:
         """
         target = self._target_by_index(index)
         cdp = self._connect_page(target["id"])
-        try:
-            cdp.send("Page.bringToFront")
-            return f"Switched to tab [{index}]: {target.get('title', '')} — {target.get('url', '')}"
-        finally:
-            cdp.close()
+        cdp.send("Page.bringToFront")
+        self._json_cache.clear()
+        if self._connection is not None:
+            self._selected = target["id"]
+        return f"Switched to tab [{index}]: {target.get('title', '')} — {target.get('url', '')}"
 
     def newtab(self, url: str | None = None) -> str:
         """Open a new browser tab.
@@ -333,11 +1029,11 @@ class Browser:
             The new tab's target ID.
         """
         cdp = self._connect_browser()
-        try:
-            result = cdp.send("Target.createTarget", url=url or "about:blank")
-            return f"Opened new tab: {result.get('targetId', '')}"
-        finally:
-            cdp.close()
+        result = cdp.send("Target.createTarget", url=url or "about:blank")
+        self._json_cache.clear()
+        if self._connection is not None:
+            self._selected = result.get("targetId") or self._selected
+        return f"Opened new tab: {result.get('targetId', '')}"
 
     def close_tab(self, index: int | None = None) -> str:
         """Close a browser tab.
@@ -352,11 +1048,12 @@ class Browser:
             self._target_by_index(index) if index is not None else self._current_target()
         )
         cdp = self._connect_browser()
-        try:
-            cdp.send("Target.closeTarget", targetId=target["id"])
-            return f"Closed tab: {target.get('title', '')}"
-        finally:
-            cdp.close()
+        cdp.send("Target.closeTarget", targetId=target["id"])
+        self._json_cache.clear()
+        stale = self._sessions.pop(target["id"], None)
+        if stale is not None:
+            stale.close()
+        return f"Closed tab: {target.get('title', '')}"
 
     # ── Navigation ──
 
@@ -379,14 +1076,11 @@ class Browser:
             url = "https://" + url
         target = self._current_target()
         cdp = self._connect_page(target["id"])
-        try:
-            cdp.send("Page.enable")
-            cdp.send_and_wait_event(
-                "Page.navigate", "Page.loadEventFired", timeout=10.0, url=url
-            )
-            return f"Navigated to {url}"
-        finally:
-            cdp.close()
+        cdp.enable("Page")
+        cdp.send_and_wait_event(
+            "Page.navigate", "Page.loadEventFired", timeout=10.0, url=url
+        )
+        return f"Navigated to {url}"
 
     def url(self) -> str:
         """Get the current page URL.
@@ -394,7 +1088,7 @@ class Browser:
         Returns:
             The URL of the active tab.
         """
-        return self._current_target().get("url", "")
+        return self._current_target(max_age=0).get("url", "")
 
     def back(self) -> str:
         """Go back in browser history.
@@ -403,18 +1097,15 @@ class Browser:
             The URL navigated to, or a message if already at the start.
         """
         cdp = self._connect_page()
-        try:
-            hist = cdp.send("Page.getNavigationHistory")
-            idx = hist.get("currentIndex", 0)
-            entries = hist.get("entries", [])
-            if idx > 0:
-                cdp.send(
-                    "Page.navigateToHistoryEntry", entryId=entries[idx - 1]["id"]
-                )
-                return f"Back to: {entries[idx - 1]['url']}"
-            return "Already at first page in history."
-        finally:
-            cdp.close()
+        hist = cdp.send("Page.getNavigationHistory")
+        idx = hist.get("currentIndex", 0)
+        entries = hist.get("entries", [])
+        if idx > 0:
+            cdp.send(
+                "Page.navigateToHistoryEntry", entryId=entries[idx - 1]["id"]
+            )
+            return f"Back to: {entries[idx - 1]['url']}"
+        return "Already at first page in history."
 
     def forward(self) -> str:
         """Go forward in browser history.
@@ -423,18 +1114,15 @@ class Browser:
             The URL navigated to, or a message if already at the end.
         """
         cdp = self._connect_page()
-        try:
-            hist = cdp.send("Page.getNavigationHistory")
-            idx = hist.get("currentIndex", 0)
-            entries = hist.get("entries", [])
-            if idx < len(entries) - 1:
-                cdp.send(
-                    "Page.navigateToHistoryEntry", entryId=entries[idx + 1]["id"]
-                )
-                return f"Forward to: {entries[idx + 1]['url']}"
-            return "Already at last page in history."
-        finally:
-            cdp.close()
+        hist = cdp.send("Page.getNavigationHistory")
+        idx = hist.get("currentIndex", 0)
+        entries = hist.get("entries", [])
+        if idx < len(entries) - 1:
+            cdp.send(
+                "Page.navigateToHistoryEntry", entryId=entries[idx + 1]["id"]
+            )
+            return f"Forward to: {entries[idx + 1]['url']}"
+        return "Already at last page in history."
 
     def refresh(self) -> str:
         """Reload the current page.
@@ -443,11 +1131,8 @@ class Browser:
             Confirmation message.
         """
         cdp = self._connect_page()
-        try:
-            cdp.send("Page.reload")
-            return "Refreshed."
-        finally:
-            cdp.close()
+        cdp.send("Page.reload")
+        return "Refreshed."
 
     # ── Element interaction ──
 
@@ -474,20 +1159,15 @@ class Browser:
             >>> b.elements(".sidebar")  # Only elements inside .sidebar
         """
         cdp = self._connect_page()
-        try:
-            cdp.send("DOM.enable")
-            cdp.send("Runtime.enable")
-            result = cdp.send(
-                "Runtime.evaluate",
-                expression=elements_js(selector),
-                returnByValue=True,
-            )
-            raw = json.loads(result.get("result", {}).get("value", "[]"))
-            if isinstance(raw, dict) and "error" in raw:
-                raise CDPError(raw["error"])
-            return [Element(index=i, label=e["label"], desc=e["desc"]) for i, e in enumerate(raw)]
-        finally:
-            cdp.close()
+        cdp.enable("DOM")
+        result = cdp.run_script(elements_js(selector), returnByValue=True)
+        value = result.get("result", {}).get("value", "[]")
+        if _elements_decoder is not None and value.startswith("["):
+            return _elements_decoder.decode(value)
+        raw = _loads(value)
+        if isinstance(raw, dict) and "error" in raw:
+            raise CDPError(raw["error"])
+        return [Element(**e) for e in raw]
 
     def click(self, index: int) -> str:
         """Click an element by its index number.
@@ -510,98 +1190,43 @@ class Browser:
             'Clicked: (button) Sign In'
         """
         cdp = self._connect_page()
+        cdp.enable("Page")
+        # One evaluate: pre-click state, the click itself, a tick for
+        # handlers to run, then post-click state (and toggle state)
         try:
-            self._ensure_indexed(cdp)
-
-            # Capture state before click
-            pre = cdp.send(
-                "Runtime.evaluate",
-                expression="""(() => {
-                    return JSON.stringify({
-                        url: location.href,
-                        dialogs: document.querySelectorAll('[role=dialog],[aria-modal=true]').length
-                    });
-                })()""",
-                returnByValue=True,
-            )
-            pre_state = json.loads(pre.get("result", {}).get("value", "{}"))
-
-            # Also check checkbox/radio state before click
-            check_pre = cdp.send(
-                "Runtime.evaluate",
-                expression=f"""(() => {{
-                    const el = (window.__bpyDeepQuery && window.__bpyDeepQuery({index})) || document.querySelector('[data-bpy-idx="{index}"]');
-                    if (!el) return JSON.stringify({{}});
-                    const tag = el.tagName.toLowerCase();
-                    const type = (el.type || '').toLowerCase();
-                    if ((tag === 'input' && (type === 'checkbox' || type === 'radio')) || el.getAttribute('role') === 'checkbox' || el.getAttribute('role') === 'radio')
-                        return JSON.stringify({{ toggle: true, checked: el.checked || el.getAttribute('aria-checked') === 'true' }});
-                    return JSON.stringify({{}});
-                }})()""",
-                returnByValue=True,
-            )
-            pre_toggle = json.loads(check_pre.get("result", {}).get("value", "{}"))
-
-            result = cdp.send(
-                "Runtime.evaluate",
-                expression=click_info_js(index),
-                returnByValue=True,
-            )
-            info = json.loads(result.get("result", {}).get("value", "{}"))
-            if "error" in info:
-                raise CDPError(info["error"])
-
-            # Brief pause for navigation/state changes
-            time.sleep(0.15)
-
-            # Capture state after click
-            try:
-                post = cdp.send(
-                    "Runtime.evaluate",
-                    expression="""(() => {
-                        return JSON.stringify({
-                            url: location.href,
-                            dialogs: document.querySelectorAll('[role=dialog],[aria-modal=true]').length
-                        });
-                    })()""",
-                    returnByValue=True,
-                )
-                post_state = json.loads(post.get("result", {}).get("value", "{}"))
-            except Exception:
-                # Page navigated — cdp connection may be stale
-                return f"Clicked: ({info['label']}) {info['desc']} — navigated away"
-
-            # Build status suffix
-            status = ""
-            pre_url = pre_state.get("url", "")
-            post_url = post_state.get("url", "")
-            if post_url != pre_url:
-                # Shorten URL for display
-                from urllib.parse import urlparse
-                path = urlparse(post_url).path or "/"
-                status = f" — navigated to {path}"
-            elif pre_toggle.get("toggle"):
-                # Re-check toggle state
-                try:
-                    check_post = cdp.send(
-                        "Runtime.evaluate",
-                        expression=f"""(() => {{
-                            const el = (window.__bpyDeepQuery && window.__bpyDeepQuery({index})) || document.querySelector('[data-bpy-idx="{index}"]');
-                            if (!el) return 'unknown';
-                            return el.checked || el.getAttribute('aria-checked') === 'true' ? 'checked' : 'unchecked';
-                        }})()""",
-                        returnByValue=True,
-                    )
-                    new_state = check_post.get("result", {}).get("value", "unknown")
-                    status = f" — now {new_state}"
-                except Exception:
-                    pass
-            elif post_state.get("dialogs", 0) > pre_state.get("dialogs", 0):
-                status = " — dialog opened"
-
-            return f"Clicked: ({info['label']}) {info['desc']}{status}"
-        finally:
-            cdp.close()
+            info = _loads(self._call(cdp, "click", index, index=True, wait=True) or "{}")
+        except CDPError as e:
+            # Page navigated before the promise settled — context destroyed
+            if any(m in str(e) for m in _NAVIGATED_AWAY_ERRORS):
+                return f"Clicked [{index}] — navigated away"
+            raise
+        if "error" in info:
+            raise CDPError(info["error"])
+        pre_state = info.get("pre", {})
+        post_state = info.get("post", {})
+
+        # location.href only changes once a navigation commits. If the click
+        # started one, give it a moment and take the URL from the event.
+        post_url = post_state.get("url", "")
+        if cdp.wait_for_event(_NAV_START_EVENTS, _SETTLE_TIMEOUT):
+            nav = cdp.wait_for_event(("Page.frameNavigated",), 0.15)
+            frame = nav["params"]["frame"] if nav else {}
+            if not frame.get("parentId"):
+                post_url = frame.get("url", post_url)
+
+        # Build status suffix
+        status = ""
+        pre_url = pre_state.get("url", "")
+        if post_url != pre_url:
+            # Shorten URL for display
+            path = urlparse(post_url).path or "/"
+            status = f" — navigated to {path}"
+        elif info.get("state"):
+            status = f" — now {info['state']}"
+        elif post_state.get("dialogs", 0) > pre_state.get("dialogs", 0):
+            status = " — dialog opened"
+
+        return f"Clicked: ({info['label']}) {info['desc']}{status}"
 
     def type(self, index: int, text: str) -> str:
         """Type text into a DOM element by its index number.
@@ -630,114 +1255,75 @@ class Browser:
             'Typed into [2] (input)'
         """
         cdp = self._connect_page()
-        try:
-            self._ensure_indexed(cdp)
+        cdp.enable("Page")
+        # Verify element is typeable
+        info = _loads(self._call(cdp, "typeInfo", index, index=True) or "{}")
+        if "error" in info:
+            raise CDPError(info["error"])
 
-            # Verify element is typeable
-            result = cdp.send(
-                "Runtime.evaluate",
-                expression=type_info_js(index),
-                returnByValue=True,
-            )
-            info = json.loads(result.get("result", {}).get("value", "{}"))
-            if "error" in info:
-                raise CDPError(info["error"])
-
-            # Focus element — try el.focus() first (quiet, won't trigger
-            # popups/contact cards), fall back to mouse click if needed
-            focus_result = cdp.send(
-                "Runtime.evaluate",
-                expression=f"""(() => {{
-                    const el = (window.__bpyDeepQuery && window.__bpyDeepQuery({index})) || document.querySelector('[data-bpy-idx="{index}"]');
-                    if (!el) return false;
-                    el.focus();
-                    return document.activeElement === el;
-                }})()""",
-                returnByValue=True,
-            )
-            got_focus = focus_result.get("result", {}).get("value", False)
-
-            if not got_focus:
-                # Fallback: mouse click for elements that need it (some SPAs)
-                click_opts = {
-                    "x": info["x"],
-                    "y": info["y"],
-                    "button": "left",
-                    "clickCount": 1,
-                }
-                cdp.send("Input.dispatchMouseEvent", type="mousePressed", **click_opts)
-                cdp.send("Input.dispatchMouseEvent", type="mouseReleased", **click_opts)
-            time.sleep(0.1)
-
-            # Clear existing content
-            if info.get("ce"):
-                cdp.send(
-                    "Runtime.evaluate",
-                    expression=clear_contenteditable_js(index),
-                )
-                cdp.send(
-                    "Input.dispatchKeyEvent",
-                    type="keyDown",
-                    key="Backspace",
-                    code="Backspace",
-                )
-                cdp.send(
-                    "Input.dispatchKeyEvent",
-                    type="keyUp",
-                    key="Backspace",
-                    code="Backspace",
-                )
-            else:
-                cdp.send(
-                    "Runtime.evaluate", expression=clear_input_js(index)
+        # Focus element — try el.focus() first (quiet, won't trigger
+        # popups/contact cards), fall back to mouse click if needed
+        got_focus = self._call(cdp, "focusQuiet", index)
+
+        if not got_focus:
+            # Fallback: mouse click for elements that need it (some SPAs)
+            click_opts = {
+                "x": info["x"],
+                "y": info["y"],
+                "button": "left",
+                "clickCount": 1,
+            }
+            cdp.send_batch([
+                ("Input.dispatchMouseEvent", {"type": "mousePressed", **click_opts}),
+                ("Input.dispatchMouseEvent", {"type": "mouseReleased", **click_opts}),
+            ])
+        cdp.wait_for_event(_NAV_START_EVENTS, _SETTLE_TIMEOUT)
+
+        # Clear existing content
+        if info.get("ce"):
+            cdp.send_batch(_clear_contenteditable_cmds(index))
+        else:
+            self._call(cdp, "clearInput", index)
+
+        # Insert text
+        try:
+            cdp.send("Input.insertText", text=text)
+        except CDPError:
+            # Fallback: character-by-character, pipelined in chunks
+            keys = [
+                cmd
+                for char in text
+                for cmd in (
+                    ("Input.dispatchKeyEvent", {
+                        "type": "keyDown", "text": char, "key": char, "unmodifiedText": char,
+                    }),
+                    ("Input.dispatchKeyEvent", {"type": "keyUp", "key": char}),
                 )
+            ]
+            for i in range(0, len(keys), _KEY_BATCH):
+                cdp.send_batch(keys[i:i + _KEY_BATCH])
 
-            # Insert text
-            try:
-                cdp.send("Input.insertText", text=text)
-            except CDPError:
-                # Fallback: character-by-character
-                for char in text:
-                    cdp.send(
-                        "Input.dispatchKeyEvent",
-                        type="keyDown",
-                        text=char,
-                        key=char,
-                        unmodifiedText=char,
-                    )
-                    cdp.send("Input.dispatchKeyEvent", type="keyUp", key=char)
-
-            # Sync value for React/Vue
-            if not info.get("ce"):
-                cdp.send(
-                    "Runtime.evaluate",
-                    expression=set_input_value_js(index, text),
-                )
+        # Sync value for React/Vue
+        if not info.get("ce"):
+            self._call(cdp, "setValue", index, text)
 
-            # Auto-verify
-            tag = info.get("tag", "element")
-            ce = ", contenteditable" if info.get("ce") else ""
-            try:
-                verify = cdp.send(
-                    "Runtime.evaluate",
-                    expression=check_value_js(index),
-                    returnByValue=True,
-                )
-                v = json.loads(verify.get("result", {}).get("value", "{}"))
-                actual_len = v.get("length", 0)
-                focused = v.get("focused", False)
-                if actual_len >= len(text) * 0.9:
-                    return f"Typed {actual_len} chars into [{index}] ({tag}{ce}) — verified ✓"
-                elif actual_len == 0 and not focused:
-                    return f"Typed into [{index}] ({tag}{ce}) — ⚠ element shows 0 chars and lost focus. Use focus({index}) to reclaim, then retry."
-                elif actual_len == 0:
-                    return f"Typed into [{index}] ({tag}{ce}) — ⚠ element shows 0 chars. Content may not have landed."
-                else:
-                    return f"Typed into [{index}] ({tag}{ce}) — ⚠ expected {len(text)} chars, got {actual_len}"
-            except Exception:
-                return f"Typed into [{index}] ({tag}{ce})"
-        finally:
-            cdp.close()
+        # Auto-verify
+        tag = info.get("tag", "element")
+        ce = ", contenteditable" if info.get("ce") else ""
+        try:
+            v = _loads(self._call(cdp, "check", index) or "{}")
+            actual_len = v.get("length", 0)
+            focused = v.get("focused", False)
+            if actual_len >= len(text) * 0.9:
+                return f"Typed {actual_len} chars into [{index}] ({tag}{ce}) — verified ✓"
+            elif actual_len == 0 and not focused:
+                return f"Typed into [{index}] ({tag}{ce}) — ⚠ element shows 0 chars and lost focus. Use focus({index}) to reclaim, then retry."
+            elif actual_len == 0:
+                return f"Typed into [{index}] ({tag}{ce}) — ⚠ element shows 0 chars. Content may not have landed."
+            else:
+                return f"Typed into [{index}] ({tag}{ce}) — ⚠ expected {len(text)} chars, got {actual_len}"
+        except Exception:
+            return f"Typed into [{index}] ({tag}{ce})"
 
     # ── Focus & verification ──
 
@@ -760,22 +1346,13 @@ class Browser:
             'Focused: (textarea) Compose body — focused: True'
         """
         cdp = self._connect_page()
-        try:
-            self._ensure_indexed(cdp)
-            result = cdp.send(
-                "Runtime.evaluate",
-                expression=focus_js(index),
-                returnByValue=True,
-            )
-            info = json.loads(result.get("result", {}).get("value", "{}"))
-            if "error" in info:
-                raise CDPError(info["error"])
-            status = "focused" if info.get("focused") else "focus sent (element may not accept focus)"
-            desc = info.get("desc", "")
-            desc_part = f" {desc}" if desc else ""
-            return f"Focused: ({info['label']}){desc_part} — {status}"
-        finally:
-            cdp.close()
+        info = _loads(self._call(cdp, "focus", index, index=True) or "{}")
+        if "error" in info:
+            raise CDPError(info["error"])
+        status = "focused" if info.get("focused") else "focus sent (element may not accept focus)"
+        desc = info.get("desc", "")
+        desc_part = f" {desc}" if desc else ""
+        return f"Focused: ({info['label']}){desc_part} — {status}"
 
     def check(self, index: int) -> str:
         """Read the current value/text of an element by index.
@@ -798,29 +1375,20 @@ class Browser:
             '[5] (textarea) Compose body — value: "Hello world..." (11 chars, focused)'
         """
         cdp = self._connect_page()
-        try:
-            self._ensure_indexed(cdp)
-            result = cdp.send(
-                "Runtime.evaluate",
-                expression=check_value_js(index),
-                returnByValue=True,
-            )
-            info = json.loads(result.get("result", {}).get("value", "{}"))
-            if "error" in info:
-                raise CDPError(info["error"])
-            value = info.get("value", "")
-            length = info.get("length", 0)
-            focused = info.get("focused", False)
-            label = info.get("label", "element")
-            desc = info.get("desc", "")
-            desc_part = f" {desc}" if desc else ""
-
-            # Truncate display value
-            display = value[:100] + "..." if len(value) > 100 else value
-            focus_str = "focused" if focused else "not focused"
-            return f"[{index}] ({label}){desc_part} — value: \"{display}\" ({length} chars, {focus_str})"
-        finally:
-            cdp.close()
+        info = _loads(self._call(cdp, "check", index, index=True) or "{}")
+        if "error" in info:
+            raise CDPError(info["error"])
+        value = info.get("value", "")
+        length = info.get("length", 0)
+        focused = info.get("focused", False)
+        label = info.get("label", "element")
+        desc = info.get("desc", "")
+        desc_part = f" {desc}" if desc else ""
+
+        # Truncate display value
+        display = value[:100] + "..." if len(value) > 100 else value
+        focus_str = "focused" if focused else "not focused"
+        return f"[{index}] ({label}){desc_part} — value: \"{display}\" ({length} chars, {focus_str})"
 
     def paste(self, index: int, content: str) -> str:
         """Paste content into an element with auto-verification and fallback.
@@ -828,11 +1396,10 @@ class Browser:
         Reliable content insertion that handles the full flow:
         1. Focus the element (no click events — avoids popups)
         2. Clear existing content
-        3. Insert text via Input.insertText
-        4. Verify content landed (auto-check)
-        5. If verification fails, fall back to JS-based insertion
-        6. Verify again
-        7. Return success with char count or failure with details
+        3. Insert text via Input.insertText and verify it landed
+        4. If verification fails, fall back to JS-based insertion, which
+           reports what landed
+        5. Return success with char count or failure with details
 
         Use for long content (emails, comments, posts). For short text,
         type() works fine. For canvas apps (Sheets, Docs), use keys().
@@ -849,93 +1416,57 @@ class Browser:
             'Pasted 42 chars into [5] (textarea) — verified ✓'
         """
         cdp = self._connect_page()
-        try:
-            self._ensure_indexed(cdp)
-
-            # Step 1: Verify element is typeable and get info
-            result = cdp.send(
-                "Runtime.evaluate",
-                expression=type_info_js(index),
-                returnByValue=True,
-            )
-            info = json.loads(result.get("result", {}).get("value", "{}"))
-            if "error" in info:
-                raise CDPError(info["error"])
-
-            # Step 2: Focus (no click events to avoid popups)
-            cdp.send(
-                "Runtime.evaluate",
-                expression=focus_js(index),
-                returnByValue=True,
-            )
-            time.sleep(0.1)
+        cdp.enable("Page")
+        # Step 1: Verify element is typeable and get info
+        info = _loads(self._call(cdp, "typeInfo", index, index=True) or "{}")
+        if "error" in info:
+            raise CDPError(info["error"])
 
-            # Step 3: Clear existing content
-            if info.get("ce"):
-                cdp.send(
-                    "Runtime.evaluate",
-                    expression=clear_contenteditable_js(index),
-                )
-                cdp.send("Input.dispatchKeyEvent", type="keyDown", key="Backspace", code="Backspace")
-                cdp.send("Input.dispatchKeyEvent", type="keyUp", key="Backspace", code="Backspace")
-            else:
-                cdp.send("Runtime.evaluate", expression=clear_input_js(index))
+        # Step 2: Focus (no click events to avoid popups)
+        self._call(cdp, "focus", index)
+        cdp.wait_for_event(_NAV_START_EVENTS, _SETTLE_TIMEOUT)
 
-            # Step 4: Insert text via CDP
-            try:
-                cdp.send("Input.insertText", text=content)
-            except CDPError:
-                pass  # Will fall back to JS below
+        # Step 3: Clear existing content
+        if info.get("ce"):
+            cdp.send_batch(_clear_contenteditable_cmds(index))
+        else:
+            self._call(cdp, "clearInput", index)
 
-            # Step 5: Verify
-            check_result = cdp.send(
-                "Runtime.evaluate",
-                expression=check_value_js(index),
-                returnByValue=True,
-            )
-            check_info = json.loads(check_result.get("result", {}).get("value", "{}"))
-            actual_len = check_info.get("length", 0)
-
-            # Good enough? (allow small variance for whitespace/newline differences)
-            if actual_len >= len(content) * 0.9:
-                tag = info.get("tag", "element")
-                ce = ", contenteditable" if info.get("ce") else ""
-                return f"Pasted {actual_len} chars into [{index}] ({tag}{ce}) — verified ✓"
-
-            # Step 6: Fallback — JS-based insertion
-            fallback_result = cdp.send(
-                "Runtime.evaluate",
-                expression=paste_content_js(index, content),
-                returnByValue=True,
-            )
-            fb_info = json.loads(fallback_result.get("result", {}).get("value", "{}"))
-            if "error" in fb_info:
-                raise CDPError(fb_info["error"])
-
-            # Step 7: Final verification
-            final_check = cdp.send(
-                "Runtime.evaluate",
-                expression=check_value_js(index),
-                returnByValue=True,
-            )
-            final_info = json.loads(final_check.get("result", {}).get("value", "{}"))
-            final_len = final_info.get("length", 0)
+        # Step 4: Insert text via CDP, and check only once Chrome has acked
+        # it — checking any earlier can read a short length and trigger the
+        # JS fallback, which would replace or duplicate the content
+        try:
+            cdp.send("Input.insertText", text=content)
+        except CDPError:
+            pass  # Will fall back to JS below
+        check_info = _loads(self._call(cdp, "check", index) or "{}")
+        actual_len = check_info.get("length", 0)
+
+        # Good enough? (allow small variance for whitespace/newline differences)
+        if actual_len >= len(content) * 0.9:
+            tag = info.get("tag", "element")
+            ce = ", contenteditable" if info.get("ce") else ""
+            return f"Pasted {actual_len} chars into [{index}] ({tag}{ce}) — verified ✓"
 
-            if final_len >= len(content) * 0.9:
-                tag = info.get("tag", "element")
-                ce = ", contenteditable" if info.get("ce") else ""
-                return f"Pasted {final_len} chars into [{index}] ({tag}{ce}) — verified ✓ (JS fallback)"
+        # Step 5: Fallback — JS-based insertion (returns the final length)
+        final_info = _loads(self._call(cdp, "paste", index, content) or "{}")
+        if "error" in final_info:
+            raise CDPError(final_info["error"])
+        final_len = final_info.get("length", 0)
 
-            # Both methods failed
+        if final_len >= len(content) * 0.9:
             tag = info.get("tag", "element")
-            focused = "focused" if final_info.get("focused") else "NOT focused"
-            return (
-                f"Paste into [{index}] ({tag}) may have failed. "
-                f"Expected ~{len(content)} chars, got {final_len}. "
-                f"Element is {focused}. Try: focus({index}), then paste again."
-            )
-        finally:
-            cdp.close()
+            ce = ", contenteditable" if info.get("ce") else ""
+            return f"Pasted {final_len} chars into [{index}] ({tag}{ce}) — verified ✓ (JS fallback)"
+
+        # Both methods failed
+        tag = info.get("tag", "element")
+        focused = "focused" if final_info.get("focused") else "NOT focused"
+        return (
+            f"Paste into [{index}] ({tag}) may have failed. "
+            f"Expected ~{len(content)} chars, got {final_len}. "
+            f"Element is {focused}. Try: focus({index}), then paste again."
+        )
 
     # ── Content extraction ──
 
@@ -957,7 +1488,9 @@ class Browser:
 
             >>> print(b.text(".main-content"))  # Just the main area
         """
-        return self._eval(extract_text_js(selector)) or "(empty page)"
+        cdp = self._connect_page()
+        result = cdp.run_script(extract_text_js(selector), returnByValue=True)
+        return result.get("result", {}).get("value") or "(empty page)"
 
     def html(self, selector: str) -> str:
         """Get the outerHTML of an element.
@@ -990,60 +1523,67 @@ class Browser:
             'https://github.com'
         """
         cdp = self._connect_page()
-        try:
-            result = cdp.send(
-                "Runtime.evaluate",
-                expression=js,
-                returnByValue=True,
-                awaitPromise=True,
-            )
-            exc = result.get("exceptionDetails")
-            if exc:
-                desc = exc.get("exception", {}).get("description", exc.get("text", ""))
-                raise CDPError(f"JS Error: {desc}")
-            r = result.get("result", {})
-            val = r.get("value")
-            if val is not None:
-                return val
-            if r.get("description"):
-                return r["description"]
-            return None if r.get("type") == "undefined" else r
-        finally:
-            cdp.close()
+        result = cdp.send(
+            "Runtime.evaluate",
+            expression=js,
+            returnByValue=True,
+            awaitPromise=True,
+        )
+        exc = result.get("exceptionDetails")
+        if exc:
+            desc = exc.get("exception", {}).get("description", exc.get("text", ""))
+            raise CDPError(f"JS Error: {desc}")
+        r = result.get("result", {})
+        val = r.get("value")
+        if val is not None:
+            return val
+        if r.get("description"):
+            return r["description"]
+        return None if r.get("type") == "undefined" else r
 
     # ── Screenshot ──
 
+    # Base64 characters decoded per write when saving a screenshot
+    # (a multiple of 4, so every chunk decodes on its own)
+    _B64_CHUNK = 1 << 20
+
     def screenshot(self, path: str | None = None, *, format: str = "png",
-                   screenshot_dir: str | None = None) -> str:
+                   screenshot_dir: str | None = None, quality: int = 80) -> str:
         """Take a screenshot of the current page.
 
         Args:
             path: File path to save to. If not given, saves to screenshot_dir
                   or /tmp/ as fallback.
-            format: Image format — "png" or "jpeg".
+            format: Image format — "png" or "jpeg" ("jpg" works too). JPEG
+                    is much smaller and quicker for Chrome to encode.
             screenshot_dir: Directory to save screenshots in (default: /tmp/).
+            quality: JPEG quality, 0–100 (default: 80). Ignored for PNG.
 
         Returns:
             The path where the screenshot was saved.
         """
         cdp = self._connect_page()
-        try:
-            import base64
-
-            result = cdp.send("Page.captureScreenshot", format=format)
-            data = base64.b64decode(result.get("data", ""))
-            ext = "jpg" if format == "jpeg" else format
-            if path:
-                out_path = path
-            elif screenshot_dir:
-                os.makedirs(screenshot_dir, exist_ok=True)
-                out_path = os.path.join(screenshot_dir, f"screenshot_{int(time.time())}.{ext}")
-            else:
-                out_path = f"/tmp/tappi_screenshot_{int(time.time())}.{ext}"
-            Path(out_path).write_bytes(data)
-            return out_path
-        finally:
-            cdp.close()
+        if format == "jpg":
+            format = "jpeg"
+        params: dict[str, Any] = {"format": format}
+        if format == "jpeg":
+            params["quality"] = quality
+        data = cdp.send("Page.captureScreenshot", **params).get("data", "")
+        ext = "jpg" if format == "jpeg" else format
+        if path:
+            out_path = path
+        elif screenshot_dir:
+            os.makedirs(screenshot_dir, exist_ok=True)
+            out_path = os.path.join(screenshot_dir, f"screenshot_{int(time.time())}.{ext}")
+        else:
+            out_path = f"/tmp/tappi_screenshot_{int(time.time())}.{ext}"
+        # Decode in chunks straight to the file rather than materialising
+        # the whole image (often several MB) as one bytes object
+        step = self._B64_CHUNK
+        with open(out_path, "wb") as f:
+            for i in range(0, len(data), step):
+                f.write(binascii.a2b_base64(data[i:i + step]))
+        return out_path
 
     # ── Scrolling ──
 
@@ -1097,41 +1637,47 @@ class Browser:
             'Double-clicked at (300, 200)'
         """
         cdp = self._connect_page()
-        try:
-            button = "right" if right else "left"
-            click_count = 2 if double else 1
+        button = "right" if right else "left"
+        click_count = 2 if double else 1
 
-            # Move mouse first (triggers hover states)
-            cdp.send("Input.dispatchMouseEvent", type="mouseMoved", x=x, y=y)
-            time.sleep(0.05)
+        # Move mouse first (triggers hover states)
+        cdp.send("Input.dispatchMouseEvent", type="mouseMoved", x=x, y=y)
+        time.sleep(0.05)
+
+        cdp.send(
+            "Input.dispatchMouseEvent",
+            type="mousePressed", x=x, y=y, button=button, clickCount=click_count,
+        )
+        cdp.send(
+            "Input.dispatchMouseEvent",
+            type="mouseReleased", x=x, y=y, button=button, clickCount=click_count,
+        )
 
+        if double:
             cdp.send(
                 "Input.dispatchMouseEvent",
-                type="mousePressed", x=x, y=y, button=button, clickCount=click_count,
+                type="mousePressed", x=x, y=y, button=button, clickCount=2,
             )
             cdp.send(
                 "Input.dispatchMouseEvent",
-                type="mouseReleased", x=x, y=y, button=button, clickCount=click_count,
+                type="mouseReleased", x=x, y=y, button=button, clickCount=2,
             )
 
-            if double:
-                cdp.send(
-                    "Input.dispatchMouseEvent",
-                    type="mousePressed", x=x, y=y, button=button, clickCount=2,
-                )
-                cdp.send(
-                    "Input.dispatchMouseEvent",
-                    type="mouseReleased", x=x, y=y, button=button, clickCount=2,
-                )
+        label = "Double-clicked" if double else ("Right-clicked" if right else "Clicked")
+        return f"{label} at ({x}, {y})"
 
-            label = "Double-clicked" if double else ("Right-clicked" if right else "Clicked")
-            return f"{label} at ({x}, {y})"
-        finally:
-            cdp.close()
+    # How long hover_xy() holds a move back for later ones to replace
+    _MOVE_COALESCE = 0.005
 
     def hover_xy(self, x: float, y: float) -> str:
         """Hover at page coordinates.
 
+        A lone hover is sent right away. Rapid ones that follow it (e.g.
+        tracing a mouse path) are coalesced: such a move is held for up to
+        5ms, or until the next action or close(), and only the latest
+        position is sent — Chrome folds consecutive moves together the
+        same way.
+
         Args:
             x: X coordinate.
             y: Y coordinate.
@@ -1139,12 +1685,52 @@ class Browser:
         Returns:
             Confirmation message.
         """
-        cdp = self._connect_page()
-        try:
+        with self._move_lock:
+            pending = self._pending_move
+            burst = (
+                pending is not None
+                or time.monotonic() - self._last_move < self._MOVE_COALESCE
+            )
+        if not burst:
+            cdp = self._connect_page()
             cdp.send("Input.dispatchMouseEvent", type="mouseMoved", x=x, y=y)
+            self._last_move = time.monotonic()
             return f"Hovered at ({x}, {y})"
-        finally:
-            cdp.close()
+        cdp = pending[0] if pending is not None else self._connect_page()
+        with self._move_lock:
+            self._pending_move = (cdp, x, y)
+            if self._move_timer is None:
+                self._move_timer = threading.Timer(self._MOVE_COALESCE, self._flush_move)
+                self._move_timer.daemon = True
+                self._move_timer.start()
+        return f"Hovered at ({x}, {y})"
+
+    def _flush_move(self, wait: bool = False) -> None:
+        """Send the held-back hover_xy() move, if any.
+
+        Runs on the coalescing timer, or before the next action. The send
+        happens under the lock, so a move the timer is sending still goes
+        out ahead of that action's commands. With *wait*, returns once
+        Chrome has handled it.
+        """
+        with self._move_lock:
+            pending, self._pending_move = self._pending_move, None
+            if self._move_timer is not None:
+                self._move_timer.cancel()
+                self._move_timer = None
+            if pending is None:
+                return
+            cdp, x, y = pending
+            try:
+                sent = cdp.send_nowait("Input.dispatchMouseEvent", type="mouseMoved", x=x, y=y)
+            except CDPError:
+                return  # Session gone — the next action reconnects
+            self._last_move = time.monotonic()
+        if wait:
+            try:
+                cdp.wait_all([sent])
+            except CDPError:
+                pass
 
     def drag_xy(
         self, from_x: float, from_y: float, to_x: float, to_y: float, *, steps: int = 10
@@ -1162,31 +1748,41 @@ class Browser:
             Confirmation message.
         """
         cdp = self._connect_page()
-        try:
-            cdp.send("Input.dispatchMouseEvent", type="mouseMoved", x=from_x, y=from_y)
-            time.sleep(0.05)
-            cdp.send(
-                "Input.dispatchMouseEvent",
-                type="mousePressed", x=from_x, y=from_y, button="left", clickCount=1,
-            )
-            time.sleep(0.05)
-
-            for i in range(1, steps + 1):
-                mx = from_x + (to_x - from_x) * (i / steps)
-                my = from_y + (to_y - from_y) * (i / steps)
-                cdp.send(
+        cdp.send("Input.dispatchMouseEvent", type="mouseMoved", x=from_x, y=from_y)
+        time.sleep(0.05)
+        cdp.send(
+            "Input.dispatchMouseEvent",
+            type="mousePressed", x=from_x, y=from_y, button="left", clickCount=1,
+        )
+        time.sleep(0.05)
+
+        # Moves are pipelined and paced against the clock: step i goes out
+        # at start + i*20ms however long sending took, so the drag lasts
+        # steps*20ms. Steps less than a pixel from the last move sent are
+        # skipped. The release is sent after them, so Chrome still handles
+        # it last.
+        moves = []
+        start = time.monotonic()
+        last_x, last_y = from_x, from_y
+        for i in range(1, steps + 1):
+            mx = from_x + (to_x - from_x) * (i / steps)
+            my = from_y + (to_y - from_y) * (i / steps)
+            if i == steps or abs(mx - last_x) + abs(my - last_y) >= 1:
+                moves.append(cdp.send_nowait(
                     "Input.dispatchMouseEvent",
                     type="mouseMoved", x=mx, y=my, button="left",
-                )
-                time.sleep(0.02)
-
-            cdp.send(
-                "Input.dispatchMouseEvent",
-                type="mouseReleased", x=to_x, y=to_y, button="left", clickCount=1,
-            )
-            return f"Dragged from ({from_x}, {from_y}) to ({to_x}, {to_y})"
-        finally:
-            cdp.close()
+                ))
+                last_x, last_y = mx, my
+            pause = start + i * 0.02 - time.monotonic()
+            if pause > 0:
+                time.sleep(pause)
+
+        cdp.send(
+            "Input.dispatchMouseEvent",
+            type="mouseReleased", x=to_x, y=to_y, button="left", clickCount=1,
+        )
+        cdp.wait_all(moves)
+        return f"Dragged from ({from_x}, {from_y}) to ({to_x}, {to_y})"
 
     def iframe_rect(self, selector: str) -> dict:
         """Get the bounding box of an iframe element.
@@ -1204,17 +1800,18 @@ class Browser:
             >>> b.iframe_rect('iframe[title*="hCaptcha"]')
             {'x': 95, 'y': 440, 'width': 302, 'height': 76, 'cx': 246, 'cy': 478}
         """
+        sel = _dumps(selector)
         js = f"""
         (() => {{
-            const el = document.querySelector({json.dumps(selector)});
-            if (!el) return JSON.stringify({{ error: "Selector not found: " + {json.dumps(selector)} }});
+            const el = document.querySelector({sel});
+            if (!el) return JSON.stringify({{ error: "Selector not found: " + {sel} }});
             el.scrollIntoView({{ block: 'center' }});
             const r = el.getBoundingClientRect();
             return JSON.stringify({{ x: Math.round(r.x), y: Math.round(r.y), width: Math.round(r.width), height: Math.round(r.height), cx: Math.round(r.x + r.width/2), cy: Math.round(r.y + r.height/2) }});
         }})()
         """
         result = self._eval(js)
-        info = json.loads(result)
+        info = _loads(result)
         if "error" in info:
             raise CDPError(info["error"])
         return info
@@ -1243,24 +1840,24 @@ class Browser:
             raise FileNotFoundError(f"File not found: {abs_path}")
 
         cdp = self._connect_page()
-        try:
-            cdp.send("DOM.enable")
-            root = cdp.send("DOM.getDocument")
-            node = cdp.send(
-                "DOM.querySelector",
-                nodeId=root["root"]["nodeId"],
-                selector=selector,
+        # A handle to the input is all setFileInputFiles needs — no DOM
+        # domain, no document snapshot, no nodeId lookup
+        found = cdp.send(
+            "Runtime.evaluate",
+            expression=f"document.querySelector({_dumps(selector)})",
+            objectGroup="tappi-upload",
+        )
+        object_id = found.get("result", {}).get("objectId")
+        if not object_id:
+            raise CDPError(
+                f"No file input found matching: {selector}\n"
+                f"Hint: Check the page with elements() or html('form')"
             )
-            node_id = node.get("nodeId", 0)
-            if not node_id:
-                raise CDPError(
-                    f"No file input found matching: {selector}\n"
-                    f"Hint: Check the page with elements() or html('form')"
-                )
-            cdp.send("DOM.setFileInputFiles", files=[abs_path], nodeId=node_id)
-            return f"Uploaded: {Path(abs_path).name} → {selector}"
+        try:
+            cdp.send("DOM.setFileInputFiles", files=[abs_path], objectId=object_id)
         finally:
-            cdp.close()
+            cdp.send_nowait("Runtime.releaseObjectGroup", objectGroup="tappi-upload")
+        return f"Uploaded: {Path(abs_path).name} → {selector}"
 
     # ── Utility ──
 
@@ -1296,6 +1893,23 @@ class Browser:
         "space": (" ", "Space", 32),
     }
 
+    # keys() flag → key name in _SPECIAL_KEYS
+    _KEY_FLAGS: dict[str, str] = {
+        "--enter": "enter", "--tab": "tab", "--escape": "escape",
+        "--esc": "escape", "--backspace": "backspace",
+        "--delete": "delete", "--up": "arrowup",
+        "--down": "arrowdown", "--left": "arrowleft",
+        "--right": "arrowright", "--home": "home",
+        "--end": "end", "--pageup": "pageup",
+        "--pagedown": "pagedown", "--space": "space",
+    }
+
+    # Key name → keys() action, built once (actions are only read)
+    _SPECIAL_KEY_ACTIONS: dict[str, dict] = {
+        name: {"type": "key", "key": k, "code": c, "keyCode": kc, "modifiers": 0}
+        for name, (k, c, kc) in _SPECIAL_KEYS.items()
+    }
+
     _MODIFIER_FLAGS: dict[str, int] = {
         "alt": 1, "ctrl": 2, "control": 2,
         "meta": 4, "cmd": 4, "command": 4,
@@ -1336,88 +1950,79 @@ class Browser:
         then use ``--tab`` within the row.
         """
         cdp = self._connect_page()
-        try:
-            typed = 0
-            key_count = 0
-
-            # Build action list
-            parsed: list[dict] = []
-            i = 0
-            args = list(actions)
-            while i < len(args):
-                arg = args[i]
-
-                if arg == "--delay" and i + 1 < len(args):
-                    delay = int(args[i + 1])
-                    i += 2
-                    continue
-
-                if arg == "--combo" and i + 1 < len(args):
-                    combo = self._parse_combo(args[i + 1])
-                    if combo:
-                        parsed.append(combo)
-                    i += 2
-                    continue
-
-                flag_map = {
-                    "--enter": "enter", "--tab": "tab", "--escape": "escape",
-                    "--esc": "escape", "--backspace": "backspace",
-                    "--delete": "delete", "--up": "arrowup",
-                    "--down": "arrowdown", "--left": "arrowleft",
-                    "--right": "arrowright", "--home": "home",
-                    "--end": "end", "--pageup": "pageup",
-                    "--pagedown": "pagedown", "--space": "space",
-                }
-
-                lower = arg.lower()
-                if lower in flag_map:
-                    k, c, kc = self._SPECIAL_KEYS[flag_map[lower]]
-                    parsed.append({"type": "key", "key": k, "code": c, "keyCode": kc, "modifiers": 0})
-                    i += 1
-                    continue
-
-                if not arg.startswith("--"):
-                    parsed.append({"type": "text", "value": arg})
+        typed = 0
+        key_count = 0
+
+        # Build action list
+        parsed: list[dict] = []
+        i = 0
+        args = list(actions)
+        while i < len(args):
+            arg = args[i]
+
+            if arg == "--delay" and i + 1 < len(args):
+                delay = int(args[i + 1])
+                i += 2
+                continue
+
+            if arg == "--combo" and i + 1 < len(args):
+                combo = self._parse_combo(args[i + 1])
+                if combo:
+                    parsed.append(combo)
+                i += 2
+                continue
+
+            name = self._KEY_FLAGS.get(arg.lower())
+            if name is not None:
+                parsed.append(self._SPECIAL_KEY_ACTIONS[name])
                 i += 1
-
-            for action in parsed:
-                if action["type"] == "text":
-                    for ch in action["value"]:
-                        cdp.send("Input.dispatchKeyEvent", type="keyDown", text=ch)
-                        cdp.send("Input.dispatchKeyEvent", type="keyUp")
+                continue
+
+            if not arg.startswith("--"):
+                parsed.append({"type": "text", "value": arg})
+            i += 1
+
+        # Events are pipelined: nothing waits for Chrome's acks until the
+        # end, so pacing comes from the sleeps alone, not round-trips
+        sent: list[queue.SimpleQueue] = []
+        for action in parsed:
+            if action["type"] == "text":
+                for ch in action["value"]:
+                    sent.append(cdp.send_nowait("Input.dispatchKeyEvent", type="keyDown", text=ch))
+                    sent.append(cdp.send_nowait("Input.dispatchKeyEvent", type="keyUp"))
+                    if delay > 0:
                         time.sleep(delay / 1000)
-                    typed += len(action["value"])
-                else:
-                    cdp.send(
-                        "Input.dispatchKeyEvent",
-                        type="rawKeyDown",
-                        key=action["key"],
-                        code=action["code"],
-                        windowsVirtualKeyCode=action["keyCode"],
-                        nativeVirtualKeyCode=action["keyCode"],
-                        modifiers=action.get("modifiers", 0),
-                    )
-                    time.sleep(0.01)
-                    cdp.send(
-                        "Input.dispatchKeyEvent",
-                        type="keyUp",
-                        key=action["key"],
-                        code=action["code"],
-                        windowsVirtualKeyCode=action["keyCode"],
-                        nativeVirtualKeyCode=action["keyCode"],
-                        modifiers=action.get("modifiers", 0),
-                    )
-                    key_count += 1
-                    time.sleep(0.03)
-
-            parts = []
-            if typed:
-                parts.append(f"{typed} chars")
-            if key_count:
-                parts.append(f"{key_count} key(s)")
-            return f"Sent: {' + '.join(parts)}" if parts else "Nothing sent"
-        finally:
-            cdp.close()
+                typed += len(action["value"])
+            else:
+                sent.append(cdp.send_nowait(
+                    "Input.dispatchKeyEvent",
+                    type="rawKeyDown",
+                    key=action["key"],
+                    code=action["code"],
+                    windowsVirtualKeyCode=action["keyCode"],
+                    nativeVirtualKeyCode=action["keyCode"],
+                    modifiers=action.get("modifiers", 0),
+                ))
+                time.sleep(0.01)
+                sent.append(cdp.send_nowait(
+                    "Input.dispatchKeyEvent",
+                    type="keyUp",
+                    key=action["key"],
+                    code=action["code"],
+                    windowsVirtualKeyCode=action["keyCode"],
+                    nativeVirtualKeyCode=action["keyCode"],
+                    modifiers=action.get("modifiers", 0),
+                ))
+                key_count += 1
+                time.sleep(0.03)
+        cdp.wait_all(sent)
+
+        parts = []
+        if typed:
+            parts.append(f"{typed} chars")
+        if key_count:
+            parts.append(f"{key_count} key(s)")
+        return f"Sent: {' + '.join(parts)}" if parts else "Nothing sent"
 
     def _parse_combo(self, combo: str) -> dict | None:
         """Parse a key combo string like 'cmd+b' into an action dict."""
@@ -1447,6 +2052,7 @@ class Browser:
         headless: bool = False,
         chrome_path: str | None = None,
         download_dir: str | None = None,
+        pipe: bool = False,
     ) -> subprocess.Popen:
         """Launch Chrome/Chromium with remote debugging enabled.
 
@@ -1462,6 +2068,11 @@ class Browser:
                       Set True for server/CI environments.
             chrome_path: Path to Chrome/Chromium binary. Auto-detected if
                          not provided.
+            pipe: Talk CDP over inherited pipes (``--remote-debugging-pipe``,
+                  POSIX only) instead of a port. No port is bound, and the
+                  connection is ready as soon as Chrome starts. The session
+                  is set as the process's ``cdp`` attribute; pass it to
+                  ``Browser(connection=...)``.
 
         Returns:
             The subprocess.Popen object for the browser process.
@@ -1470,6 +2081,8 @@ class Browser:
             >>> Browser.launch()           # Start Chrome, default profile
             >>> Browser.launch(port=9333)  # Different port
             >>> b = Browser("http://127.0.0.1:9333")
+            >>> proc = Browser.launch(pipe=True)
+            >>> b = Browser(connection=proc.cdp)
         """
         chrome = chrome_path or _find_chrome()
         if not chrome:
@@ -1494,46 +2107,49 @@ class Browser:
         if headless:
             cmd.append("--headless=new")
 
+        if pipe:
+            return _launch_piped(cmd, download_dir)
+
         proc = subprocess.Popen(
             cmd,
             stdout=subprocess.DEVNULL,
             stderr=subprocess.DEVNULL,
         )
 
-        # Wait for CDP to be ready
+        # Wait for CDP to be ready, polling quickly at first (Chrome is
+        # usually up within ~100ms) and backing off to 0.3s
         deadline = time.monotonic() + 10
+        delay = 0.01
         while time.monotonic() < deadline:
             try:
-                json.loads(urlopen(f"http://127.0.0.1:{port}/json/version").read())
-                # Set download directory if specified
-                if download_dir:
-                    dl_path = str(Path(download_dir).expanduser().resolve())
-                    os.makedirs(dl_path, exist_ok=True)
+                version = _loads(
+                    urlopen(f"http://127.0.0.1:{port}/json/version", timeout=2).read()
+                )
+            except (URLError, OSError):
+                delay = min(delay * 2, 0.3)
+                time.sleep(delay)
+                continue
+            # Set download directory if specified
+            if download_dir:
+                dl_path = str(Path(download_dir).expanduser().resolve())
+                os.makedirs(dl_path, exist_ok=True)
+                try:
+                    # Browser-wide setting — one browser-level session does it
+                    ws_url = _WS_HOST_RE.sub(
+                        f"ws://127.0.0.1:{port}", version["webSocketDebuggerUrl"]
+                    )
+                    browser_cdp = CDPSession(ws_connect(ws_url, **_WS_OPTIONS))
                     try:
-                        browser_cdp = CDPSession.connect_to_browser(
-                            f"http://127.0.0.1:{port}"
-                        )
-                        # Get the first page target to set download behavior
-                        targets = json.loads(
-                            urlopen(f"http://127.0.0.1:{port}/json/list").read()
+                        browser_cdp.send(
+                            "Browser.setDownloadBehavior",
+                            behavior="allow",
+                            downloadPath=dl_path,
                         )
-                        pages = [t for t in targets if t.get("type") == "page"]
-                        if pages:
-                            page_cdp = CDPSession.connect_to_page(
-                                pages[0]["id"], port=port
-                            )
-                            page_cdp.send(
-                                "Browser.setDownloadBehavior",
-                                behavior="allow",
-                                downloadPath=dl_path,
-                            )
-                            page_cdp.close()
+                    finally:
                         browser_cdp.close()
-                    except Exception:
-                        pass  # Non-fatal — downloads still work, just default location
-                return proc
-            except (URLError, OSError):
-                time.sleep(0.3)
+                except Exception:
+                    pass  # Non-fatal — downloads still work, just default location
+            return proc
 
         proc.kill()
         raise TimeoutError(
@@ -1545,8 +2161,76 @@ class Browser:
         return f"Browser(cdp_url={self.cdp_url!r})"
 
 
+# Exec wrapper for pipe mode: moves Chrome's pipe ends (argv 1 and 2) onto
+# fds 3 and 4, then execs Chrome (argv 3 on) in its place
+_PIPE_EXEC = (
+    "import os, sys; r, w = int(sys.argv[1]), int(sys.argv[2]); "
+    "os.dup2(r, 3); os.dup2(w, 4); os.close(r); os.close(w); "
+    "os.execvp(sys.argv[3], sys.argv[3:])"
+)
+
+
+def _launch_piped(cmd: list[str], download_dir: str | None) -> subprocess.Popen:
+    """Start Chrome with CDP on its fds 3 (commands in) and 4 (messages out).
+
+    The fds are wired up by a small exec wrapper rather than a preexec_fn,
+    which isn't safe to run after fork once other threads exist (e.g. CDP
+    reader threads in a long-running server).
+    """
+    if sys.platform == "win32":
+        raise OSError("pipe=True is not supported on Windows")
+    import fcntl
+    import shutil
+
+    if not shutil.which(cmd[0]):
+        raise FileNotFoundError(f"Chrome/Chromium not found: {cmd[0]}")
+    cmd = [cmd[0], "--remote-debugging-pipe", *cmd[2:]]
+    cmd_read, cmd_write = os.pipe()
+    msg_read, msg_write = os.pipe()
+    # Chrome's ends, moved above fd 4 so wiring one onto 3/4 can't clobber
+    # the other
+    child_read = fcntl.fcntl(cmd_read, fcntl.F_DUPFD_CLOEXEC, 5)
+    child_write = fcntl.fcntl(msg_write, fcntl.F_DUPFD_CLOEXEC, 5)
+    os.close(cmd_read)
+    os.close(msg_write)
+    try:
+        proc = subprocess.Popen(
+            [sys.executable, "-I", "-S", "-c", _PIPE_EXEC,
+             str(child_read), str(child_write), *cmd],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            pass_fds=(child_read, child_write),
+        )
+    except BaseException:
+        os.close(msg_read)
+        os.close(cmd_write)
+        raise
+    finally:
+        os.close(child_read)
+        os.close(child_write)
+    proc.cdp = CDPSession.connect_to_pipe(msg_read, cmd_write)
+    if download_dir:
+        dl_path = str(Path(download_dir).expanduser().resolve())
+        os.makedirs(dl_path, exist_ok=True)
+        proc.cdp.send(
+            "Browser.setDownloadBehavior", behavior="allow", downloadPath=dl_path
+        )
+    return proc
+
+
+# Chrome binary found by the last _find_chrome() that found one
+_chrome_path: str | None = None
+
+
 def _find_chrome() -> str | None:
-    """Auto-detect Chrome/Chromium binary path."""
+    """Auto-detect Chrome/Chromium binary path.
+
+    A found path is remembered for later launches; a miss isn't, so a
+    browser installed meanwhile is still picked up.
+    """
+    global _chrome_path
+    if _chrome_path is not None:
+        return _chrome_path
     candidates = []
 
     if sys.platform == "darwin":
@@ -1575,14 +2259,18 @@ def _find_chrome() -> str | None:
         ]:
             candidates.extend(glob.glob(pattern))
 
+    # Split PATH once rather than per name, as shutil.which would
+    path_dirs = [d for d in os.environ.get("PATH", "").split(os.pathsep) if d]
     for c in candidates:
         if os.path.isfile(c):
+            _chrome_path = c
             return c
         # For linux — check PATH
         if not os.path.sep in c:
-            import shutil
-            found = shutil.which(c)
-            if found:
-                return found
+            for d in path_dirs:
+                found = os.path.join(d, c)
+                if os.path.isfile(found) and os.access(found, os.X_OK):
+                    _chrome_path = found
+                    return found
 
     return None
@@ -5,12 +5,13 @@ Kept in a separate module so the core stays clean.
 """
 
 import json
+from functools import lru_cache
 
 
 def elements_js(selector: str | None = None) -> str:
     """Generate JS that indexes all interactive elements on the page.
 
-    Returns a JSON array of {label, desc} objects. Each element gets a
+    Returns a JSON array of {index, label, desc} objects. Each element gets a
     `data-bpy-idx` attribute for later click/type targeting.
 
     Pierces shadow DOM boundaries automatically.
@@ -125,7 +126,7 @@ def elements_js(selector: str | None = None) -> str:
         seen.add(key);
 
         el.setAttribute('data-bpy-idx', results.length);
-        results.push({{ label, desc: desc.slice(0, 120) }});
+        results.push({{ index: results.length, label, desc: desc.slice(0, 120) }});
       }}
 
       return JSON.stringify(results);
@@ -141,86 +142,167 @@ def check_indexed_js() -> str:
     )
 
 
-def click_info_js(index: int) -> str:
-    """Click element via JS events — more reliable than CDP mouse for SPAs."""
-    return f"""
-    (() => {{
-      const el = (window.__bpyDeepQuery && window.__bpyDeepQuery({index})) || document.querySelector('[data-bpy-idx="{index}"]');
-      if (!el) return JSON.stringify({{ error: 'Element [{index}] not found. Run: elements' }});
-      el.scrollIntoView({{ block: 'center' }});
-      const rect = el.getBoundingClientRect();
-      const cx = rect.x + rect.width / 2, cy = rect.y + rect.height / 2;
-      const mOpts = {{ bubbles: true, cancelable: true, clientX: cx, clientY: cy, button: 0 }};
-      el.dispatchEvent(new MouseEvent('mousedown', mOpts));
-      el.dispatchEvent(new MouseEvent('mouseup', mOpts));
-      el.click();
-      const label = (el.getAttribute('role') || el.tagName.toLowerCase());
-      const desc = (el.getAttribute('aria-label') || el.textContent || '').trim().slice(0, 80);
-      return JSON.stringify({{ label, desc }});
-    }})()
-    """
+@lru_cache(maxsize=1)
+def helpers_js() -> str:
+    """Generate JS that installs the per-page helper library, window.__bpy.
 
-
-def type_info_js(index: int) -> str:
-    """Get element info and verify it's a text input."""
-    return f"""
-    (() => {{
-      const el = (window.__bpyDeepQuery && window.__bpyDeepQuery({index})) || document.querySelector('[data-bpy-idx="{index}"]');
-      if (!el) return JSON.stringify({{ error: 'Element [{index}] not found. Run: elements' }});
-      const tag = el.tagName.toLowerCase();
-      const ce = el.isContentEditable;
-      const role = el.getAttribute('role') || '';
-      const type = el.type || '';
-      const typeable = tag === 'input' || tag === 'textarea' || ce || role === 'textbox';
-      if (!typeable) return JSON.stringify({{ error: 'Element [{index}] is a ' + tag + ' (' + (el.getAttribute('aria-label') || el.textContent || '').trim().slice(0, 40) + '), not a text input. Use click instead?' }});
-      el.scrollIntoView({{ block: 'center' }});
-      const rect = el.getBoundingClientRect();
-      return JSON.stringify({{ ok: true, tag, ce, x: rect.x + rect.width / 2, y: rect.y + rect.height / 2 }});
-    }})()
-    """
-
-
-def clear_contenteditable_js(index: int) -> str:
-    """Select all content in a contenteditable element for deletion."""
-    return f"""
-    (() => {{
-      const el = (window.__bpyDeepQuery && window.__bpyDeepQuery({index})) || document.querySelector('[data-bpy-idx="{index}"]');
-      if (el) {{
-        const range = document.createRange();
-        range.selectNodeContents(el);
-        const sel = window.getSelection();
-        sel.removeAllRanges();
-        sel.addRange(range);
-      }}
-    }})()
+    Element actions are methods taking the element index (and text, where
+    needed), so each call is a short expression like ``__bpy.check(3)``
+    instead of a freshly built script. Methods return JSON strings, as the
+    standalone expressions used to; ``ensureIndexed(i)`` indexes the page's
+    elements first if that hasn't happened yet.
     """
-
-
-def clear_input_js(index: int) -> str:
-    """Clear value of an input/textarea element."""
-    return f"""
-    (() => {{
-      const el = (window.__bpyDeepQuery && window.__bpyDeepQuery({index})) || document.querySelector('[data-bpy-idx="{index}"]');
-      if (el) el.value = '';
-    }})()
-    """
-
-
-def set_input_value_js(index: int, text: str) -> str:
-    """Set input value with proper React/Vue event dispatching."""
-    text_json = json.dumps(text)
-    return f"""
-    (() => {{
-      const el = (window.__bpyDeepQuery && window.__bpyDeepQuery({index})) || document.querySelector('[data-bpy-idx="{index}"]');
-      if (el && !el.isContentEditable) {{
+    return r"""
+    window.__bpy = (() => {
+      const find = (i) => (window.__bpyDeepQuery && window.__bpyDeepQuery(i)) || document.querySelector('[data-bpy-idx="' + i + '"]');
+      const notFound = (i) => JSON.stringify({ error: 'Element [' + i + '] not found. Run: elements' });
+      const setValue = (el, text) => {
         const setter = Object.getOwnPropertyDescriptor(HTMLInputElement.prototype, 'value')?.set
           || Object.getOwnPropertyDescriptor(HTMLTextAreaElement.prototype, 'value')?.set;
-        if (setter) setter.call(el, {text_json});
-        else el.value = {text_json};
-        el.dispatchEvent(new Event('input', {{ bubbles: true }}));
-        el.dispatchEvent(new Event('change', {{ bubbles: true }}));
-      }}
-    }})()
+        if (setter) setter.call(el, text);
+        else el.value = text;
+        el.dispatchEvent(new Event('input', { bubbles: true }));
+        el.dispatchEvent(new Event('change', { bubbles: true }));
+      };
+      const snap = () => ({
+        url: location.href,
+        dialogs: document.querySelectorAll('[role=dialog],[aria-modal=true]').length
+      });
+
+      return {
+        // Index the page unless it already is. Element i, when given, is
+        // checked first with a single selector lookup: the common case
+        // (acting on a freshly listed page) skips the wider checks
+        ensureIndexed(i) {
+          if (i !== undefined && document.querySelector('[data-bpy-idx="' + i + '"]')) return;
+          if (!(""" + check_indexed_js() + r""")) """ + elements_js(None).strip() + r""";
+        },
+
+        // Snapshot page state, click via JS events, yield a tick, snapshot
+        // again. Resolves to label/desc, pre/post {url, dialogs} and, for
+        // checkboxes and radios, the new checked state.
+        async click(i) {
+          const el = find(i);
+          if (!el) return notFound(i);
+          const tag = el.tagName.toLowerCase();
+          const type = (el.type || '').toLowerCase();
+          const role = el.getAttribute('role');
+          const toggle = (tag === 'input' && (type === 'checkbox' || type === 'radio')) || role === 'checkbox' || role === 'radio';
+          const pre = snap();
+          el.scrollIntoView({ block: 'center' });
+          const rect = el.getBoundingClientRect();
+          const cx = rect.x + rect.width / 2, cy = rect.y + rect.height / 2;
+          const mOpts = { bubbles: true, cancelable: true, clientX: cx, clientY: cy, button: 0 };
+          el.dispatchEvent(new MouseEvent('mousedown', mOpts));
+          el.dispatchEvent(new MouseEvent('mouseup', mOpts));
+          el.click();
+          const label = (role || tag);
+          const desc = (el.getAttribute('aria-label') || el.textContent || '').trim().slice(0, 80);
+          // Yield one task so handlers scheduled by the click (framework
+          // re-renders, dialogs) run. MessageChannel isn't throttled in
+          // background tabs the way setTimeout is.
+          await new Promise(r => { const c = new MessageChannel(); c.port1.onmessage = r; c.port2.postMessage(0); });
+          const state = toggle ? (el.checked || el.getAttribute('aria-checked') === 'true' ? 'checked' : 'unchecked') : null;
+          return JSON.stringify({ label, desc, pre, post: snap(), state });
+        },
+
+        // Element info, verifying it's a text input
+        typeInfo(i) {
+          const el = find(i);
+          if (!el) return notFound(i);
+          const tag = el.tagName.toLowerCase();
+          const ce = el.isContentEditable;
+          const role = el.getAttribute('role') || '';
+          const typeable = tag === 'input' || tag === 'textarea' || ce || role === 'textbox';
+          if (!typeable) return JSON.stringify({ error: 'Element [' + i + '] is a ' + tag + ' (' + (el.getAttribute('aria-label') || el.textContent || '').trim().slice(0, 40) + '), not a text input. Use click instead?' });
+          el.scrollIntoView({ block: 'center' });
+          const rect = el.getBoundingClientRect();
+          return JSON.stringify({ ok: true, tag, ce, x: rect.x + rect.width / 2, y: rect.y + rect.height / 2 });
+        },
+
+        // Focus without click events (no popups/cards); scrolls into view
+        focus(i) {
+          const el = find(i);
+          if (!el) return notFound(i);
+          el.scrollIntoView({ block: 'center' });
+          el.focus();
+          const tag = el.tagName.toLowerCase();
+          const label = el.getAttribute('role') || tag;
+          const desc = (el.getAttribute('aria-label') || el.textContent || '').trim().slice(0, 80);
+          const active = document.activeElement === el || (el.shadowRoot && el.shadowRoot.activeElement === document.activeElement);
+          return JSON.stringify({ label, desc, focused: active });
+        },
+
+        // Focus only; returns whether the element took it
+        focusQuiet(i) {
+          const el = find(i);
+          if (!el) return false;
+          el.focus();
+          return document.activeElement === el;
+        },
+
+        // Current value/text of an element, and whether it has focus
+        check(i) {
+          const el = find(i);
+          if (!el) return notFound(i);
+          const tag = el.tagName.toLowerCase();
+          const role = el.getAttribute('role') || '';
+          const value = (tag === 'input' || tag === 'textarea' || tag === 'select')
+            ? (el.value || '') : (el.innerText || el.textContent || '');
+          const label = role || tag;
+          const desc = (el.getAttribute('aria-label') || el.placeholder || el.name || '').trim().slice(0, 60);
+          const isFocused = document.activeElement === el;
+          return JSON.stringify({ label, desc, value: value.slice(0, 2000), length: value.length, focused: isFocused });
+        },
+
+        // Select all content of a contenteditable, ready for deletion
+        selectContents(i) {
+          const el = find(i);
+          if (el) {
+            const range = document.createRange();
+            range.selectNodeContents(el);
+            const sel = window.getSelection();
+            sel.removeAllRanges();
+            sel.addRange(range);
+          }
+        },
+
+        clearInput(i) {
+          const el = find(i);
+          if (el) el.value = '';
+        },
+
+        // Set an input's value with the events React/Vue listen for
+        setValue(i, text) {
+          const el = find(i);
+          if (el && !el.isContentEditable) setValue(el, text);
+        },
+
+        // JS paste — fallback when Input.insertText fails
+        paste(i, text) {
+          const el = find(i);
+          if (!el) return notFound(i);
+          const ce = el.isContentEditable;
+          const tag = el.tagName.toLowerCase();
+          try {
+            if (ce) {
+              el.focus();
+              el.innerHTML = text.replace(/\n/g, '<br>');
+              el.dispatchEvent(new Event('input', { bubbles: true }));
+            } else if (tag === 'input' || tag === 'textarea') {
+              el.focus();
+              setValue(el, text);
+            } else {
+              return JSON.stringify({ error: 'Element [' + i + '] is a ' + tag + ' — not a text input or contenteditable. Use keys for canvas apps.' });
+            }
+            const actual = ce ? (el.innerText || el.textContent || '') : (el.value || '');
+            return JSON.stringify({ ok: true, length: actual.length, focused: document.activeElement === el });
+          } catch(e) {
+            return JSON.stringify({ error: 'JS paste failed: ' + e.message });
+          }
+        },
+      };
+    })();
     """
 
 
@@ -269,94 +351,6 @@ def extract_text_js(selector: str | None = None) -> str:
     """
 
 
-def focus_js(index: int) -> str:
-    """Focus an element by index without dispatching click events.
-
-    Calls el.focus() and scrolls into view. Lighter than click —
-    doesn't trigger click handlers that might spawn popups or cards.
-    """
-    return f"""
-    (() => {{
-      const el = (window.__bpyDeepQuery && window.__bpyDeepQuery({index})) || document.querySelector('[data-bpy-idx="{index}"]');
-      if (!el) return JSON.stringify({{ error: 'Element [{index}] not found. Run: elements' }});
-      el.scrollIntoView({{ block: 'center' }});
-      el.focus();
-      const tag = el.tagName.toLowerCase();
-      const label = el.getAttribute('role') || tag;
-      const desc = (el.getAttribute('aria-label') || el.textContent || '').trim().slice(0, 80);
-      const active = document.activeElement === el || (el.shadowRoot && el.shadowRoot.activeElement === document.activeElement);
-      return JSON.stringify({{ label, desc, focused: active }});
-    }})()
-    """
-
-
-def check_value_js(index: int) -> str:
-    """Read the current value/text of an element by index.
-
-    Returns the input value, textarea value, contenteditable text,
-    or innerText — whatever is appropriate for the element type.
-    Lightweight verification that a type() actually landed.
-    """
-    return f"""
-    (() => {{
-      const el = (window.__bpyDeepQuery && window.__bpyDeepQuery({index})) || document.querySelector('[data-bpy-idx="{index}"]');
-      if (!el) return JSON.stringify({{ error: 'Element [{index}] not found. Run: elements' }});
-      const tag = el.tagName.toLowerCase();
-      const ce = el.isContentEditable;
-      const role = el.getAttribute('role') || '';
-      let value = '';
-      if (tag === 'input' || tag === 'textarea' || tag === 'select') {{
-        value = el.value || '';
-      }} else if (ce || role === 'textbox') {{
-        value = el.innerText || el.textContent || '';
-      }} else {{
-        value = el.innerText || el.textContent || '';
-      }}
-      const label = role || tag;
-      const desc = (el.getAttribute('aria-label') || el.placeholder || el.name || '').trim().slice(0, 60);
-      const isFocused = document.activeElement === el;
-      return JSON.stringify({{ label, desc, value: value.slice(0, 2000), length: value.length, focused: isFocused }});
-    }})()
-    """
-
-
-def paste_content_js(index: int, text: str) -> str:
-    """Paste content into an element via JS — fallback when Input.insertText fails.
-
-    Sets value/innerHTML directly and dispatches proper events for React/Vue.
-    """
-    text_json = json.dumps(text)
-    return f"""
-    (() => {{
-      const el = (window.__bpyDeepQuery && window.__bpyDeepQuery({index})) || document.querySelector('[data-bpy-idx="{index}"]');
-      if (!el) return JSON.stringify({{ error: 'Element [{index}] not found. Run: elements' }});
-      const ce = el.isContentEditable;
-      const tag = el.tagName.toLowerCase();
-      try {{
-        if (ce) {{
-          el.focus();
-          el.innerHTML = {text_json}.replace(/\\n/g, '<br>');
-          el.dispatchEvent(new Event('input', {{ bubbles: true }}));
-        }} else if (tag === 'input' || tag === 'textarea') {{
-          el.focus();
-          const setter = Object.getOwnPropertyDescriptor(HTMLInputElement.prototype, 'value')?.set
-            || Object.getOwnPropertyDescriptor(HTMLTextAreaElement.prototype, 'value')?.set;
-          if (setter) setter.call(el, {text_json});
-          else el.value = {text_json};
-          el.dispatchEvent(new Event('input', {{ bubbles: true }}));
-          el.dispatchEvent(new Event('change', {{ bubbles: true }}));
-        }} else {{
-          return JSON.stringify({{ error: 'Element [{index}] is a ' + tag + ' — not a text input or contenteditable. Use keys for canvas apps.' }});
-        }}
-        const actual = ce ? (el.innerText || '') : (el.value || '');
-        return JSON.stringify({{ ok: true, length: actual.length }});
-      }} catch(e) {{
-        return JSON.stringify({{ error: 'JS paste failed: ' + e.message }});
-      }}
-    }})()
-    """
-
-
 def get_html_js(selector: str) -> str:
     """Get outerHTML of an element by CSS selector."""
     sel_json = json.dumps(selector)